@@ -0,0 +1,82 @@
+"""Сравнение конвертации BigNumber: рекурсивный async-обход против object_hook.
+
+Запуск из корня репозитория: python -m benchmarks.bench_big_number
+"""
+import asyncio
+import json
+import time
+from typing import Any
+
+from decimal_sdk.ipc_client import IPCClient
+
+ELEMENTS = 10_000
+ROUNDS = 5
+
+
+def make_response() -> bytes:
+    """Ответ, похожий на страницу стейков: 10k элементов с несколькими BigNumber в каждом."""
+    big = lambda value: {"type": "BigNumber", "hex": hex(value * 10 ** 15)}
+    stakes = [
+        {
+            "id": f"0x{i:040x}",
+            "validator": f"0x{i * 7:040x}",
+            "amount": big(i + 1),
+            "reward": big(i * 3 + 1),
+            "hold": {"timestamp": 1700000000 + i, "amount": big(i + 2)},
+        }
+        for i in range(ELEMENTS)
+    ]
+    return json.dumps({"success": True, "result": stakes}).encode()
+
+
+async def convert_recursive(data: Any) -> Any:
+    """Прежняя реализация IPCClient._convert_big_number."""
+    if isinstance(data, dict):
+        if data.get("type") == "BigNumber" and "hex" in data:
+            raw_value = int(data["hex"], 16)
+            return round(raw_value / (10 ** 18), 6)
+        return {key: await convert_recursive(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [await convert_recursive(item) for item in data]
+    return data
+
+
+async def bench_recursive(raw: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await convert_recursive(json.loads(raw.decode()))
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def bench_plain(raw: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        json.loads(raw)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def bench_object_hook(raw: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        json.loads(raw, object_hook=IPCClient._convert_big_number)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+async def main() -> None:
+    raw = make_response()
+    expected = await convert_recursive(json.loads(raw))
+    assert json.loads(raw, object_hook=IPCClient._convert_big_number) == expected
+
+    plain = bench_plain(raw)
+    recursive = await bench_recursive(raw)
+    hook = bench_object_hook(raw)
+    print(f"Размер ответа: {len(raw) / 1024:.0f} КиБ, элементов: {ELEMENTS}")
+    print(f"Только json.loads без конвертации: {plain * 1000:.1f} мс")
+    print(f"Рекурсивный async-обход: {recursive * 1000:.1f} мс")
+    print(f"object_hook при декодировании: {hook * 1000:.1f} мс")
+    print(f"Ускорение: {recursive / hook:.1f}x, "
+          f"накладные расходы конвертации: {(recursive - plain) * 1000:.1f} -> {(hook - plain) * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""Пропускная способность ipc-server.js в зависимости от числа обработчиков кластера.
+
+Для каждого значения --workers запускает ipc-server.js с IPC_WORKERS на
+временном сокете и нагружает его из --clients процессов Python:
+
+- read — чтение без состояния кошелька (по умолчанию describe_actions, в сети
+  можно указать --action get_validators), распределяется по всем обработчикам;
+- register — регистрация кошельков create_wallet: вывод ключей из мнемоники
+  нагружает процессор и выполняется в обработчике, которому принадлежит кошелёк.
+
+Прирост заметен при числе ядер не меньше числа обработчиков и клиентских процессов.
+
+Запуск из корня репозитория (нужны ENCRYPTION_KEY и зависимости Node.js):
+python -m benchmarks.bench_cluster [--workers 1,2,4] [--scenario read,register]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from decimal_sdk.config import get_config
+from decimal_sdk.pool import ConnectionPool
+
+# Тестовая мнемоника BIP-39, не используйте её для реальных средств
+MNEMONIC = ("abandon abandon abandon abandon abandon abandon "
+            "abandon abandon abandon abandon abandon about")
+WALLETS = 256
+
+
+def make_requests(scenario: str, action: str, encrypted_mnemonic: str) -> Callable[[int], Dict[str, Any]]:
+    """Фабрика запросов сценария по порядковому номеру."""
+    if scenario == 'read':
+        return lambda index: {'action': action, 'payload': {}}
+    return lambda index: {'action': 'create_wallet',
+                          'payload': {'mnemonic': encrypted_mnemonic, 'wallet_id': f'bench-{index % WALLETS}'}}
+
+
+async def _load(socket_path: str, scenario: str, action: str, encrypted_mnemonic: str,
+                concurrency: int, duration: float, seed: int) -> float:
+    """Запросов в секунду от одного клиентского процесса после прогрева."""
+    make = make_requests(scenario, action, encrypted_mnemonic)
+    pool = ConnectionPool(socket_path, max_size=4)
+    completed = 0
+    counter = seed
+    deadline = 0.0
+
+    async def loop() -> None:
+        nonlocal completed, counter
+        while time.perf_counter() < deadline:
+            counter += 1
+            response = await pool.request(make(counter))
+            if not response.get('success'):
+                raise RuntimeError(response.get('error'))
+            completed += 1
+
+    try:
+        deadline = time.perf_counter() + min(1.0, duration)
+        await asyncio.gather(*(loop() for _ in range(concurrency)))  # прогрев
+        completed = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+        return completed / (time.perf_counter() - start)
+    finally:
+        await pool.close()
+
+
+def run_client(*args: Any) -> float:
+    return asyncio.run(_load(*args))
+
+
+def start_server(server: str, socket_path: str, workers: int) -> subprocess.Popen:
+    """Запускает ipc-server.js и ждёт появления сокета."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    env = dict(os.environ, SOCKET_PATH=socket_path, IPC_WORKERS=str(workers), WARMUP_ON_REGISTER='0')
+    process = subprocess.Popen(['node', os.path.basename(server)], cwd=os.path.dirname(server), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(200):
+        if os.path.exists(socket_path):
+            return process
+        if process.poll() is not None:
+            raise RuntimeError(f"ipc-server.js завершился с кодом {process.returncode}")
+        time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("ipc-server.js не создал сокет")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4', help='значения IPC_WORKERS через запятую')
+    parser.add_argument('--scenario', default='read,register', help='сценарии через запятую: read, register')
+    parser.add_argument('--action', default='describe_actions', help='действие сценария read')
+    parser.add_argument('--clients', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='число клиентских процессов')
+    parser.add_argument('--concurrency', type=int, default=32, help='запросов в полёте на клиентский процесс')
+    parser.add_argument('--duration', type=float, default=5.0, help='длительность замера в секундах')
+    parser.add_argument('--server', default=os.path.join(os.getcwd(), 'ipc-server.js'), help='путь к ipc-server.js')
+    args = parser.parse_args()
+
+    workers: List[int] = [int(value) for value in args.workers.split(',')]
+    scenarios = args.scenario.split(',')
+    encrypted_mnemonic = ''
+    if 'register' in scenarios:
+        from decimal_sdk.encryption import Encryption
+        config = get_config()
+        encrypted_mnemonic = Encryption(config.encryption_key, fernet_key=config.fernet_key,
+                                        key_file=config.encryption_key_file).encrypt(MNEMONIC)
+
+    with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(args.clients) as executor:
+        socket_path = os.path.join(directory, 'ipc.sock')
+        for scenario in scenarios:
+            title = args.action if scenario == 'read' else 'create_wallet'
+            baseline = None
+            for count in workers:
+                process = start_server(os.path.abspath(args.server), socket_path, count)
+                try:
+                    futures = [executor.submit(run_client, socket_path, scenario, args.action, encrypted_mnemonic,
+                                               args.concurrency, args.duration, index * 1_000_000)
+                               for index in range(args.clients)]
+                    throughput = sum(future.result() for future in futures)
+                finally:
+                    process.terminate()
+                    process.wait()
+                baseline = baseline or throughput
+                print(f"{title:>20}, обработчиков {count:>2}: {throughput:9.0f} запросов/с "
+                      f"(x{throughput / baseline:.2f})")
+
+
+if __name__ == '__main__':
+    main()
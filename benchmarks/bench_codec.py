@@ -0,0 +1,73 @@
+"""Сравнение кодеков IPC на больших сообщениях.
+
+Запуск из корня репозитория: python -m benchmarks.bench_codec
+"""
+import time
+from typing import Any, Callable
+
+from decimal_sdk import codec as codecs
+from decimal_sdk.ipc_client import IPCClient
+
+ROUNDS = 5
+
+
+def make_multi_send(count: int = 20_000) -> dict:
+    """Запрос multi_send_token на count получателей."""
+    data = [{"token": f"0x{i % 50:040x}", "to": f"0x{i:040x}", "amount": 1.5 + i} for i in range(count)]
+    return {"id": 1, "action": "multi_send_token", "payload": {"data": data, "wallet_address": "0x" + "a" * 40}}
+
+
+def make_subgraph_page(count: int = 10_000) -> dict:
+    """Ответ Subgraph со стейками, часть значений — BigNumber."""
+    stakes = [
+        {
+            "id": f"0x{i:040x}",
+            "validator": {"id": f"0x{i * 7:040x}"},
+            "amount": str(i * 10 ** 18),
+            "reward": {"type": "BigNumber", "hex": hex(i * 10 ** 15)},
+        }
+        for i in range(count)
+    ]
+    return {"id": 1, "success": True, "result": stakes}
+
+
+def measure(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main() -> None:
+    available = [codecs.JSONCodec()]
+    if codecs.orjson is not None:
+        available.append(codecs.OrjsonCodec())
+    if codecs.msgspec is not None:
+        available.append(codecs.MsgspecCodec())
+
+    request = make_multi_send()
+    response = codecs.JSONCodec().encode(make_subgraph_page())
+    hook = IPCClient._convert_big_number
+    print(f"Запрос: {len(codecs.JSONCodec().encode(request)) / 1024:.0f} КиБ, ответ: {len(response) / 1024:.0f} КиБ")
+    for codec in available:
+        encode = measure(lambda: codec.encode(request))
+        decode = measure(lambda: codec.decode(response))
+        decode_hook = measure(lambda: codec.decode(response, hook))
+        print(f"{codec.name:>8}: encode {encode:6.1f} мс, decode {decode:6.1f} мс, "
+              f"decode + BigNumber {decode_hook:6.1f} мс")
+
+    if codecs.msgpack is not None:
+        # В MessagePack BigNumber приходит расширением с целым числом, а не объектом с hex
+        page = make_subgraph_page()
+        for stake in page["result"]:
+            stake["reward"] = codecs.pack_big_int(int(stake["reward"]["hex"], 16))
+        codec = codecs.MsgpackCodec(big_int_hook=IPCClient._wei_to_del)
+        binary_response = codec.encode(page)
+        encode = measure(lambda: codec.encode(request))
+        decode_hook = measure(lambda: codec.decode(binary_response))
+        print(f"{codec.name:>8}: encode {encode:6.1f} мс, decode + BigNumber {decode_hook:6.1f} мс, "
+              f"ответ {len(binary_response) / 1024:.0f} КиБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Время холодного импорта decimal_sdk по python -X importtime.
+
+Проверяет, что `import decimal_sdk` не загружает тяжёлые зависимости: они
+импортируются при первом обращении к DecimalSDK, шифрованию, кодекам или
+векторным котировкам. Завершается с ненулевым кодом, если тяжёлый модуль
+загружен при импорте пакета или превышен бюджет времени, поэтому подходит
+как регрессионная проверка в CI.
+
+Запуск из корня репозитория: python -m benchmarks.bench_import [--budget-ms 20]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROUNDS = 7
+
+# Модули, которые не должны загружаться при `import decimal_sdk`
+HEAVY_MODULES = ('asyncio', 'numpy', 'cryptography', 'dotenv', 'orjson', 'msgspec', 'msgpack', 'sqlite3')
+
+SCENARIOS = (
+    ('import decimal_sdk', 'import decimal_sdk'),
+    ('from decimal_sdk import DecimalSDK', 'from decimal_sdk import DecimalSDK'),
+)
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def import_times(code: str, env: Dict[str, str]) -> Tuple[int, Dict[str, int]]:
+    """Запускает код в новом интерпретаторе с -X importtime.
+
+    Returns:
+        Tuple[int, Dict[str, int]]: Суммарное время импорта модулей decimal_sdk
+        верхнего уровня в микросекундах (без модулей, загружаемых при старте
+        интерпретатора) и накопленное время каждого загруженного модуля.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                            capture_output=True, text=True, check=True)
+    total, modules = 0, {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        modules[name] = cumulative
+        if indent == 1 and name.split('.')[0] == 'decimal_sdk':
+            total += cumulative
+    return total, modules
+
+
+def measure(code: str, env: Dict[str, str]) -> Tuple[float, List[str]]:
+    """Медиана времени импорта в миллисекундах и загруженные тяжёлые модули."""
+    import_times(code, env)  # прогрев кэша байткода
+    samples, loaded = [], set()
+    for _ in range(ROUNDS):
+        total, modules = import_times(code, env)
+        samples.append(total)
+        loaded.update(name.split('.')[0] for name in modules)
+    heavy = sorted(name for name in HEAVY_MODULES if name in loaded)
+    return statistics.median(samples) / 1000, heavy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=20.0,
+                        help='бюджет времени `import decimal_sdk` в миллисекундах')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Без байткода время импорта включает компиляцию исходников
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (os.getcwd(), env.get('PYTHONPATH'))))
+    failed = False
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env['PYTHONPYCACHEPREFIX'] = cache_dir
+        for index, (title, code) in enumerate(SCENARIOS):
+            elapsed, heavy = measure(code, env)
+            print(f"{title:>36}: {elapsed:6.1f} мс" + (f", загружены: {', '.join(heavy)}" if heavy else ''))
+            if index == 0:
+                if heavy:
+                    print(f"ОШИБКА: import decimal_sdk загружает {', '.join(heavy)}")
+                    failed = True
+                if elapsed > args.budget_ms:
+                    print(f"ОШИБКА: import decimal_sdk дольше бюджета {args.budget_ms:.0f} мс")
+                    failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Стоимость создания DecimalSDK и первого обращения к шифрованию с кэшем производного ключа и без него.
+
+Запуск из корня репозитория: python -m benchmarks.bench_startup
+"""
+import os
+import time
+from typing import Callable
+
+os.environ.setdefault("ENCRYPTION_KEY", "benchmark-password")
+
+from decimal_sdk import DecimalSDK, Encryption
+from decimal_sdk.config import get_config
+from decimal_sdk.encryption import _derive_key_cached
+
+ROUNDS = 20
+
+
+def measure(func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main() -> None:
+    def cold() -> None:
+        # Поведение без кэша: PBKDF2 при каждом создании SDK
+        _derive_key_cached.cache_clear()
+        get_config.cache_clear()
+        DecimalSDK().encryption
+
+    cold_ms = measure(cold)
+    cached_ms = measure(lambda: DecimalSDK().encryption)
+
+    fernet_key = Encryption.derive_fernet_key(os.environ["ENCRYPTION_KEY"])
+    password = os.environ.pop("ENCRYPTION_KEY")
+    os.environ["ENCRYPTION_FERNET_KEY"] = fernet_key
+    _derive_key_cached.cache_clear()
+    get_config.cache_clear()
+    try:
+        pre_derived_ms = measure(lambda: DecimalSDK().encryption)
+    finally:
+        os.environ.pop("ENCRYPTION_FERNET_KEY")
+        os.environ["ENCRYPTION_KEY"] = password
+        get_config.cache_clear()
+
+    print(f"Без кэша (PBKDF2 каждый раз): {cold_ms:6.2f} мс на DecimalSDK()")
+    print(f"С кэшем производного ключа:   {cached_ms:6.2f} мс на DecimalSDK()")
+    print(f"С готовым ключом Fernet:      {pre_derived_ms:6.2f} мс на DecimalSDK()")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
-from .client import DecimalSDK
-from .encryption import Encryption
-from .config import Config
-from .exceptions import DecimalSDKError, IPCConnectionError, TransactionError, WalletRegistrationError, ValidationError
+from .exceptions import DecimalSDKError, IPCConnectionError, TransactionError, WalletRegistrationError, ValidationError, \
+    OverloadError, CircuitOpenError, RequestNotSentError
+
+# Без импорта typing: он один занимает большую часть времени импорта пакета
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .client import DecimalSDK
+    from .encryption import Encryption
+    from .config import Config
 
 __version__ = "0.1.0"
 __all__ = [
@@ -12,5 +17,30 @@ __all__ = [
     "IPCConnectionError",
     "TransactionError",
     "WalletRegistrationError",
-    "ValidationError"
-]
\ No newline at end of file
+    "ValidationError",
+    "OverloadError",
+    "CircuitOpenError",
+    "RequestNotSentError"
+]
+
+# Тяжёлые модули (asyncio, cryptography, dotenv) загружаются при первом обращении,
+# чтобы `import decimal_sdk` не замедлял запуск коротких процессов
+_LAZY = {
+    "DecimalSDK": ".client",
+    "Encryption": ".encryption",
+    "Config": ".config",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
\ No newline at end of file
@@ -0,0 +1,184 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .admission import RPC_READ, SUBGRAPH_READ, WRITE
+
+# Статические списки используются до получения свойств действий от IPC-сервера
+# и с серверами без действия describe_actions.
+
+# Действия, которые не меняют состояние сети и кошелька: только их можно
+# объединять в пакеты и выполнять одним вызовом для нескольких одинаковых запросов.
+READ_ONLY_ACTIONS = frozenset({
+    'get_current_approve_transactions', 'get_expired_approve_transactions', 'get_balance', 'get_balance_eth',
+    'get_balance_bnb', 'check_token_exists', 'get_address_token_by_symbol', 'get_commission_symbol',
+    'calculate_buy_output', 'calculate_buy_input', 'calculate_sell_input', 'calculate_sell_output',
+    'allowance_token', 'balance_of_token', 'supports_interface_token', 'get_nft_type',
+    'get_nft_type_from_contract', 'get_approved_nft721', 'is_approved_for_all_nft', 'owner_of_nft721',
+    'get_token_uri_nft', 'get_allow_mint_nft', 'balance_of_nft', 'supports_interface_nft', 'get_rate_nft1155',
+    'calc_reserve_nft1155', 'get_reserve_nft', 'get_refundable_nft', 'get_supply_nft1155',
+    'get_token_stakes_page_by_member', 'get_frozen_stakes_queue_token', 'get_freeze_time_token',
+    'get_stake_token', 'get_stake_id_token', 'get_nft_stakes_page_by_member', 'get_frozen_stakes_queue_nft',
+    'get_freeze_time_nft', 'get_validator_status', 'validator_is_active', 'validator_is_member',
+    'get_decimal_contracts', 'get_validators', 'get_validator', 'get_validator_penalties',
+    'get_validator_penalties_from_block', 'get_sum_amount_to_penalty', 'get_tokens', 'get_tokens_by_owner',
+    'get_token_by_symbol', 'get_token_by_address', 'get_address_balances', 'get_stakes',
+    'get_stakes_by_address', 'get_stakes_by_validator', 'get_transfer_stakes',
+    'get_transfer_stakes_by_address', 'get_withdraw_stakes', 'get_withdraw_stakes_by_address',
+    'get_nft_collections', 'get_nft_collections_by_creator', 'get_nft_collection_by_address',
+    'get_nft_collection_type', 'get_nfts', 'get_nfts_by_collection', 'get_address_balances_nfts',
+    'get_address_balances_nfts_by_collection', 'get_nft_by_collection_and_token_id', 'get_nft_stakes',
+    'get_nft_stakes_by_address', 'get_nft_stakes_by_validator', 'get_transfer_nft_stakes',
+    'get_transfer_nft_stakes_by_address', 'get_withdraw_nft_stakes', 'get_withdraw_nft_stakes_by_address',
+    'get_bridge_tokens', 'get_bridge_token_by_address', 'get_bridge_token_by_symbol', 'get_bridge_transfers',
+    'get_bridge_transfers_by_from', 'get_bridge_transfers_by_to', 'get_bridge_transfers_by_token',
+    'get_multisig_wallets', 'get_multisig_wallets_by_participant', 'get_multisig_approve_transactions',
+    'get_multisig_expired_approve_transactions', 'get_url_from_cid', 'parse_ether', 'format_ether',
+    'get_address', 'get_latest_block', 'get_fee_data', 'call_contract', 'is_wallet_registered',
+})
+
+# Списки Subgraph с постраничными параметрами first/skip
+PAGED_ACTIONS = frozenset({
+    'get_validator_penalties', 'get_validator_penalties_from_block', 'get_tokens', 'get_tokens_by_owner',
+    'get_address_balances', 'get_stakes', 'get_stakes_by_address', 'get_stakes_by_validator',
+    'get_transfer_stakes', 'get_transfer_stakes_by_address', 'get_withdraw_stakes',
+    'get_withdraw_stakes_by_address', 'get_nft_collections', 'get_nft_collections_by_creator', 'get_nfts',
+    'get_nfts_by_collection', 'get_address_balances_nfts', 'get_address_balances_nfts_by_collection',
+    'get_nft_stakes', 'get_nft_stakes_by_address', 'get_nft_stakes_by_validator', 'get_transfer_nft_stakes',
+    'get_transfer_nft_stakes_by_address', 'get_withdraw_nft_stakes', 'get_withdraw_nft_stakes_by_address',
+    'get_bridge_tokens', 'get_bridge_transfers', 'get_bridge_transfers_by_from', 'get_bridge_transfers_by_to',
+    'get_bridge_transfers_by_token', 'get_multisig_wallets', 'get_multisig_wallets_by_participant',
+    'get_multisig_approve_transactions', 'get_multisig_expired_approve_transactions',
+})
+
+# Действия только для чтения, результат которых зависит от кошелька запроса:
+# их результаты кэшируются и объединяются отдельно для каждого кошелька
+WALLET_SCOPED_ACTIONS = frozenset({'is_wallet_registered'})
+
+# Действия, которым не нужен зарегистрированный кошелёк клиента; кошелёк для
+# запросов внутри batch проверяется по каждому запросу при постановке в пакет
+WALLET_FREE_ACTIONS = frozenset({'create_wallet', 'describe_actions', 'batch'})
+
+
+class ActionRegistry:
+    """Свойства действий IPC-сервера из его реестра действий.
+
+    Сервер описывает каждое действие флагами evm, read_only, batch,
+    wallet_scoped, cacheable и cache_ttl; клиент получает их один раз
+    действием describe_actions. По ним SDK решает, какие запросы кэшировать,
+    объединять и отправлять в пакетах; idempotency сообщает, что сервер
+    распознаёт повтор транзакции по ключу идемпотентности. До загрузки и для серверов без
+    describe_actions используются статические списки модуля.
+    """
+
+    def __init__(self):
+        self.actions: Optional[Dict[str, Dict[str, Any]]] = None
+        self.loaded = False
+        self.idempotency = False
+        self._loading: Optional[asyncio.Future] = None
+
+    async def load(self, request: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        """Загружает свойства действий, если они ещё не загружены.
+
+        Одновременные вызовы ждут один запрос. Ошибка соединения пробрасывается,
+        и следующий вызов повторяет загрузку; если сервер не знает describe_actions,
+        реестр остаётся на статических списках.
+
+        Args:
+            request (Callable): Отправка запроса IPC, например ConnectionPool.request.
+        """
+        if self.loaded:
+            return
+        task = self._loading
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._loading = asyncio.ensure_future(self._load(request))
+        try:
+            await asyncio.shield(task)
+        finally:
+            if task.done() and self._loading is task:
+                self._loading = None
+
+    async def _load(self, request: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        response = await request({'action': 'describe_actions', 'payload': {}})
+        if response.get('success'):
+            result = response.get('result', {})
+            self.actions = result.get('actions') or None
+            self.idempotency = bool(result.get('idempotency'))
+        self.loaded = True
+
+    def get(self, action: str) -> Optional[Dict[str, Any]]:
+        """Возвращает свойства действия или None, если они не загружены или действие неизвестно."""
+        return self.actions.get(action) if self.actions is not None else None
+
+    def is_read_only(self, action: str) -> bool:
+        """Проверяет, что действие не меняет состояние сети и кошелька."""
+        if self.actions is None:
+            return action in READ_ONLY_ACTIONS
+        meta = self.actions.get(action)
+        return bool(meta and meta['read_only'])
+
+    def can_batch(self, action: str) -> bool:
+        """Проверяет, что действие можно выполнять внутри пакетного запроса."""
+        if self.actions is None:
+            return action in READ_ONLY_ACTIONS
+        meta = self.actions.get(action)
+        return bool(meta and meta['batch'])
+
+    def can_coalesce(self, action: str) -> bool:
+        """Проверяет, что одинаковые одновременные запросы можно выполнить одним вызовом.
+
+        Объединяются только действия для чтения; запросы действий, зависящих от
+        кошелька (is_wallet_scoped), объединяются только в пределах одного кошелька.
+        """
+        if self.actions is None:
+            return action in READ_ONLY_ACTIONS
+        meta = self.actions.get(action)
+        return bool(meta and meta['read_only'])
+
+    def is_wallet_scoped(self, action: str) -> bool:
+        """Проверяет, что результат действия зависит от кошелька запроса."""
+        if self.actions is None:
+            return action in WALLET_SCOPED_ACTIONS
+        meta = self.actions.get(action)
+        return bool(meta and meta['wallet_scoped'])
+
+    def is_stateless(self, action: str) -> bool:
+        """Проверяет, что действие не зависит от кошелька и может выполняться на любом IPC-сервере.
+
+        До загрузки свойств все действия считаются зависящими от кошелька.
+        """
+        meta = self.get(action)
+        return bool(meta and meta['read_only'] and not meta['evm'] and not meta['wallet_scoped'])
+
+    def action_class(self, action: str) -> str:
+        """Класс действия для ограничения одновременных запросов.
+
+        Returns:
+            str: write — меняет состояние, subgraph_read — чтение без состояния кошелька,
+            rpc_read — остальные чтения (через DecimalEVM или от имени кошелька).
+        """
+        if not self.is_read_only(action):
+            return WRITE
+        return SUBGRAPH_READ if self.is_stateless(action) else RPC_READ
+
+    def needs_wallet(self, action: str) -> bool:
+        """Проверяет, что действию нужен зарегистрированный кошелёк клиента.
+
+        Кошелёк нужен действиям с DecimalEVM кошелька и действиям, результат которых
+        зависит от кошелька; неизвестные серверу действия проверяются как раньше.
+        Пакетному запросу кошелёк не нужен, хотя сервер выполняет его там, где живёт
+        кошелёк запроса (wallet_scoped).
+        """
+        if action in WALLET_FREE_ACTIONS:
+            return False
+        if self.actions is None or action not in self.actions:
+            return True
+        meta = self.actions[action]
+        return meta['evm'] or meta['wallet_scoped']
+
+    def cache_ttls(self) -> Dict[str, Optional[float]]:
+        """Время жизни результатов кэшируемых действий по данным сервера.
+
+        Returns:
+            Dict[str, Optional[float]]: Время жизни в секундах по действиям; None — без срока.
+        """
+        return {name: meta['cache_ttl'] for name, meta in (self.actions or {}).items() if meta['cacheable']}
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .exceptions import OverloadError
+
+# Классы действий: транзакции, чтения через RPC узла (DecimalEVM) и чтения Subgraph
+WRITE = 'write'
+RPC_READ = 'rpc_read'
+SUBGRAPH_READ = 'subgraph_read'
+
+# Максимальное число одновременных запросов класса; None — без ограничения
+DEFAULT_LIMITS: Dict[str, Optional[int]] = {
+    WRITE: 16,
+    RPC_READ: 64,
+    SUBGRAPH_READ: 32,
+}
+
+
+class _Gate:
+    """Ограничение одновременных запросов одного класса с очередью FIFO."""
+
+    def __init__(self, limit: Optional[int], queue_size: Optional[int]):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.peak_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, action_class: str) -> None:
+        if self.limit is None or (self.in_flight < self.limit and not self._waiters):
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if self.queue_size is not None and len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise OverloadError(f"Очередь запросов {action_class} заполнена: {self.in_flight} в работе, "
+                                f"{len(self._waiters)} ожидают")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self.peak_queued = max(self.peak_queued, len(self._waiters))
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self._waiters.remove(future)
+            else:
+                # Место уже передано этому запросу: отдаём его следующему
+                self.release()
+            raise
+        waited = time.monotonic() - start
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.admitted += 1
+
+    def release(self) -> None:
+        # Место переходит первому ожидающему без уменьшения in_flight
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        waited = self.admitted or 1
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'queued': len(self._waiters),
+            'peak_queued': self.peak_queued,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'wait_avg_ms': round(self.wait_total / waited * 1000, 3),
+            'wait_max_ms': round(self.wait_max * 1000, 3),
+        }
+
+
+class AdmissionController:
+    """Ограничение числа одновременных запросов к IPC-серверу по классам действий.
+
+    Запросы сверх лимита класса ждут в очереди FIFO, поэтому всплеск вызовов
+    (например, asyncio.gather по тысячам get_balance) не перегружает IPC-сервер
+    и RPC узла, а задержка остальных классов не растёт. Если задан queue_size,
+    запрос, для которого в очереди класса нет места, сразу завершается
+    OverloadError.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Optional[int]]] = None, queue_size: Optional[int] = None):
+        """Инициализация ограничений.
+
+        Args:
+            limits (Optional[Dict[str, Optional[int]]]): Лимиты по классам write, rpc_read и
+                subgraph_read, дополняют DEFAULT_LIMITS; None — без ограничения.
+            queue_size (Optional[int]): Максимальная длина очереди каждого класса; None —
+                без ограничения, 0 — отклонять запросы сверх лимита сразу.
+        """
+        limits = {**DEFAULT_LIMITS, **(limits or {})}
+        for action_class, limit in limits.items():
+            if limit is not None and limit < 1:
+                raise ValueError(f"Лимит класса {action_class} должен быть положительным")
+        self.queue_size = queue_size
+        self._gates = {action_class: _Gate(limit, queue_size) for action_class, limit in limits.items()}
+
+    def slot(self, action_class: str) -> '_Slot':
+        """Место для одного запроса класса.
+
+        Пример:
+            async with admission.slot('rpc_read'):
+                response = await pool.request(message)
+
+        Raises:
+            OverloadError: При входе, если очередь класса заполнена.
+        """
+        return _Slot(self._gates[action_class], action_class)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Состояние очередей по классам.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: limit, in_flight, queued — глубина очереди,
+            peak_queued — наибольшая глубина, admitted, rejected, wait_avg_ms и
+            wait_max_ms — среднее и наибольшее ожидание в очереди.
+        """
+        return {action_class: gate.stats() for action_class, gate in self._gates.items()}
+
+
+class _Slot:
+    __slots__ = ('_gate', '_action_class')
+
+    def __init__(self, gate: _Gate, action_class: str):
+        self._gate = gate
+        self._action_class = action_class
+
+    async def __aenter__(self) -> None:
+        await self._gate.acquire(self._action_class)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._gate.release()
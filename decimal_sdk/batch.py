@@ -0,0 +1,135 @@
+import asyncio
+from typing import Any, Dict, List, Set, Tuple
+
+from .exceptions import ValidationError, WalletRegistrationError
+
+
+class _BatchProxy:
+    """Подставляется вместо SDK при вызове его методов внутри пакета.
+
+    Все атрибуты берутся у исходного SDK, а _send_request ставит запрос
+    в очередь пакета вместо немедленной отправки.
+    """
+
+    def __init__(self, batch: 'Batch'):
+        self._batch = batch
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._batch._sdk, name)
+
+    async def _send_request(self, action: str, payload: Dict[str, Any]) -> Any:
+        return await self._batch._enqueue(action, payload)
+
+
+class Batch:
+    """Пакет запросов только для чтения, отправляемых одним сообщением IPC.
+
+    Методы SDK, вызванные у пакета, проходят обычную валидацию и возвращают
+    asyncio.Task, результат которой доступен после выполнения пакета.
+    """
+
+    def __init__(self, sdk: Any):
+        """Инициализация пакета.
+
+        Args:
+            sdk (DecimalSDK): Экземпляр SDK, через который будет отправлен пакет.
+        """
+        self._sdk = sdk
+        self._proxy = _BatchProxy(self)
+        self._queued: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._tasks: List[asyncio.Task] = []
+        # Задачи, поставившие запрос в очередь и ждущие ответа на пакет
+        self._waiting: Set[asyncio.Task] = set()
+        self._enqueued = asyncio.Event()
+
+    def __getattr__(self, name: str) -> Any:
+        # Функция метода без привязки: вместо SDK (или сессии кошелька) ей передаётся прокси
+        function = getattr(getattr(self._sdk, name, None), '__func__', None)
+        if name.startswith('_') or not asyncio.iscoroutinefunction(function):
+            raise AttributeError(f"Метод {name} недоступен в пакетном запросе")
+
+        def call(*args: Any, **kwargs: Any) -> asyncio.Task:
+            task = asyncio.ensure_future(function(self._proxy, *args, **kwargs))
+            self._tasks.append(task)
+            return task
+
+        return call
+
+    async def _enqueue(self, action: str, payload: Dict[str, Any]) -> Any:
+        """Добавляет запрос в очередь и ожидает его результат из ответа на пакет."""
+        sdk = self._sdk
+        if not sdk.actions.loaded:
+            await sdk._load_actions()
+        if not sdk.actions.can_batch(action):
+            raise ValidationError(f"Действие {action} не может выполняться в пакетном запросе")
+        if not sdk.wallet_address and sdk.actions.needs_wallet(action):
+            raise WalletRegistrationError("Кошелек не создан. Сначала вызовите create_wallet.")
+        future = asyncio.get_running_loop().create_future()
+        self._queued.append((action, payload, future))
+        self._enqueued.set()
+        task = asyncio.current_task()
+        self._waiting.add(task)
+        try:
+            return await future
+        finally:
+            self._waiting.discard(task)
+
+    async def _flush(self, queued: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        """Отправляет накопленные запросы и раскладывает ответы по ожидающим задачам."""
+        requests = [{'action': action, 'payload': payload} for action, payload, _ in queued]
+        try:
+            responses = await self._sdk._send_request('batch', {'requests': requests})
+        except Exception as e:
+            for _, _, future in queued:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), response in zip(queued, responses):
+            try:
+                future.set_result(self._sdk._handle_response(response))
+            except Exception as e:
+                future.set_exception(e)
+
+    async def execute(self) -> List[Any]:
+        """Отправляет все добавленные вызовы одним сообщением.
+
+        Returns:
+            List[Any]: Результаты вызовов в порядке добавления; для неудачных вызовов — исключение.
+        """
+        if not self._sdk.actions.loaded:
+            await self._sdk._load_actions()
+        while True:
+            # Даём задачам дойти до постановки запроса в очередь
+            await asyncio.sleep(0)
+            queued, self._queued = self._queued, []
+            if queued:
+                await self._flush(queued)
+                continue
+            # Задача может ещё чего-то ждать до постановки запроса; пакет отправляется,
+            # когда каждая задача поставила запрос или завершилась
+            running = [task for task in self._tasks if not task.done() and task not in self._waiting]
+            if not running:
+                break
+            self._enqueued.clear()
+            enqueued = asyncio.ensure_future(self._enqueued.wait())
+            try:
+                await asyncio.wait(running + [enqueued], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                enqueued.cancel()
+
+        tasks, self._tasks = self._tasks, []
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> 'Batch':
+        # Реестр действий нужен до первого вызова: иначе вызовы ждут его загрузки
+        if not self._sdk.actions.loaded:
+            await self._sdk._load_actions()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.execute()
+            return
+        for task in self._tasks:
+            task.cancel()
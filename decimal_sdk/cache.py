@@ -0,0 +1,147 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Время жизни записей по умолчанию в секундах; None — запись не устаревает и
+# вытесняется только по LRU. Кэшируются только перечисленные действия. После
+# подключения SDK политику заменяет cache_ttl из реестра действий IPC-сервера.
+DEFAULT_TTL: Dict[str, Optional[float]] = {
+    'get_decimal_contracts': 3600.0,
+    'get_address_token_by_symbol': 3600.0,
+    'get_token_by_symbol': 30.0,
+    'get_token_by_address': 30.0,
+    'get_commission_symbol': 300.0,
+    'get_freeze_time_token': 3600.0,
+    'get_freeze_time_nft': 3600.0,
+    'get_nft_type': None,
+    'get_nft_type_from_contract': None,
+    'get_refundable_nft': None,
+}
+
+
+class ResponseCache:
+    """Ограниченный LRU-кэш результатов запросов только для чтения с TTL по действиям.
+
+    Ключ — пара (action, payload), для действий, зависящих от кошелька, — с кошельком
+    запроса. Кэшируются только успешные непустые ответы;
+    результаты возвращаются без копирования, поэтому их не следует изменять.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[Dict[str, Optional[float]]] = None):
+        """Инициализация кэша.
+
+        Args:
+            max_size (int): Максимальное число записей; 0 отключает кэш.
+            ttl (Optional[Dict[str, Optional[float]]]): Время жизни по действиям, дополняет
+                и переопределяет DEFAULT_TTL. Чтобы исключить действие из кэша, укажите 0.
+        """
+        self.max_size = max_size
+        self._overrides = dict(ttl or {})
+        self.ttl = {**DEFAULT_TTL, **self._overrides}
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, Hashable], Tuple[Optional[float], Any]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update_defaults(self, defaults: Dict[str, Optional[float]]) -> None:
+        """Заменяет политику по умолчанию, сохраняя время жизни, заданное при создании кэша.
+
+        Args:
+            defaults (Dict[str, Optional[float]]): Время жизни по действиям, например
+                из реестра действий IPC-сервера.
+        """
+        self.ttl = {**defaults, **self._overrides}
+
+    def is_cacheable(self, action: str) -> bool:
+        """Проверяет, кэшируются ли результаты действия.
+
+        Args:
+            action (str): Действие IPC.
+
+        Returns:
+            bool: True, если для действия задана политика кэширования.
+        """
+        return self.max_size > 0 and action in self.ttl and self.ttl[action] != 0
+
+    @staticmethod
+    def make_key(action: str, payload: Dict[str, Any], wallet: Optional[str] = None) -> Tuple[str, Hashable]:
+        """Строит ключ кэша, не зависящий от порядка полей payload.
+
+        Args:
+            action (str): Действие IPC.
+            payload (Dict[str, Any]): Параметры запроса без полей кошелька.
+            wallet (Optional[str]): Кошелёк запроса для действий, результат которых от него зависит.
+        """
+        params = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return action, params if wallet is None else (wallet, params)
+
+    def get(self, key: Tuple[str, Hashable]) -> Any:
+        """Возвращает результат по ключу и отмечает его как недавно использованный.
+
+        Args:
+            key (Tuple[str, Hashable]): Ключ из make_key.
+
+        Returns:
+            Any: Закэшированный результат или None при промахе.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Tuple[str, Hashable], result: Any) -> None:
+        """Сохраняет результат, вытесняя давно не использованные записи.
+
+        Args:
+            key (Tuple[str, Hashable]): Ключ из make_key.
+            result (Any): Результат запроса.
+        """
+        if result is None:
+            return
+        ttl = self.ttl.get(key[0])
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, action: Optional[str] = None, payload: Optional[Dict[str, Any]] = None,
+                   wallet: Optional[str] = None) -> int:
+        """Удаляет записи из кэша.
+
+        Args:
+            action (Optional[str]): Действие; если не указано, кэш очищается целиком.
+            payload (Optional[Dict[str, Any]]): Параметры запроса; если не указаны,
+                удаляются все записи действия.
+            wallet (Optional[str]): Кошелёк запроса, см. make_key.
+
+        Returns:
+            int: Число удалённых записей.
+        """
+        if action is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        if payload is not None:
+            return 1 if self._entries.pop(self.make_key(action, payload, wallet), None) is not None else 0
+        keys = [key for key in self._entries if key[0] == action]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики попаданий и промахов.
+
+        Returns:
+            Dict[str, int]: hits, misses и size — текущее число записей.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
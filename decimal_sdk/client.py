@@ -1,44 +1,265 @@
-import json
 import asyncio
-from typing import Dict, Any, Optional, List, Tuple
-from decimal_sdk.encryption import Encryption
-from decimal_sdk.config import Config
+import uuid
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Sequence, Tuple, Union, AsyncIterator
+from decimal_sdk.actions import PAGED_ACTIONS, ActionRegistry
+from decimal_sdk.admission import RPC_READ, SUBGRAPH_READ, WRITE, AdmissionController
+from decimal_sdk.config import get_config
+from decimal_sdk.codec import get_codec
+from decimal_sdk.pool import BalancedPool
+from decimal_sdk.retry import RETRYABLE_KINDS, CircuitBreaker, RetryPolicy
+from decimal_sdk.batch import Batch
+from decimal_sdk.cache import ResponseCache
+from decimal_sdk.pagination import DEFAULT_PAGE_SIZE, fetch_pages, paginate
+from decimal_sdk.quotes import QuoteEngine
 from decimal_sdk.exceptions import DecimalSDKError, IPCConnectionError, TransactionError, WalletRegistrationError, \
-    ValidationError, IPCError, EncryptionError
+    ValidationError, IPCError, EncryptionError, CircuitOpenError, OverloadError, RequestNotSentError
+
+if TYPE_CHECKING:
+    from decimal_sdk.encryption import Encryption
+
+# Категории ошибок из поля kind ответа IPC-сервера
+_ERROR_KINDS = {
+    'transaction': (TransactionError, "Ошибка транзакции"),
+    'wallet': (WalletRegistrationError, "Ошибка регистрации кошелька"),
+    'unknown_wallet': (WalletRegistrationError, "Кошелёк не зарегистрирован на IPC-сервере"),
+    'validation': (ValidationError, "Ошибка валидации"),
+    'unknown_action': (ValidationError, "Ошибка валидации"),
+}
 
 
 class DecimalSDK:
-    def __init__(self, socket_path: Optional[str] = None):
-        """Инициализация SDK с настройками из .env."""
-        self.config = Config()
-        self.socket_path = socket_path or self.config.socket_path
-        self.encryption = Encryption(self.config.encryption_key)
+    def __init__(self, socket_path: Optional[Union[str, Sequence[str]]] = None, pool_size: Optional[int] = None,
+                 pool_idle_timeout: Optional[float] = None, max_message_size: Optional[int] = None,
+                 codec: Optional[str] = None, cache_size: Optional[int] = None,
+                 cache_ttl: Optional[Dict[str, Optional[float]]] = None, coalesce: bool = True,
+                 concurrency: Optional[Dict[str, Optional[int]]] = None, queue_size: Optional[int] = None,
+                 retries: Optional[int] = None):
+        """Инициализация SDK с настройками из .env.
+
+        cache_ttl дополняет политику кэширования cache.DEFAULT_TTL: время жизни
+        результатов по действиям в секундах (None — без срока, 0 — не кэшировать).
+        coalesce объединяет одинаковые одновременные запросы только для чтения в один вызов.
+        socket_path может быть списком сокетов нескольких IPC-серверов: запросы
+        распределяются между ними BalancedPool.
+        concurrency ограничивает число одновременных запросов по классам действий
+        (write, rpc_read, subgraph_read; None — без ограничения), остальные ждут в
+        очереди; при заданном queue_size запросы сверх очереди завершаются OverloadError.
+        retries — число повторов чтения после сбоя соединения или узла; транзакции
+        получают ключ идемпотентности и повторяются только после сбоя соединения.
+        """
+        self.config = get_config()
+        if socket_path is None:
+            self.socket_paths = list(self.config.socket_paths)
+        elif isinstance(socket_path, str):
+            self.socket_paths = [socket_path]
+        else:
+            self.socket_paths = list(socket_path)
+        self.socket_path = self.socket_paths[0]
+        self._encryption = None
         self.wallet_address: Optional[str] = None  # Хранит адрес кошелька после создания
+        self.wallet_id: Optional[str] = None  # Идентификатор кошелька на IPC-сервере
+        # Зашифрованная мнемоника: кошелёк регистрируется заново на сервере, который его не знает
+        self._encrypted_mnemonic: Optional[str] = None
+        self.codec = get_codec(codec or self.config.codec)
+        # Свойства действий загружаются с IPC-сервера перед первым запросом
+        self.actions = ActionRegistry()
+        pool_options = dict(
+            max_size=pool_size or self.config.pool_size,
+            idle_timeout=pool_idle_timeout or self.config.pool_idle_timeout,
+            health_check_interval=self.config.pool_health_check,
+            max_message_size=max_message_size or self.config.max_message_size,
+            codec=self.codec,
+        )
+        # BalancedPool и для одного сокета: у каждого сервера свой автомат защиты
+        self._pool = BalancedPool(self.socket_paths, stateless=self.actions.is_stateless,
+                                  max_failures=self.config.breaker_threshold, eject_time=self.config.breaker_reset,
+                                  **pool_options)
+        self.cache = ResponseCache(
+            max_size=self.config.cache_size if cache_size is None else cache_size,
+            ttl=cache_ttl,
+        )
+        self.coalesce = coalesce
+        limits = {
+            WRITE: self.config.max_writes or None,
+            RPC_READ: self.config.max_rpc_reads or None,
+            SUBGRAPH_READ: self.config.max_subgraph_reads or None,
+        }
+        self.admission = AdmissionController(
+            {**limits, **(concurrency or {})},
+            self.config.queue_size if queue_size is None else queue_size,
+        )
+        self.retry = RetryPolicy(
+            self.config.retries if retries is None else retries,
+            self.config.retry_base_delay,
+            self.config.retry_max_delay,
+        )
+        self.breakers = {action_class: CircuitBreaker(self.config.breaker_threshold, self.config.breaker_reset)
+                         for action_class in (WRITE, RPC_READ, SUBGRAPH_READ)}
+        self._in_flight: Dict[Tuple[str, Any], asyncio.Future] = {}
+
+    @property
+    def encryption(self) -> 'Encryption':
+        """Шифрование мнемоник; cryptography загружается при первом обращении."""
+        if self._encryption is None:
+            from decimal_sdk.encryption import Encryption
+            self._encryption = Encryption(self.config.encryption_key, fernet_key=self.config.fernet_key,
+                                          key_file=self.config.encryption_key_file)
+        return self._encryption
+
+    async def __aenter__(self) -> 'DecimalSDK':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Закрывает соединения с IPC-сервером."""
+        await self._pool.close()
 
     async def _send_request(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Отправляет запрос на IPC-сервер и возвращает ответ."""
-        if not self.wallet_address:
+        if not self.actions.loaded:
+            await self._load_actions()
+        if not self.wallet_address and self.actions.needs_wallet(action):
             raise WalletRegistrationError("Кошелек не создан. Сначала вызовите create_wallet.")
 
-        payload['wallet_address'] = self.wallet_address
+        # Ключ строится до добавления полей кошелька: большинство действий для чтения
+        # возвращают общие данные сети, и сессии разных кошельков разделяют кэш SDK.
+        # Результаты действий, зависящих от кошелька, хранятся и объединяются по кошельку
+        cacheable = self.cache.is_cacheable(action)
+        coalesce = self.coalesce and self.actions.can_coalesce(action)
+        wallet = (self.wallet_id or self.wallet_address) if self.actions.is_wallet_scoped(action) else None
+        key = self.cache.make_key(action, payload, wallet) if cacheable or coalesce else None
+        if cacheable:
+            result = self.cache.get(key)
+            if result is not None:
+                return result
+
+        if self.wallet_address is not None:
+            payload['wallet_address'] = self.wallet_address
+        if self.wallet_id is not None:
+            payload['wallet_id'] = self.wallet_id
+        if self.actions.idempotency and not self.actions.is_read_only(action):
+            # Один ключ на вызов: повтор после обрыва соединения получит исход первой попытки
+            payload.setdefault('idempotency_key', uuid.uuid4().hex)
         request = {'action': action, 'payload': payload}
-
-        try:
-            reader, writer = await asyncio.open_unix_connection(self.socket_path)
-        except (ConnectionError, FileNotFoundError) as e:
-            raise IPCConnectionError(f"Ошибка подключения к IPC: {str(e)}")
-
+        if not coalesce:
+            return await self._fetch(key if cacheable else None, request)
+
+        # Одинаковые запросы в полёте ждут один общий вызов; shield не даёт отмене
+        # одного из ожидающих прервать вызов для остальных
+        task = self._in_flight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch(key if cacheable else None, request))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget_in_flight(key, done))
+        return await asyncio.shield(task)
+
+    async def _load_actions(self) -> None:
+        """Загружает свойства действий с IPC-сервера и применяет политику кэширования сервера."""
+        await self.actions.load(self._pool.request)
+        ttls = self.actions.cache_ttls()
+        if ttls:
+            self.cache.update_defaults(ttls)
+
+    async def _fetch(self, cache_key: Optional[Tuple[str, Any]], request: Dict[str, Any],
+                     reregister: bool = True) -> Any:
+        """Выполняет запрос в пределах лимита класса действия и сохраняет результат в кэш, если передан ключ.
+
+        Чтение повторяется после сбоя соединения и ошибок узла или Subgraph
+        (RETRYABLE_KINDS); транзакция — только после сбоя соединения и только если
+        сервер распознаёт повтор по ключу идемпотентности: ошибка узла не говорит,
+        попала ли транзакция в сеть. Если на повтор транзакции сервер отвечает, что
+        не знает кошелёк (обработчик перезапущен вместе с ключами идемпотентности),
+        вызывающий получает ошибку соединения первой попытки: её исход неизвестен.
+        В остальных случаях запрос к серверу, который не знает кошелёк, не выполнялся:
+        кошелёк, зарегистрированный через этот SDK, регистрируется там заново, и
+        запрос повторяется один раз.
+        Запрос, который не покинул клиент (сервер недоступен, запрос слишком
+        большой), не повторяется. Между попытками место в очереди класса освобождается.
+
+        Raises:
+            CircuitOpenError: Если автомат защиты класса действия или всех серверов открыт.
+            RequestNotSentError: Если запрос не удалось отправить.
+        """
+        action_class = self.actions.action_class(request['action'])
+        read_only = action_class != WRITE
+        breaker = self.breakers[action_class]
+        # Если повтор не удалось отправить, вызывающий получает ошибку соединения
+        # предыдущей попытки: её исход по-прежнему неизвестен
+        error: Optional[IPCConnectionError] = None
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                if error is not None:
+                    raise error
+                raise CircuitOpenError(f"Запросы {action_class} не отправляются после серии сбоев, "
+                                       f"повтор через {breaker.retry_after():.1f} с")
+            try:
+                async with self.admission.slot(action_class):
+                    response = await self._pool.request(request)
+            except (RequestNotSentError, OverloadError):
+                if error is not None:
+                    raise error
+                raise
+            except IPCConnectionError as e:
+                breaker.record_failure()
+                if not (read_only or self.actions.idempotency) or attempt >= self.retry.retries:
+                    raise
+                error = e
+            else:
+                if response.get('success') or response.get('kind') not in RETRYABLE_KINDS:
+                    breaker.record_success()
+                    break
+                breaker.record_failure()
+                if not read_only or attempt >= self.retry.retries:
+                    break
+            finally:
+                breaker.release()
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+        if response.get('kind') == 'unknown_wallet':
+            if error is not None and not read_only:
+                raise error
+            if reregister and self._encrypted_mnemonic is not None and request['action'] != 'create_wallet':
+                await self._send_request('create_wallet', {'mnemonic': self._encrypted_mnemonic})
+                payload = request['payload']
+                if 'idempotency_key' in payload:
+                    # Сервер запомнил отказ под прежним ключом; транзакция не выполнялась
+                    request = {**request, 'payload': {**payload, 'idempotency_key': uuid.uuid4().hex}}
+                return await self._fetch(cache_key, request, reregister=False)
+        result = self._handle_response(response)
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+
+    def _forget_in_flight(self, key: Tuple[str, Any], task: asyncio.Future) -> None:
+        """Убирает завершённый общий вызов из списка запросов в полёте."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Ошибка уже передана ожидающим; помечаем её полученной, даже если все они отменены
+            task.exception()
+
+    @staticmethod
+    def _handle_response(response: Dict[str, Any]) -> Any:
+        """Извлекает результат из ответа IPC-сервера или выбрасывает исключение по категории ошибки.
+
+        Категория берётся из поля kind ответа и сохраняется в атрибуте kind исключения;
+        серверы без реестра действий её не передают, и тип исключения определяется
+        по тексту ошибки (kind остаётся None).
+
+        Raises:
+            TransactionError, WalletRegistrationError, ValidationError: По категории ошибки.
+            IPCError: Для прочих ошибок сервера и ответа неверного формата.
+        """
         try:
-            writer.write(json.dumps(request).encode())
-            await writer.drain()
-
-            data = await reader.read(4096)
-            writer.close()
-            await writer.wait_closed()
-
-            response = json.loads(data.decode())
             if not response.get('success'):
                 error_msg = response.get('error', 'Неизвестная ошибка')
+                kind = response.get('kind')
+                if kind is not None:
+                    error_type, prefix = _ERROR_KINDS.get(kind, (IPCError, "Ошибка IPC"))
+                    raise error_type(f"{prefix}: {error_msg}", kind=kind)
                 if 'transaction' in error_msg.lower():
                     raise TransactionError(f"Ошибка транзакции: {error_msg}")
                 elif 'wallet' in error_msg.lower():
@@ -47,19 +268,84 @@ class DecimalSDK:
                     raise ValidationError(f"Ошибка валидации: {error_msg}")
                 raise IPCError(f"Ошибка IPC: {error_msg}")
             return response.get('result', {})
+        except (DecimalSDKError, IPCError):
+            raise
         except Exception as e:
             raise IPCError(f"Ошибка при взаимодействии с IPC-сервером: {str(e)}")
 
-    async def create_wallet(self, mnemonic: str) -> Dict[str, Any]:
-        """Создает кошелек с зашифрованной мнемоникой."""
+    def batch(self) -> Batch:
+        """Создает пакет запросов только для чтения, отправляемых за один обмен с IPC-сервером.
+
+        Пример:
+            async with sdk.batch() as batch:
+                balance = batch.get_balance(address)
+                tokens = batch.balance_of_token(token_address, address)
+            print(balance.result(), tokens.result())
+        """
+        return Batch(self)
+
+    def quote_engine(self, ttl: Optional[float] = None) -> QuoteEngine:
+        """Создает движок локальных котировок calculate_buy_*/calculate_sell_* по кривой токена.
+
+        Пример:
+            quotes = sdk.quote_engine(ttl=5)
+            curve = await quotes.curve(token_address)
+            outputs = [curve.buy_output(amount_wei) for amount_wei in candidates]
+        """
+        return QuoteEngine(self, ttl)
+
+    async def bulk_fetch(self, action: str, params: Optional[Dict[str, Any]] = None,
+                         page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = 8) -> AsyncIterator[Dict[str, Any]]:
+        """Выгружает весь список Subgraph параллельными запросами страниц.
+
+        Записи отдаются в исходном порядке; одновременно выполняется не больше
+        concurrency запросов. Поддерживаются действия из actions.PAGED_ACTIONS.
+
+        Пример:
+            async for stake in sdk.bulk_fetch('get_stakes_by_validator', {'validator': address}):
+                print(stake)
+        """
+        if action not in PAGED_ACTIONS:
+            raise ValidationError(f"Действие {action} не поддерживает постраничную выгрузку")
+        params = params or {}
+
+        async def fetch(first: int, skip: int) -> List[Dict[str, Any]]:
+            return await self._send_request(action, {**params, 'first': first, 'skip': skip})
+
+        pages = fetch_pages(fetch, page_size, concurrency)
+        try:
+            async for page in pages:
+                for item in page:
+                    yield item
+        finally:
+            # Отменяем запросы страниц сразу, если перебор прерван
+            await pages.aclose()
+
+    async def fetch_all(self, action: str, params: Optional[Dict[str, Any]] = None,
+                        page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Выгружает весь список Subgraph в память, см. bulk_fetch."""
+        return [item async for item in self.bulk_fetch(action, params, page_size, concurrency)]
+
+    async def create_wallet(self, mnemonic: str, wallet_id: Optional[str] = None) -> Dict[str, Any]:
+        """Создает кошелек с зашифрованной мнемоникой.
+
+        Args:
+            mnemonic (str): Мнемоника; передаётся на сервер зашифрованной.
+            wallet_id (Optional[str]): Идентификатор кошелька на IPC-сервере; по умолчанию
+                текущий wallet_id или новый случайный.
+        """
         try:
             encrypted_mnemonic = self.encryption.encrypt(mnemonic)
+            # Запросы кошелька закрепляются за сервером по wallet_id, поэтому он
+            # передаётся и при регистрации: она попадает на тот же сервер
+            self.wallet_id = wallet_id or self.wallet_id or uuid.uuid4().hex
             result = await self._send_request('create_wallet', {
                 'mnemonic': encrypted_mnemonic
             })
             self.wallet_address = result.get('address')
             if not self.wallet_address or not self.wallet_address.startswith('0x'):
                 raise WalletRegistrationError("Неверный формат адреса кошелька")
+            self._encrypted_mnemonic = encrypted_mnemonic
             return result
         except EncryptionError as e:
             raise EncryptionError(f"Ошибка шифрования мнемоники: {str(e)}")
@@ -70,6 +356,69 @@ class DecimalSDK:
         """Проверяет, зарегистрирован ли кошелек."""
         return await self._send_request('is_wallet_registered', {})
 
+    async def warm_up(self, wallet_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Заранее подключает Subgraph и инициализирует DecimalEVM кошельков на IPC-серверах.
+
+        Запрос получает каждый сервер из socket_path: Subgraph подключается на всех,
+        а кошелёк — на сервере, за которым он закреплён. Прогрев не меняет состояния
+        сети и отправляется без ключа идемпотентности.
+
+        Args:
+            wallet_ids (Optional[List[str]]): Идентификаторы кошельков; по умолчанию все
+                зарегистрированные на серверах.
+
+        Returns:
+            Dict[str, Any]: wallets — результат инициализации по каждому кошельку.
+
+        Raises:
+            IPCConnectionError: Если прогрев не удалось выполнить ни на одном сервере.
+        """
+        if not self.actions.loaded:
+            await self._load_actions()
+        if wallet_ids is None:
+            payloads: Dict[str, Dict[str, Any]] = {path: {} for path in self._pool.socket_paths}
+        else:
+            payloads = {path: {'wallet_ids': []} for path in self._pool.socket_paths}
+            for wallet_id in wallet_ids:
+                payloads[self._pool.owner(wallet_id)]['wallet_ids'].append(wallet_id)
+        responses = await self._pool.request_each(
+            {path: {'action': 'warm_up', 'payload': payload} for path, payload in payloads.items()})
+        wallets: Dict[str, Any] = {}
+        errors = []
+        for path, response in responses.items():
+            if isinstance(response, Exception):
+                errors.append(response)
+                for wallet_id in payloads[path].get('wallet_ids', []):
+                    wallets[wallet_id] = {'success': False, 'error': str(response)}
+                continue
+            wallets.update(self._handle_response(response).get('wallets', {}))
+        if len(errors) == len(responses):
+            raise errors[0]
+        return {'wallets': wallets}
+
+    async def get_nonce_state(self) -> Optional[Dict[str, Any]]:
+        """Возвращает состояние локального распределения nonce кошелька на IPC-сервере.
+
+        Returns:
+            Optional[Dict[str, Any]]: next — следующий nonce, gaps — освобождённые nonce,
+            in_flight — nonce отправляемых транзакций, queued — принятые узлом транзакции,
+            которые могут ждать пропущенный nonce; None, если распределение выключено
+            или кошелёк ещё не отправлял запросов.
+        """
+        return await self._send_request('get_nonce_state', {})
+
+    async def resync_nonce(self, reset: bool = False) -> Dict[str, Any]:
+        """Сверяет nonce кошелька с сетью, например после отправки транзакций в обход SDK.
+
+        Args:
+            reset (bool): Забыть транзакции, ожидающие в очереди узла, и выдать их nonce
+                заново; нужно, если они были вытеснены из мемпула.
+
+        Returns:
+            Dict[str, Any]: Состояние распределения nonce, см. get_nonce_state.
+        """
+        return await self._send_request('resync_nonce', {'reset': reset})
+
     async def send_del(self, to: str, amount: float) -> Tuple[bool, Optional[str]]:
         """Отправляет DEL на указанный адрес."""
         if not to.startswith('0x'):
@@ -1112,3 +1461,91 @@ class DecimalSDK:
         return await self._send_request('get_nft_collections_by_creator', {
             'owner': owner, 'first': first, 'skip': skip
         })
+
+    def iter_token_stakes_by_member(self, account: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                    prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все стейки токенов по адресу."""
+        return paginate(lambda limit, offset: self.get_token_stakes_page_by_member(account, limit, offset),
+                        page_size, prefetch)
+
+    def iter_nft_stakes_by_member(self, account: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                  prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все стейки NFT по адресу."""
+        return paginate(lambda limit, offset: self.get_nft_stakes_page_by_member(account, limit, offset),
+                        page_size, prefetch)
+
+    def iter_validator_penalties(self, validator: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                 prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все штрафы валидатора."""
+        return paginate(lambda limit, offset: self.get_validator_penalties(validator, limit, offset),
+                        page_size, prefetch)
+
+    def iter_validator_penalties_from_block(self, validator: str, block_number: int, page_size: int = DEFAULT_PAGE_SIZE,
+                                            prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все штрафы валидатора с определенного блока."""
+        return paginate(lambda limit, offset: self.get_validator_penalties_from_block(validator, block_number, limit, offset),
+                        page_size, prefetch)
+
+    def iter_tokens(self, page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все токены."""
+        return paginate(lambda limit, offset: self.get_tokens(limit, offset), page_size, prefetch)
+
+    def iter_tokens_by_owner(self, owner: str, page_size: int = DEFAULT_PAGE_SIZE,
+                             prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все токены владельца."""
+        return paginate(lambda limit, offset: self.get_tokens_by_owner(owner, limit, offset), page_size, prefetch)
+
+    def iter_address_balances(self, account: str, page_size: int = DEFAULT_PAGE_SIZE,
+                              prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все балансы адреса."""
+        return paginate(lambda limit, offset: self.get_address_balances(account, limit, offset), page_size, prefetch)
+
+    def iter_stakes(self, page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все стейки."""
+        return paginate(lambda limit, offset: self.get_stakes(limit, offset), page_size, prefetch)
+
+    def iter_stakes_by_address(self, delegator: str, page_size: int = DEFAULT_PAGE_SIZE,
+                               prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все стейки делегатора."""
+        return paginate(lambda limit, offset: self.get_stakes_by_address(delegator, limit, offset), page_size, prefetch)
+
+    def iter_stakes_by_validator(self, validator: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                 prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все стейки валидатора."""
+        return paginate(lambda limit, offset: self.get_stakes_by_validator(validator, limit, offset),
+                        page_size, prefetch)
+
+    def iter_transfer_stakes(self, page_size: int = DEFAULT_PAGE_SIZE,
+                             prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все переводы стейков."""
+        return paginate(lambda limit, offset: self.get_transfer_stakes(limit, offset), page_size, prefetch)
+
+    def iter_transfer_stakes_by_address(self, delegator: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                        prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все переводы стейков делегатора."""
+        return paginate(lambda limit, offset: self.get_transfer_stakes_by_address(delegator, limit, offset),
+                        page_size, prefetch)
+
+    def iter_withdraw_stakes(self, page_size: int = DEFAULT_PAGE_SIZE,
+                             prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все выводы стейков."""
+        return paginate(lambda limit, offset: self.get_withdraw_stakes(limit, offset), page_size, prefetch)
+
+    def iter_withdraw_stakes_by_address(self, delegator: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                        prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все выводы стейков делегатора."""
+        return paginate(lambda limit, offset: self.get_withdraw_stakes_by_address(delegator, limit, offset),
+                        page_size, prefetch)
+
+    def iter_nft_collections(self, page_size: int = DEFAULT_PAGE_SIZE,
+                             prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все коллекции NFT."""
+        return paginate(lambda limit, offset: self.get_nft_collections(limit, offset), page_size, prefetch)
+
+    def iter_nft_collections_by_creator(self, owner: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                        prefetch: int = 1) -> AsyncIterator[Dict[str, Any]]:
+        """Перебирает все коллекции NFT создателя."""
+        return paginate(lambda limit, offset: self.get_nft_collections_by_creator(owner, limit, offset),
+                        page_size, prefetch)
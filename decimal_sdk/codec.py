@@ -0,0 +1,204 @@
+import json
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Callable, Dict, Optional
+
+ObjectHook = Optional[Callable[[Dict[str, Any]], Any]]
+BigIntHook = Optional[Callable[[int], Any]]
+
+# Тип расширения MessagePack для целых чисел произвольной длины (BigNumber, wei):
+# 1 байт знака (0 — положительное, 1 — отрицательное) и модуль в big-endian.
+BIG_INT_EXT_TYPE = 1
+_INT64_MIN = -(1 << 63)
+_UINT64_MAX = (1 << 64) - 1
+
+_OPTIONAL_MODULES = ('orjson', 'msgspec', 'msgpack')
+
+
+@lru_cache(maxsize=None)
+def _optional(name: str) -> Any:
+    """Импортирует необязательную библиотеку кодека при первом обращении.
+
+    Returns:
+        Any: Модуль или None, если библиотека не установлена.
+    """
+    try:
+        return import_module(name)
+    except ImportError:
+        return None
+
+
+def __getattr__(name: str) -> Any:
+    # codec.orjson, codec.msgspec и codec.msgpack загружаются только при обращении
+    if name in _OPTIONAL_MODULES:
+        return _optional(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class JSONCodec:
+    """Кодек на стандартном модуле json."""
+
+    name = 'json'
+    # Бинарные кодеки требуют согласования с сервером при подключении
+    binary = False
+
+    def encode(self, obj: Any) -> bytes:
+        """Сериализует сообщение в байты.
+
+        Args:
+            obj (Any): Сообщение.
+
+        Returns:
+            bytes: Тело кадра.
+        """
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def decode(self, data: bytes, object_hook: ObjectHook = None) -> Any:
+        """Декодирует тело кадра без промежуточной строки.
+
+        Args:
+            data (bytes): Тело кадра.
+            object_hook (ObjectHook): Преобразование каждого JSON-объекта.
+
+        Returns:
+            Any: Декодированное сообщение.
+        """
+        return json.loads(data, object_hook=object_hook)
+
+
+class OrjsonCodec(JSONCodec):
+    """Кодек на orjson: работает напрямую с bytes."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        self._orjson = _optional('orjson')
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj)
+        except TypeError:
+            # orjson не сериализует целые числа больше 64 бит
+            return super().encode(obj)
+
+    def decode(self, data: bytes, object_hook: ObjectHook = None) -> Any:
+        if object_hook is not None:
+            # orjson не поддерживает object_hook, а отдельный обход в Python медленнее,
+            # чем вызов хука из C-парсера стандартного json
+            return super().decode(data, object_hook)
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """Кодек на msgspec.json с переиспользуемыми кодировщиком и декодировщиком."""
+
+    name = 'msgspec'
+
+    def __init__(self):
+        msgspec = _optional('msgspec')
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def decode(self, data: bytes, object_hook: ObjectHook = None) -> Any:
+        if object_hook is not None:
+            return super().decode(data, object_hook)
+        return self._decoder.decode(data)
+
+
+def pack_big_int(value: int) -> Any:
+    """Упаковывает целое число в расширение BIG_INT_EXT_TYPE.
+
+    Args:
+        value (int): Целое число произвольной длины.
+
+    Returns:
+        msgpack.ExtType: Значение расширения MessagePack.
+    """
+    magnitude = abs(value)
+    sign = b'\x01' if value < 0 else b'\x00'
+    return _optional('msgpack').ExtType(BIG_INT_EXT_TYPE, sign + magnitude.to_bytes((magnitude.bit_length() + 7) // 8, 'big'))
+
+
+class MsgpackCodec(JSONCodec):
+    """Бинарный кодек MessagePack.
+
+    BigNumber передаются сервером как целые числа произвольной длины
+    (расширение BIG_INT_EXT_TYPE) и приходят в Python как int в wei.
+    """
+
+    name = 'msgpack'
+    binary = True
+
+    def __init__(self, big_int_hook: BigIntHook = None):
+        """Инициализация кодека.
+
+        Args:
+            big_int_hook (BigIntHook): Преобразование целых чисел из расширения BigNumber.
+        """
+        self.big_int_hook = big_int_hook
+        self._msgpack = _optional('msgpack')
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code != BIG_INT_EXT_TYPE:
+            return self._msgpack.ExtType(code, data)
+        value = int.from_bytes(data[1:], 'big')
+        if data[0]:
+            value = -value
+        return self.big_int_hook(value) if self.big_int_hook else value
+
+    @classmethod
+    def _wrap_big_ints(cls, obj: Any) -> Any:
+        """Заменяет целые числа вне диапазона 64 бит расширением BIG_INT_EXT_TYPE."""
+        if isinstance(obj, dict):
+            return {key: cls._wrap_big_ints(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [cls._wrap_big_ints(item) for item in obj]
+        if isinstance(obj, int) and not isinstance(obj, bool) and not _INT64_MIN <= obj <= _UINT64_MAX:
+            return pack_big_int(obj)
+        return obj
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return self._msgpack.packb(obj, use_bin_type=True)
+        except OverflowError:
+            # Длинные целые в запросах редки, поэтому обходим сообщение только при переполнении
+            return self._msgpack.packb(self._wrap_big_ints(obj), use_bin_type=True)
+
+    def decode(self, data: bytes, object_hook: ObjectHook = None) -> Any:
+        return self._msgpack.unpackb(data, raw=False, strict_map_key=False,
+                               ext_hook=self._ext_hook, object_hook=object_hook)
+
+
+def get_codec(name: str = 'auto', big_int_hook: BigIntHook = None) -> JSONCodec:
+    """Возвращает кодек по имени.
+
+    Args:
+        name (str): 'orjson', 'msgspec', 'json', 'msgpack' или 'auto' — самый быстрый
+            из установленных JSON-кодеков. MessagePack не выбирается автоматически,
+            так как меняет представление BigNumber в результатах.
+        big_int_hook (BigIntHook): Преобразование BigNumber для бинарного кодека.
+
+    Returns:
+        JSONCodec: Экземпляр кодека.
+
+    Raises:
+        ValueError: Если кодек неизвестен или его библиотека не установлена.
+    """
+    if name == 'auto':
+        if _optional('orjson') is not None:
+            return OrjsonCodec()
+        if _optional('msgspec') is not None:
+            return MsgspecCodec()
+        return JSONCodec()
+    if name == 'orjson' and _optional('orjson') is not None:
+        return OrjsonCodec()
+    if name == 'msgspec' and _optional('msgspec') is not None:
+        return MsgspecCodec()
+    if name == 'json':
+        return JSONCodec()
+    if name == 'msgpack' and _optional('msgpack') is not None:
+        return MsgpackCodec(big_int_hook)
+    raise ValueError(f"Кодек {name} неизвестен или не установлен")
@@ -1,7 +1,7 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 class Config:
@@ -13,11 +13,36 @@ class Config:
         Args:
             env_path (str): Путь к .env файлу. По умолчанию '.env'.
         """
+        from dotenv import load_dotenv
+
         load_dotenv(dotenv_path=Path(env_path))
         self.encryption_key: Optional[str] = os.getenv("ENCRYPTION_KEY")
-        self.socket_path: str = os.getenv("SOCKET_PATH", "/tmp/decimal_ipc.sock")
+        self.fernet_key: Optional[str] = os.getenv("ENCRYPTION_FERNET_KEY")
+        self.encryption_key_file: Optional[str] = os.getenv("ENCRYPTION_KEY_FILE")
+        # Несколько IPC-серверов указываются через запятую
+        self.socket_paths: List[str] = [path.strip() for path in
+                                        os.getenv("SOCKET_PATH", "/tmp/decimal_ipc.sock").split(",") if path.strip()]
+        self.socket_path: str = self.socket_paths[0]
+        self.pool_size: int = int(os.getenv("IPC_POOL_SIZE", "10"))
+        self.pool_idle_timeout: float = float(os.getenv("IPC_POOL_IDLE_TIMEOUT", "60"))
+        self.pool_health_check: float = float(os.getenv("IPC_POOL_HEALTH_CHECK", "30"))
+        self.max_message_size: int = int(os.getenv("IPC_MAX_MESSAGE_SIZE", str(64 * 1024 * 1024)))
+        self.codec: str = os.getenv("IPC_CODEC", "auto")
+        self.cache_size: int = int(os.getenv("IPC_CACHE_SIZE", "1024"))
+        # Лимиты одновременных запросов по классам действий; 0 — без ограничения
+        self.max_writes: int = int(os.getenv("IPC_MAX_WRITES", "16"))
+        self.max_rpc_reads: int = int(os.getenv("IPC_MAX_RPC_READS", "64"))
+        self.max_subgraph_reads: int = int(os.getenv("IPC_MAX_SUBGRAPH_READS", "32"))
+        queue_size = os.getenv("IPC_QUEUE_SIZE")
+        self.queue_size: Optional[int] = int(queue_size) if queue_size else None
+        # Повторы после сбоев соединения и узла; автомат защиты открывается после серии сбоев подряд
+        self.retries: int = int(os.getenv("IPC_RETRIES", "2"))
+        self.retry_base_delay: float = float(os.getenv("IPC_RETRY_BASE_DELAY", "0.05"))
+        self.retry_max_delay: float = float(os.getenv("IPC_RETRY_MAX_DELAY", "1.0"))
+        self.breaker_threshold: int = int(os.getenv("IPC_BREAKER_THRESHOLD", "5"))
+        self.breaker_reset: float = float(os.getenv("IPC_BREAKER_RESET", "1.0"))
 
-        if not self.encryption_key:
+        if not (self.encryption_key or self.fernet_key or self.encryption_key_file):
             raise ValueError("ENCRYPTION_KEY не указан в .env файле")
 
     def get_socket_path(self) -> str:
@@ -35,3 +60,18 @@ class Config:
             str: Ключ шифрования.
         """
         return self.encryption_key
+
+
+@lru_cache(maxsize=None)
+def get_config(env_path: str = ".env") -> Config:
+    """Общая для процесса конфигурация: .env читается и разбирается один раз.
+
+    После изменения окружения или .env вызовите get_config.cache_clear().
+
+    Args:
+        env_path (str): Путь к .env файлу. По умолчанию '.env'.
+
+    Returns:
+        Config: Конфигурация.
+    """
+    return Config(env_path)
@@ -2,20 +2,53 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 from base64 import b64encode, b64decode
+from functools import lru_cache
 from typing import Optional
 import os
 
 
+@lru_cache(maxsize=16)
+def _derive_key_cached(password: str) -> bytes:
+    """PBKDF2 выполняется не больше одного раза на пароль за время жизни процесса."""
+    salt = b'decimal_sdk_salt'
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    key = b64encode(kdf.derive(password.encode()))
+    return key
+
+
 class Encryption:
     """Класс для шифрования и дешифрования seed-фразы."""
 
-    def __init__(self, key: str):
+    def __init__(self, key: Optional[str] = None, fernet_key: Optional[str] = None,
+                 key_file: Optional[str] = None):
         """Инициализация шифрования с использованием ключа.
 
+        Производный ключ кэшируется на уровне процесса, поэтому повторное создание
+        Encryption с тем же паролем не повторяет PBKDF2. Готовый ключ Fernet
+        (fernet_key или key_file) позволяет не выполнять PBKDF2 вовсе.
+
         Args:
-            key (str): Ключ шифрования из .env.
+            key (Optional[str]): Ключ шифрования из .env, из которого производится ключ Fernet.
+            fernet_key (Optional[str]): Уже произведённый ключ Fernet (см. derive_fernet_key).
+            key_file (Optional[str]): Путь к файлу с произведённым ключом Fernet.
+
+        Raises:
+            ValueError: Если не передан ни один из ключей.
         """
-        self.fernet = Fernet(self._derive_key(key))
+        if fernet_key is None and key_file is not None:
+            with open(key_file, 'r') as f:
+                fernet_key = f.read().strip()
+        if fernet_key is not None:
+            self.fernet = Fernet(fernet_key.encode())
+        elif key is not None:
+            self.fernet = Fernet(self._derive_key(key))
+        else:
+            raise ValueError("Не указан ключ шифрования")
 
     @staticmethod
     def _derive_key(password: str) -> bytes:
@@ -27,15 +60,19 @@ class Encryption:
         Returns:
             bytes: Сгенерированный ключ для Fernet.
         """
-        salt = b'decimal_sdk_salt'
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = b64encode(kdf.derive(password.encode()))
-        return key
+        return _derive_key_cached(password)
+
+    @staticmethod
+    def derive_fernet_key(password: str) -> str:
+        """Производит ключ Fernet из пароля для сохранения в ENCRYPTION_FERNET_KEY или файл ключа.
+
+        Args:
+            password (str): Ключ шифрования из .env.
+
+        Returns:
+            str: Ключ Fernet.
+        """
+        return _derive_key_cached(password).decode()
 
     def encrypt(self, data: str) -> str:
         """Шифрует строку (например, seed-фразу).
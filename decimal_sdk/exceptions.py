@@ -1,6 +1,15 @@
+from typing import Optional
+
+
 class DecimalSDKError(Exception):
-    """Базовое исключение для Decimal SDK."""
-    pass
+    """Базовое исключение для Decimal SDK.
+
+    kind — категория ошибки из ответа IPC-сервера (None, если ошибка возникла в клиенте
+    или сервер категорию не передал).
+    """
+    def __init__(self, *args, kind: Optional[str] = None):
+        self.kind = kind
+        super().__init__(*args)
 
 class IPCConnectionError(DecimalSDKError):
     """Исключение для ошибок подключения к IPC-серверу."""
@@ -18,10 +27,26 @@ class ValidationError(DecimalSDKError):
     """Исключение для ошибок валидации данных."""
     pass
 
+class OverloadError(DecimalSDKError):
+    """Исключение для запросов, отклонённых из-за переполнения очереди SDK."""
+    pass
+
+class RequestNotSentError(IPCConnectionError):
+    """Исключение для запросов, не отправленных на IPC-сервер (например, сервер недоступен)."""
+    pass
+
+class CircuitOpenError(RequestNotSentError):
+    """Исключение для запросов, не отправленных из-за открытого автомата защиты."""
+    pass
+
 class IPCError(Exception):
-    """Исключение для ошибок, связанных с взаимодействием с IPC-сервером."""
-    def __init__(self, message: str):
+    """Исключение для ошибок, связанных с взаимодействием с IPC-сервером.
+
+    kind — категория ошибки из ответа IPC-сервера, например upstream или unavailable.
+    """
+    def __init__(self, message: str, kind: Optional[str] = None):
         self.message = message
+        self.kind = kind
         super().__init__(self.message)
 
 
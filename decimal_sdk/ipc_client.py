@@ -1,38 +1,68 @@
-import asyncio
-import json
 import os
-from typing import Dict, Any, Optional
-import socket
-from .exceptions import IPCConnectionError
+from typing import Dict, Any, Sequence, Union
+from .exceptions import IPCConnectionError, RequestNotSentError
+from .codec import get_codec
+from .pool import BalancedPool, ConnectionPool
+from .protocol import DEFAULT_MAX_MESSAGE_SIZE
 
 
 class IPCClient:
     """Клиент для взаимодействия с IPC-сервером Decimal."""
 
-    def __init__(self, socket_path: str):
+    def __init__(self, socket_path: Union[str, Sequence[str]], pool_size: int = 10, idle_timeout: float = 60.0,
+                 max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE, codec: str = 'auto'):
         """Инициализация IPC-клиента.
 
         Args:
-            socket_path (str): Путь к Unix-сокету.
+            socket_path (Union[str, Sequence[str]]): Путь к Unix-сокету или список сокетов
+                нескольких IPC-серверов, между которыми распределяются запросы.
+            pool_size (int): Максимальное число одновременно открытых соединений.
+            idle_timeout (float): Время простоя соединения в пуле в секундах.
+            max_message_size (int): Максимальный размер одного сообщения в байтах.
+            codec (str): Кодек сообщений: 'orjson', 'msgspec', 'json', 'msgpack' или 'auto'.
         """
-        self.socket_path = socket_path
+        self.socket_paths = [socket_path] if isinstance(socket_path, str) else list(socket_path)
+        self.socket_path = self.socket_paths[0]
+        self.codec = get_codec(codec, big_int_hook=self._wei_to_del)
+        pool_options = dict(max_size=pool_size, idle_timeout=idle_timeout, max_message_size=max_message_size,
+                            object_hook=self._convert_big_number, codec=self.codec)
+        if len(self.socket_paths) > 1:
+            self.pool = BalancedPool(self.socket_paths, **pool_options)
+        else:
+            self.pool = ConnectionPool(self.socket_path, **pool_options)
 
-    async def _convert_big_number(self, data: Any) -> Any:
-        """Рекурсивно конвертирует BigNumber в float (DEL).
+    async def close(self) -> None:
+        """Закрывает соединения с IPC-сервером."""
+        await self.pool.close()
+
+    @staticmethod
+    def _wei_to_del(value: int) -> float:
+        """Конвертирует сумму в wei в DEL.
 
         Args:
-            data: Данные для конвертации (словарь, список или примитив).
+            value (int): Сумма в wei.
 
         Returns:
-            Any: Конвертированные данные.
+            float: Сумма в DEL, округлённая до 6 знаков.
         """
-        if isinstance(data, dict):
-            if data.get("type") == "BigNumber" and "hex" in data:
-                raw_value = int(data["hex"], 16)
-                return round(raw_value / (10 ** 18), 6)
-            return {key: await self._convert_big_number(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [await self._convert_big_number(item) for item in data]
+        return round(value / (10 ** 18), 6)
+
+    @staticmethod
+    def _convert_big_number(data: Dict[str, Any]) -> Any:
+        """Конвертирует BigNumber в float (DEL).
+
+        Используется как object_hook при декодировании ответа: json вызывает его
+        для каждого объекта снизу вверх, поэтому вложенные BigNumber обрабатываются
+        за один проход без рекурсии и промежуточных копий.
+
+        Args:
+            data (Dict[str, Any]): Декодированный JSON-объект.
+
+        Returns:
+            Any: Значение в DEL для BigNumber, иначе исходный объект.
+        """
+        if data.get("type") == "BigNumber" and "hex" in data:
+            return IPCClient._wei_to_del(int(data["hex"], 16))
         return data
 
     async def send_request(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -48,27 +78,12 @@ class IPCClient:
         Raises:
             IPCConnectionError: Если не удалось подключиться к сокету.
         """
-        if not os.path.exists(self.socket_path):
-            raise IPCConnectionError(f"Сокет {self.socket_path} не найден. Сервер запущен?")
-
-        try:
-            reader, writer = await asyncio.open_unix_connection(self.socket_path)
-        except Exception as e:
-            raise IPCConnectionError(f"Не удалось подключиться к сокету: {e}")
+        if not any(os.path.exists(path) for path in self.socket_paths):
+            raise RequestNotSentError(f"Сокет {', '.join(self.socket_paths)} не найден. Сервер запущен?")
 
         try:
-            request = {"action": action, "payload": payload}
-            writer.write(json.dumps(request).encode())
-            await writer.drain()
-
-            response = await reader.read(65536)
-            writer.close()
-            await writer.wait_closed()
-
-            try:
-                result = json.loads(response.decode())
-                return await self._convert_big_number(result)
-            except json.JSONDecodeError:
-                return {"error": "Неверный формат JSON", "raw": response.decode()}
+            return await self.pool.request({"action": action, "payload": payload})
+        except IPCConnectionError:
+            raise
         except Exception as e:
             raise IPCConnectionError(f"Ошибка при выполнении запроса: {e}")
\ No newline at end of file
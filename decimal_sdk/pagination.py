@@ -0,0 +1,111 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List
+
+# Subgraph возвращает не больше 1000 записей за запрос
+DEFAULT_PAGE_SIZE = 1000
+
+PageFetcher = Callable[[int, int], Awaitable[List[Any]]]
+
+
+def _cancel_pending(pending: Deque[asyncio.Future]) -> None:
+    """Отменяет запросы страниц, которые больше не нужны."""
+    for task in pending:
+        if task.done() and not task.cancelled():
+            # Ошибка страницы за концом данных не должна попадать в лог как необработанная
+            task.exception()
+        task.cancel()
+
+
+async def paginate(fetch: PageFetcher, page_size: int = DEFAULT_PAGE_SIZE, prefetch: int = 1,
+                   start: int = 0) -> AsyncIterator[Any]:
+    """Перебирает записи постранично, заранее запрашивая следующие страницы.
+
+    Пока вызывающий код обрабатывает текущую страницу, в полёте находятся ещё
+    prefetch страниц, поэтому в памяти одновременно не больше prefetch + 1 страниц.
+    Перебор заканчивается на первой неполной странице.
+
+    Args:
+        fetch (PageFetcher): Корутина fetch(limit, offset), возвращающая страницу.
+        page_size (int): Размер страницы.
+        prefetch (int): Число страниц, запрашиваемых заранее; 0 — без упреждения.
+        start (int): Смещение первой записи.
+
+    Yields:
+        Any: Записи в порядке страниц.
+    """
+    if page_size < 1:
+        raise ValueError("Размер страницы должен быть положительным")
+    if prefetch < 0:
+        raise ValueError("Число страниц упреждения не может быть отрицательным")
+
+    offset = start
+    pending: Deque[asyncio.Future] = deque()
+
+    def schedule() -> None:
+        nonlocal offset
+        pending.append(asyncio.ensure_future(fetch(page_size, offset)))
+        offset += page_size
+
+    try:
+        schedule()
+        while pending:
+            page = await pending.popleft()
+            full = len(page) >= page_size
+            if full:
+                while len(pending) < prefetch:
+                    schedule()
+            for item in page:
+                yield item
+            if not full:
+                break
+            if not pending:
+                schedule()
+    finally:
+        # Перебор прерван или закончился раньше упреждённых страниц
+        _cancel_pending(pending)
+
+
+async def fetch_pages(fetch: PageFetcher, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = 8,
+                      start: int = 0) -> AsyncIterator[List[Any]]:
+    """Загружает диапазон записей параллельно и отдаёт страницы по порядку.
+
+    Диапазон смещений делится на страницы; одновременно запрашивается не больше
+    concurrency страниц, и каждая завершённая страница сразу заменяется следующей.
+    Конец данных — первая неполная страница, запросы за ней отменяются.
+
+    Args:
+        fetch (PageFetcher): Корутина fetch(limit, offset), возвращающая страницу.
+        page_size (int): Размер страницы.
+        concurrency (int): Максимальное число одновременных запросов.
+        start (int): Смещение первой записи.
+
+    Yields:
+        List[Any]: Непустые страницы в порядке смещений.
+    """
+    if page_size < 1:
+        raise ValueError("Размер страницы должен быть положительным")
+    if concurrency < 1:
+        raise ValueError("Число одновременных запросов должно быть положительным")
+
+    offset = start
+    window: Deque[asyncio.Future] = deque()
+
+    def schedule() -> None:
+        nonlocal offset
+        window.append(asyncio.ensure_future(fetch(page_size, offset)))
+        offset += page_size
+
+    try:
+        for _ in range(concurrency):
+            schedule()
+        while window:
+            page = await window.popleft()
+            if len(page) < page_size:
+                if page:
+                    yield page
+                break
+            schedule()
+            yield page
+    finally:
+        _cancel_pending(window)
@@ -0,0 +1,270 @@
+import asyncio
+import csv
+import hashlib
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .exceptions import IPCConnectionError, OverloadError, RequestNotSentError, TransactionError, ValidationError, \
+    WalletRegistrationError
+from .quotes import units_to_wei
+
+# Каждый получатель увеличивает газ вызова multi_send_token; при 100 получателях
+# вызов остаётся заметно ниже лимита газа блока
+DEFAULT_CHUNK_SIZE = 100
+
+# Обозначения нативной монеты в колонке token
+NATIVE_TOKENS = ('', 'del')
+
+PayoutRow = Union[Tuple[str, Optional[str], Any], Dict[str, Any]]
+
+
+def read_payout_csv(path: str, delimiter: str = ',') -> Iterator[Tuple[str, Optional[str], str]]:
+    """Построчно читает выплаты из CSV с колонками recipient, token, amount.
+
+    Строка заголовка (с нечисловой суммой) и пустые строки пропускаются;
+    пустой token или DEL — выплата в DEL.
+
+    Args:
+        path (str): Путь к CSV-файлу.
+        delimiter (str): Разделитель колонок.
+
+    Yields:
+        Tuple[str, Optional[str], str]: Получатель, адрес токена и сумма в DEL/токенах.
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        for index, record in enumerate(csv.reader(file, delimiter=delimiter)):
+            if not record or not any(field.strip() for field in record):
+                continue
+            if len(record) < 3:
+                raise ValidationError(f"Строка {index + 1}: ожидаются колонки recipient, token, amount")
+            recipient, token, amount = (field.strip() for field in record[:3])
+            if index == 0 and not amount.replace('.', '', 1).isdigit():
+                continue
+            yield recipient, token or None, amount
+
+
+class PayoutEngine:
+    """Потоковые массовые выплаты через multi_send_token с журналом на диске.
+
+    Строки выплат читаются из итератора по мере отправки и группируются в
+    пакеты одного токена по chunk_size получателей; одновременно отправляется
+    не больше concurrency пакетов (nonce распределяет IPC-сервер). В память
+    попадает не больше одного неполного пакета на токен и concurrency пакетов
+    в полёте.
+
+    Журнал — файл JSON Lines: перед отправкой пакета в него записываются номера
+    его строк и их хэш, после ответа — результат. При повторном запуске с тем же
+    входом завершённые пакеты не отправляются. Обрыв соединения SDK сначала
+    повторяет с тем же ключом идемпотентности, если его поддерживает IPC-сервер.
+    Повторяются только пакеты, которые не были отправлены или отклонены до
+    отправки транзакции (ошибки валидации и кошелька, ошибка транзакции с kind
+    'transaction'). Пакеты, отправка которых была прервана или закончилась
+    ошибкой соединения, ошибкой узла (kind 'upstream'), перезапуском обработчика
+    IPC-сервера (kind 'unavailable') или другой ошибкой, могли быть исполнены,
+    поэтому по умолчанию не повторяются и сообщаются со статусом 'unknown';
+    после такого результата новые пакеты не отправляются.
+
+    Пример:
+        engine = PayoutEngine(sdk, 'payouts.journal')
+        async for result in engine.run(read_payout_csv('payouts.csv')):
+            if result['status'] != 'sent':
+                print(result)
+    """
+
+    def __init__(self, sdk: Any, checkpoint_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 concurrency: int = 4, memo: Optional[str] = None, retry_unknown: bool = False):
+        """Инициализация движка.
+
+        Args:
+            sdk (DecimalSDK): SDK кошелька, с которого выплачиваются средства.
+            checkpoint_path (str): Путь к журналу выплат.
+            chunk_size (int): Максимальное число получателей в одном вызове multi_send_token.
+            concurrency (int): Максимальное число одновременно отправляемых пакетов.
+            memo (Optional[str]): Memo для всех вызовов multi_send_token.
+            retry_unknown (bool): Повторять пакеты с неизвестным результатом; включайте
+                только после проверки в сети, что они не были исполнены.
+        """
+        if chunk_size < 1:
+            raise ValueError("Размер пакета должен быть положительным")
+        if concurrency < 1:
+            raise ValueError("Число одновременных пакетов должно быть положительным")
+        self.sdk = sdk
+        self.checkpoint_path = checkpoint_path
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.memo = memo
+        self.retry_unknown = retry_unknown
+
+    def _load_journal(self) -> Dict[int, Dict[str, Any]]:
+        """Читает журнал: последнее состояние каждого пакета."""
+        chunks: Dict[int, Dict[str, Any]] = {}
+        if not os.path.exists(self.checkpoint_path):
+            return chunks
+        with open(self.checkpoint_path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Запись, оборванная при аварийном завершении
+                    continue
+                chunk = chunks.setdefault(entry['chunk'], {})
+                chunk.update(entry)
+        return chunks
+
+    def _write(self, file: Any, entry: Dict[str, Any]) -> None:
+        # Запись о пакете должна оказаться на диске до его отправки
+        file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        file.flush()
+        os.fsync(file.fileno())
+
+    @staticmethod
+    def _parse(row: PayoutRow) -> Tuple[str, Optional[str], Any]:
+        if isinstance(row, dict):
+            recipient = row.get('recipient', row.get('to'))
+            return recipient, row.get('token'), row.get('amount')
+        recipient, token, amount = row
+        return recipient, token, amount
+
+    @staticmethod
+    def _digest(items: List[Dict[str, Any]]) -> str:
+        return hashlib.sha256(json.dumps(items, sort_keys=True).encode()).hexdigest()
+
+    def _chunks(self, rows: Iterable[PayoutRow], invalid: List[Dict[str, Any]]
+                ) -> Iterator[Tuple[List[int], List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """Группирует строки в пакеты одного токена; некорректные строки складывает в invalid."""
+        buffers: Dict[Optional[str], Tuple[List[int], List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+        for index, row in enumerate(rows):
+            try:
+                recipient, token, amount = self._parse(row)
+                if not isinstance(recipient, str) or not recipient.startswith('0x'):
+                    raise ValidationError("Адрес получателя должен быть в формате 0x...")
+                if token is not None and str(token).lower() in NATIVE_TOKENS:
+                    token = None
+                if token is not None and not str(token).startswith('0x'):
+                    raise ValidationError("Адрес токена должен быть в формате 0x...")
+                amount_wei = units_to_wei(amount)
+                if amount_wei <= 0:
+                    raise ValidationError("Сумма выплаты должна быть положительной")
+            except (ValidationError, ValueError, TypeError, ArithmeticError) as e:
+                invalid.append({'row': index, 'recipient': None, 'token': None, 'amount': None,
+                                'status': 'invalid', 'tx_hash': None, 'error': str(e)})
+                continue
+            item = {'to': recipient, 'amount': str(amount_wei)}
+            if token is not None:
+                item['token'] = token
+            indexes, items, described = buffers.setdefault(token, ([], [], []))
+            indexes.append(index)
+            items.append(item)
+            described.append({'row': index, 'recipient': recipient, 'token': token, 'amount': amount})
+            if len(items) >= self.chunk_size:
+                yield buffers.pop(token)
+        yield from buffers.values()
+
+    async def _send(self, items: List[Dict[str, Any]]) -> Tuple[str, Optional[str], Optional[str]]:
+        """Отправляет пакет и возвращает статус, хэш транзакции и ошибку."""
+        try:
+            result = await self.sdk.multi_send_token(items, self.memo)
+        except (RequestNotSentError, OverloadError) as e:
+            # Запрос не был отправлен
+            return 'failed', None, str(e)
+        except (ValidationError, WalletRegistrationError) as e:
+            # Запрос отклонён до отправки транзакции
+            return 'failed', None, str(e)
+        except TransactionError as e:
+            # Транзакция отклонена узлом или отменена при исполнении; без категории
+            # (старый IPC-сервер) нельзя понять, что она не попала в сеть
+            return ('failed' if e.kind == 'transaction' else 'unknown'), None, str(e)
+        except Exception as e:
+            # Обрыв соединения, сбой узла после возможной отправки, перезапуск обработчика
+            return 'unknown', None, str(e)
+        tx_hash = None
+        if isinstance(result, dict):
+            tx_hash = result.get('transactionHash') or result.get('hash')
+        return 'sent', tx_hash, None
+
+    @staticmethod
+    def _results(described: List[Dict[str, Any]], status: str, tx_hash: Optional[str],
+                 error: Optional[str]) -> List[Dict[str, Any]]:
+        return [{**row, 'status': status, 'tx_hash': tx_hash, 'error': error} for row in described]
+
+    async def run(self, rows: Iterable[PayoutRow]) -> AsyncIterator[Dict[str, Any]]:
+        """Выполняет выплаты и отдаёт результат по каждой строке по мере завершения пакетов.
+
+        Args:
+            rows (Iterable[PayoutRow]): Кортежи (recipient, token, amount) или словари
+                с этими ключами; token None, '' или 'DEL' — выплата в DEL, amount — сумма
+                в DEL/токенах. Повторный запуск должен получать те же строки в том же порядке.
+
+        Yields:
+            Dict[str, Any]: row — номер строки, recipient, token, amount, tx_hash, error и
+            status: 'sent', 'skipped' (выплачено при предыдущем запуске), 'failed',
+            'unknown' (результат неизвестен, пакет не повторяется) или 'invalid'.
+
+        Raises:
+            ValidationError: Если строки не совпадают с записанными в журнале.
+            IPCConnectionError: Если результат пакета неизвестен (соединение прервалось,
+                сбой узла или обработчика IPC-сервера); результаты отправленных пакетов
+                к этому моменту уже отданы, остальные строки обработает повторный запуск.
+        """
+        journal = self._load_journal()
+        invalid: List[Dict[str, Any]] = []
+        pending: Set[asyncio.Task] = set()
+        # Результат пакета неизвестен: следующие пакеты не отправляются, чтобы не множить неизвестные результаты
+        unknown_errors: List[str] = []
+
+        async def submit(chunk: int, described: List[Dict[str, Any]], items: List[Dict[str, Any]],
+                         file: Any) -> List[Dict[str, Any]]:
+            status, tx_hash, error = await self._send(items)
+            self._write(file, {'chunk': chunk, 'state': status, 'tx_hash': tx_hash, 'error': error})
+            if status == 'unknown':
+                unknown_errors.append(error)
+            return self._results(described, status, tx_hash, error)
+
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as file:
+            try:
+                for chunk, (indexes, items, described) in enumerate(self._chunks(rows, invalid)):
+                    while invalid:
+                        yield invalid.pop(0)
+                    digest = self._digest(items)
+                    previous = journal.get(chunk)
+                    if previous is not None:
+                        if previous.get('digest') != digest or previous.get('rows') != indexes:
+                            raise ValidationError(f"Пакет {chunk} не совпадает с журналом "
+                                                  f"{self.checkpoint_path}: входные строки изменились")
+                        state = previous.get('state', 'unknown')
+                        if state == 'sent':
+                            for result in self._results(described, 'skipped', previous.get('tx_hash'), None):
+                                yield result
+                            continue
+                        if state == 'unknown' and not self.retry_unknown:
+                            error = previous.get('error') or "Отправка прервана; проверьте транзакцию в сети"
+                            for result in self._results(described, 'unknown', None, error):
+                                yield result
+                            continue
+
+                    self._write(file, {'chunk': chunk, 'rows': indexes, 'digest': digest, 'state': 'unknown'})
+                    pending.add(asyncio.ensure_future(submit(chunk, described, items, file)))
+                    if len(pending) >= self.concurrency:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            for result in task.result():
+                                yield result
+                    if unknown_errors:
+                        break
+                else:
+                    for result in invalid:
+                        yield result
+
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        for result in task.result():
+                            yield result
+                if unknown_errors:
+                    raise IPCConnectionError(f"Выплаты остановлены: {unknown_errors[0]}. "
+                                             f"Повторный запуск продолжит с журнала {self.checkpoint_path}")
+            finally:
+                # Отправленные пакеты дожидаются ответа, чтобы результат попал в журнал
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,553 @@
+import asyncio
+import itertools
+import socket
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from .codec import JSONCodec, get_codec
+from .exceptions import CircuitOpenError, IPCConnectionError, RequestNotSentError
+from .protocol import DEFAULT_MAX_MESSAGE_SIZE, encode_frame, negotiate_encoding, read_frame
+from .retry import CircuitBreaker
+
+
+class IPCConnection:
+    """Долгоживущее мультиплексированное соединение с IPC-сервером.
+
+    По одному сокету одновременно передаётся много запросов; ответы
+    сопоставляются с запросами по полю id и могут приходить в любом порядке.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+                 object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 codec: Optional[JSONCodec] = None, sock: Optional[socket.socket] = None):
+        """Инициализация соединения и запуск фонового чтения ответов.
+
+        Args:
+            reader (asyncio.StreamReader): Поток чтения сокета.
+            writer (asyncio.StreamWriter): Поток записи сокета.
+            max_message_size (int): Максимальный размер сообщения в байтах.
+            object_hook (Optional[Callable]): Преобразование каждого JSON-объекта при декодировании ответа.
+            codec (Optional[JSONCodec]): Кодек сообщений; по умолчанию стандартный json.
+            sock (Optional[socket.socket]): Сокет соединения; нужен abandon, чтобы закрыть
+                его без цикла событий.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.sock = sock
+        self.max_message_size = max_message_size
+        self.object_hook = object_hook
+        self.codec = codec or JSONCodec()
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._closed = False
+        self._loop = asyncio.get_running_loop()
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def in_flight(self) -> int:
+        """Число запросов, ожидающих ответа."""
+        return len(self._pending)
+
+    def is_healthy(self) -> bool:
+        """Проверяет, что сокет открыт и сервер не закрыл соединение.
+
+        Returns:
+            bool: True, если соединение можно использовать.
+        """
+        return not (self._closed or self.writer.is_closing())
+
+    async def _read_loop(self) -> None:
+        """Читает кадры ответов и передаёт их ожидающим запросам."""
+        error: Exception = IPCConnectionError("IPC-сервер закрыл соединение")
+        try:
+            while True:
+                frame = await read_frame(self.reader, self.max_message_size)
+                message = self.codec.decode(frame, self.object_hook)
+                future = self._pending.pop(message.pop('id', None), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except asyncio.IncompleteReadError:
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = IPCConnectionError(f"Ошибка чтения ответа IPC: {str(e)}")
+        finally:
+            self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Закрывает соединение и завершает все ожидающие запросы ошибкой."""
+        self._closed = True
+        if not self._loop.is_closed():
+            self.writer.close()
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Отправляет запрос и ожидает ответ с тем же id.
+
+        Args:
+            message (Dict[str, Any]): Запрос с полями action и payload.
+
+        Returns:
+            Dict[str, Any]: Ответ сервера.
+
+        Raises:
+            RequestNotSentError: Если соединение уже закрыто или запрос превышает max_message_size.
+            IPCConnectionError: Если соединение разорвано до получения ответа.
+        """
+        if not self.is_healthy():
+            raise RequestNotSentError("Соединение с IPC-сервером закрыто")
+        request_id = next(self._ids)
+        frame = encode_frame(self.codec.encode({'id': request_id, **message}), self.max_message_size)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.last_used = time.monotonic()
+        try:
+            self.writer.write(frame)
+            await self.writer.drain()
+            return await future
+        except (ConnectionError, OSError) as e:
+            raise IPCConnectionError(f"Ошибка отправки запроса IPC: {str(e)}")
+        finally:
+            self._pending.pop(request_id, None)
+            self.last_used = time.monotonic()
+            if future.done() and not future.cancelled():
+                # Соединение могло упасть во время отправки: ошибка уже передана исключением выше
+                future.exception()
+
+    async def ping(self, timeout: float) -> bool:
+        """Проверяет, что сервер отвечает по соединению; не ответившее соединение закрывается.
+
+        Любой ответ, в том числе ошибка сервера без действия ping, означает, что
+        сервер обрабатывает запросы.
+
+        Args:
+            timeout (float): Время ожидания ответа в секундах.
+
+        Returns:
+            bool: True, если сервер ответил.
+        """
+        try:
+            await asyncio.wait_for(self.request({'action': 'ping', 'payload': {}}), timeout)
+            return True
+        except (IPCConnectionError, asyncio.TimeoutError):
+            await self.close()
+            return False
+
+    def abandon(self) -> None:
+        """Закрывает соединение из цикла событий, который пул больше не использует.
+
+        Работающий (в другом потоке) цикл закрывает соединение сам. У остановленного
+        или закрытого цикла колбэки закрытия уже не выполнятся, поэтому сокет
+        закрывается сразу, а ожидающие ответа запросы этого цикла отбрасываются.
+        """
+        if self._loop.is_running() and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._fail_pending, IPCConnectionError("Соединение с IPC-сервером закрыто"))
+            return
+        self._closed = True
+        self._pending = {}
+        if not self._loop.is_closed():
+            # Если цикл ещё запустят, чтение завершится без обращения к закрытому сокету
+            self._reader_task.cancel()
+        if self.sock is not None:
+            self.sock.close()
+
+    async def close(self) -> None:
+        """Закрывает соединение, игнорируя ошибки уже разорванного сокета."""
+        self._reader_task.cancel()
+        self._fail_pending(IPCConnectionError("Соединение с IPC-сервером закрыто"))
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class ConnectionPool:
+    """Пул долгоживущих мультиплексированных соединений с IPC-сервером."""
+
+    def __init__(self, socket_path: str, max_size: int = 10, idle_timeout: float = 60.0,
+                 connect_timeout: float = 5.0, max_in_flight: int = 256,
+                 max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+                 object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 codec: Optional[JSONCodec] = None, health_check_interval: Optional[float] = 30.0):
+        """Инициализация пула.
+
+        Args:
+            socket_path (str): Путь к Unix-сокету.
+            max_size (int): Максимальное число одновременно открытых соединений.
+            idle_timeout (float): Время простоя в секундах, после которого соединение закрывается;
+                простаивающие соединения закрываются по таймеру, даже если запросов нет.
+            connect_timeout (float): Таймаут установки соединения в секундах.
+            max_in_flight (int): Число запросов в полёте на соединение, после которого
+                пул открывает дополнительное соединение.
+            max_message_size (int): Максимальный размер одного сообщения в байтах.
+            object_hook (Optional[Callable]): Преобразование каждого JSON-объекта при декодировании ответа.
+            codec (Optional[JSONCodec]): Кодек сообщений; по умолчанию самый быстрый из установленных.
+            health_check_interval (Optional[float]): Время простоя в секундах, после которого
+                соединение перед использованием проверяется запросом ping (ожидание ответа —
+                connect_timeout); None или 0 отключает проверку.
+        """
+        if max_size < 1:
+            raise ValueError("Размер пула должен быть положительным")
+        self.socket_path = socket_path
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.max_in_flight = max_in_flight
+        self.max_message_size = max_message_size
+        self.object_hook = object_hook
+        self.health_check_interval = health_check_interval
+        self.codec = codec or get_codec()
+        # Кодек для серверов без поддержки бинарного формата
+        self._fallback_codec = get_codec() if self.codec.binary else self.codec
+        self._connections: List[IPCConnection] = []
+        self._connecting = 0
+        self._changed: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prune_timer: Optional[asyncio.TimerHandle] = None
+        self._prune_at = 0.0
+
+    def _bind_loop(self) -> None:
+        """Привязывает пул к текущему циклу событий.
+
+        Сокеты принадлежат конкретному циклу, поэтому при запуске SDK в новом
+        цикле (например, повторный asyncio.run) соединения прежнего цикла закрываются.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            stale, self._connections = self._connections, []
+            for conn in stale:
+                conn.abandon()
+            if self._prune_timer is not None:
+                self._prune_timer.cancel()
+                self._prune_timer = None
+            self._connecting = 0
+            self._changed = asyncio.Condition()
+            self._loop = loop
+
+    async def _connect(self) -> IPCConnection:
+        """Открывает новое соединение с сервером.
+
+        Для бинарного кодека формат согласуется с сервером; если сервер его
+        не поддерживает, соединение работает в JSON.
+
+        Raises:
+            RequestNotSentError: Если не удалось подключиться к сокету.
+        """
+        # Сокет создаётся здесь, чтобы пул мог закрыть его и без цикла событий (abandon)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(asyncio.get_running_loop().sock_connect(sock, self.socket_path),
+                                   self.connect_timeout)
+            reader, writer = await asyncio.open_unix_connection(sock=sock)
+        except (ConnectionError, FileNotFoundError, OSError, asyncio.TimeoutError) as e:
+            sock.close()
+            raise RequestNotSentError(f"Ошибка подключения к IPC: {str(e)}")
+        except BaseException:
+            sock.close()
+            raise
+
+        codec = self.codec
+        if codec.binary:
+            try:
+                accepted = await asyncio.wait_for(
+                    negotiate_encoding(reader, writer, codec.name, self.max_message_size),
+                    self.connect_timeout)
+            except (ConnectionError, OSError, ValueError, IPCConnectionError,
+                    asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                writer.close()
+                raise RequestNotSentError(f"Ошибка согласования формата IPC: {str(e)}")
+            if not accepted:
+                codec = self._fallback_codec
+        # BigNumber в бинарном формате приходит расширением, обход JSON-объектов не нужен
+        object_hook = None if codec.binary else self.object_hook
+        return IPCConnection(reader, writer, self.max_message_size, object_hook, codec, sock)
+
+    def _prune(self) -> None:
+        """Убирает разорванные соединения и закрывает простаивающие дольше idle_timeout."""
+        now = time.monotonic()
+        alive = []
+        for conn in self._connections:
+            if not conn.is_healthy():
+                continue
+            if conn.in_flight == 0 and now - conn.last_used >= self.idle_timeout:
+                asyncio.ensure_future(conn.close())
+                continue
+            alive.append(conn)
+        self._connections = alive
+        self._schedule_prune(now)
+
+    def _schedule_prune(self, now: float) -> None:
+        """Планирует _prune на момент, когда первое соединение простоит idle_timeout."""
+        if not self._connections:
+            return
+        deadline = min(conn.last_used + self.idle_timeout if conn.in_flight == 0 else now + self.idle_timeout
+                       for conn in self._connections)
+        if self._prune_timer is not None:
+            if self._prune_at <= deadline:
+                return
+            self._prune_timer.cancel()
+        self._prune_at = deadline
+        self._prune_timer = self._loop.call_later(max(deadline - now, 0.0), self._on_prune_timer)
+
+    def _on_prune_timer(self) -> None:
+        self._prune_timer = None
+        self._prune()
+
+    def _needs_check(self, conn: IPCConnection) -> bool:
+        """Проверяет, что соединение простояло дольше health_check_interval."""
+        return bool(self.health_check_interval) and conn.in_flight == 0 and \
+            time.monotonic() - conn.last_used >= self.health_check_interval
+
+    async def acquire(self) -> IPCConnection:
+        """Выбирает наименее загруженное соединение, при необходимости открывая новое.
+
+        Returns:
+            IPCConnection: Соединение для отправки запроса.
+
+        Raises:
+            RequestNotSentError: Если не удалось подключиться к сокету.
+        """
+        self._bind_loop()
+        while True:
+            self._prune()
+            best = min(self._connections, key=lambda c: c.in_flight, default=None)
+            can_grow = len(self._connections) + self._connecting < self.max_size
+            if best is not None and (best.in_flight < self.max_in_flight or not can_grow):
+                # Сервер мог перестать отвечать, пока соединение простаивало
+                if self._needs_check(best) and not await best.ping(self.connect_timeout):
+                    continue
+                return best
+            if can_grow and self._connecting == 0:
+                break
+            # Соединение уже открывается: ждём его, а не открываем ещё одно на каждый запрос всплеска
+            async with self._changed:
+                await self._changed.wait()
+
+        self._connecting += 1
+        try:
+            conn = await self._connect()
+            self._connections.append(conn)
+            self._schedule_prune(time.monotonic())
+            return conn
+        finally:
+            self._connecting -= 1
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Отправляет запрос через одно из соединений пула.
+
+        Args:
+            message (Dict[str, Any]): Запрос с полями action и payload.
+
+        Returns:
+            Dict[str, Any]: Ответ сервера.
+
+        Raises:
+            IPCConnectionError: Если не удалось подключиться или соединение разорвано.
+        """
+        conn = await self.acquire()
+        return await conn.request(message)
+
+    async def close(self) -> None:
+        """Закрывает все соединения пула."""
+        if self._prune_timer is not None:
+            self._prune_timer.cancel()
+            self._prune_timer = None
+        connections, self._connections = self._connections, []
+        for conn in connections:
+            await conn.close()
+
+
+class _Endpoint:
+    """Состояние одного IPC-сервера в BalancedPool."""
+
+    def __init__(self, pool: ConnectionPool, breaker: CircuitBreaker):
+        self.pool = pool
+        self.breaker = breaker
+        self.outstanding = 0
+        self.latency = 0.0
+
+
+class BalancedPool:
+    """Балансировка запросов между несколькими IPC-серверами на одном хосте.
+
+    Для каждого сокета открывается свой ConnectionPool. Запросы кошелька
+    (с wallet_id или wallet_address в payload) закрепляются за одним сервером
+    рендеву-хешированием, потому что кошелёк, его DecimalEVM и nonce живут в
+    процессе, где кошелёк зарегистрирован. Запросы без состояния кошелька
+    получает сервер с наименьшим числом запросов в полёте, при равенстве — с
+    меньшим средним временем ответа: у медленного сервера копятся незавершённые
+    запросы, и новых он получает меньше.
+
+    У каждого сервера свой автомат защиты (retry.CircuitBreaker): сервер, к
+    которому не удалось подключиться, исключается из выбора сразу, а после
+    max_failures подряд ошибок уже отправленных запросов — тоже; по истечении
+    срока исключения серверу отправляется один пробный запрос, и при сбое срок
+    удваивается до max_eject_time. Если подключиться не удалось, запрос без
+    состояния ещё не отправлен и передаётся следующему серверу; ошибка после
+    отправки возвращается вызывающему, так как запрос мог быть выполнен. Запрос
+    кошелька на другой сервер не переносится: там нет ни кошелька, ни записей
+    ключей идемпотентности, и повтор записи мог бы исполнить её дважды. Если
+    исключены все подходящие серверы, запрос сразу завершается CircuitOpenError.
+    """
+
+    # Вес нового замера в скользящем среднем времени ответа
+    LATENCY_DECAY = 0.2
+
+    def __init__(self, socket_paths: Sequence[str], stateless: Optional[Callable[[str], bool]] = None,
+                 max_failures: int = 3, eject_time: float = 1.0, max_eject_time: float = 30.0,
+                 **pool_options: Any):
+        """Инициализация пула.
+
+        Args:
+            socket_paths (Sequence[str]): Пути к Unix-сокетам IPC-серверов.
+            stateless (Optional[Callable[[str], bool]]): Проверяет, что действие не зависит
+                от состояния кошелька и может выполняться на любом сервере; по умолчанию
+                все запросы кошелька закрепляются за его сервером.
+            max_failures (int): Число ошибок подряд, после которого сервер исключается.
+            eject_time (float): Срок первого исключения сервера в секундах.
+            max_eject_time (float): Максимальный срок исключения в секундах.
+            **pool_options: Параметры ConnectionPool для каждого сокета.
+        """
+        if not socket_paths:
+            raise ValueError("Не указан ни один сокет IPC-сервера")
+        self.socket_paths = list(socket_paths)
+        self.stateless = stateless
+        self._endpoints = [_Endpoint(ConnectionPool(path, **pool_options),
+                                     CircuitBreaker(max_failures, eject_time, max_eject_time))
+                           for path in self.socket_paths]
+        self._rotation = 0
+
+    @staticmethod
+    def _affinity_key(message: Dict[str, Any]) -> Optional[str]:
+        payload = message.get('payload') or {}
+        key = payload.get('wallet_id', payload.get('wallet_address'))
+        return None if key is None else str(key)
+
+    def _owner(self, key: str) -> _Endpoint:
+        # Рендеву-хеширование: сервер кошелька зависит только от набора сокетов
+        return max(self._endpoints, key=lambda e: zlib.crc32(f'{key}\0{e.pool.socket_path}'.encode()))
+
+    def owner(self, key: str) -> str:
+        """Сокет сервера, за которым закреплён кошелёк с wallet_id (или адресом) key."""
+        return self._owner(str(key)).pool.socket_path
+
+    def _candidates(self, message: Dict[str, Any]) -> List[_Endpoint]:
+        """Серверы, которым можно отправить запрос, в порядке предпочтения."""
+        key = self._affinity_key(message)
+        if key is not None and not (self.stateless and self.stateless(message.get('action', ''))):
+            return [self._owner(key)]
+        # Сдвиг начала перебора разводит равные оценки по разным серверам при холодном старте
+        self._rotation = (self._rotation + 1) % len(self._endpoints)
+        rotated = self._endpoints[self._rotation:] + self._endpoints[:self._rotation]
+        return sorted(rotated, key=lambda e: (e.outstanding, e.latency))
+
+    def _record_success(self, endpoint: _Endpoint, elapsed: float) -> None:
+        endpoint.breaker.record_success()
+        endpoint.latency += (elapsed - endpoint.latency) * self.LATENCY_DECAY if endpoint.latency else elapsed
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Отправляет запрос на один из серверов.
+
+        Args:
+            message (Dict[str, Any]): Запрос с полями action и payload.
+
+        Returns:
+            Dict[str, Any]: Ответ сервера.
+
+        Raises:
+            CircuitOpenError: Если все подходящие серверы исключены после сбоев.
+            RequestNotSentError: Если не удалось подключиться ни к одному подходящему серверу.
+            IPCConnectionError: Если соединение разорвано после отправки запроса.
+        """
+        error: Optional[IPCConnectionError] = None
+        candidates = self._candidates(message)
+        for endpoint in [e for e in candidates if e.breaker.available()]:
+            breaker = endpoint.breaker
+            # Место пробного запроса могли занять, пока подключались к предыдущему серверу
+            if not breaker.allow():
+                continue
+            # Запрос учитывается и пока открывается соединение, иначе всплеск уйдёт на ещё не подключённый сервер
+            endpoint.outstanding += 1
+            try:
+                try:
+                    conn = await endpoint.pool.acquire()
+                except IPCConnectionError as e:
+                    breaker.trip()
+                    error = e
+                    continue
+                start = time.monotonic()
+                try:
+                    response = await conn.request(message)
+                except IPCConnectionError:
+                    breaker.record_failure()
+                    raise
+            finally:
+                endpoint.outstanding -= 1
+                breaker.release()
+            self._record_success(endpoint, time.monotonic() - start)
+            return response
+        if error is not None:
+            raise RequestNotSentError(f"Нет доступных IPC-серверов: {error}")
+        retry_after = min(e.breaker.retry_after() for e in candidates)
+        raise CircuitOpenError(f"IPC-серверы для запроса исключены после сбоев, повтор через {retry_after:.1f} с")
+
+    async def request_each(self, messages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Отправляет серверам их запросы одновременно, минуя балансировку.
+
+        Args:
+            messages (Dict[str, Dict[str, Any]]): Запросы по путям сокетов.
+
+        Returns:
+            Dict[str, Any]: Ответы по путям сокетов; для сервера, запрос к которому
+            не выполнен, — исключение IPCConnectionError (CircuitOpenError, если сервер исключён).
+        """
+        endpoints = {e.pool.socket_path: e for e in self._endpoints}
+
+        async def send(endpoint: _Endpoint, message: Dict[str, Any]) -> Any:
+            breaker = endpoint.breaker
+            if not breaker.allow():
+                return CircuitOpenError(f"IPC-сервер {endpoint.pool.socket_path} исключён после сбоев, "
+                                        f"повтор через {breaker.retry_after():.1f} с")
+            endpoint.outstanding += 1
+            start = time.monotonic()
+            try:
+                response = await endpoint.pool.request(message)
+            except IPCConnectionError as e:
+                breaker.record_failure()
+                return e
+            finally:
+                endpoint.outstanding -= 1
+                breaker.release()
+            self._record_success(endpoint, time.monotonic() - start)
+            return response
+
+        paths = list(messages)
+        responses = await asyncio.gather(*[send(endpoints[path], messages[path]) for path in paths])
+        return dict(zip(paths, responses))
+
+    def endpoints(self) -> List[Dict[str, Any]]:
+        """Состояние серверов для мониторинга.
+
+        Returns:
+            List[Dict[str, Any]]: socket_path, outstanding — запросов в полёте, latency_ms —
+            скользящее среднее время ответа, failures — ошибок подряд, ejected — исключён ли
+            сервер, breaker — состояние автомата защиты сервера.
+        """
+        return [{'socket_path': e.pool.socket_path, 'outstanding': e.outstanding,
+                 'latency_ms': round(e.latency * 1000, 3), 'failures': e.breaker.failures,
+                 'ejected': e.breaker.state != CircuitBreaker.CLOSED, 'breaker': e.breaker.stats()}
+                for e in self._endpoints]
+
+    async def close(self) -> None:
+        """Закрывает соединения со всеми серверами."""
+        for endpoint in self._endpoints:
+            await endpoint.pool.close()
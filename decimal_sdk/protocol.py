@@ -0,0 +1,84 @@
+import asyncio
+import json
+import struct
+from .exceptions import IPCConnectionError, RequestNotSentError
+
+# Каждое сообщение IPC передаётся кадром: 4 байта длины (big-endian) и тело в JSON.
+# Запрос: {"id": int, "action": str, "payload": dict}
+# Ответ:  {"id": int, "success": bool, "result": Any} или {"id": int, "success": false, "error": str}
+#
+# Бинарный формат согласуется сразу после подключения: клиент отправляет JSON-кадр
+# {"id": 0, "action": "hello", "payload": {"encoding": "msgpack"}}, и если сервер
+# отвечает {"success": true, "result": {"encoding": "msgpack"}}, все последующие
+# кадры в обе стороны кодируются в MessagePack. Иначе соединение остаётся на JSON.
+HEADER = struct.Struct('>I')
+
+# Максимальный размер тела сообщения по умолчанию (64 МиБ)
+DEFAULT_MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def encode_frame(body: bytes, max_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> bytes:
+    """Упаковывает тело сообщения в кадр с префиксом длины.
+
+    Args:
+        body (bytes): Сериализованное сообщение.
+        max_size (int): Максимально допустимый размер тела в байтах.
+
+    Returns:
+        bytes: Кадр, готовый к записи в сокет.
+
+    Raises:
+        RequestNotSentError: Если сообщение превышает max_size.
+    """
+    if len(body) > max_size:
+        raise RequestNotSentError(f"Размер запроса {len(body)} байт превышает лимит {max_size} байт")
+    return HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> bytes:
+    """Читает из потока один кадр целиком, сколько бы фрагментов он ни занимал.
+
+    Данные накапливаются во внутреннем буфере StreamReader, который переиспользуется
+    между кадрами; тело возвращается одним объектом bytes и декодируется за один проход.
+
+    Args:
+        reader (asyncio.StreamReader): Поток чтения сокета.
+        max_size (int): Максимально допустимый размер тела в байтах.
+
+    Returns:
+        bytes: Тело сообщения без заголовка.
+
+    Raises:
+        asyncio.IncompleteReadError: Если сервер закрыл соединение посреди кадра.
+        IPCConnectionError: Если заявленный размер кадра превышает max_size.
+    """
+    header = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    if length > max_size:
+        raise IPCConnectionError(
+            f"Размер ответа {length} байт превышает лимит {max_size} байт (IPC_MAX_MESSAGE_SIZE)")
+    return await reader.readexactly(length)
+
+
+async def negotiate_encoding(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             encoding: str, max_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> bool:
+    """Предлагает серверу бинарный формат сообщений для соединения.
+
+    Args:
+        reader (asyncio.StreamReader): Поток чтения сокета.
+        writer (asyncio.StreamWriter): Поток записи сокета.
+        encoding (str): Имя формата, например 'msgpack'.
+        max_size (int): Максимально допустимый размер тела в байтах.
+
+    Returns:
+        bool: True, если сервер переключил соединение на предложенный формат.
+
+    Raises:
+        asyncio.IncompleteReadError: Если сервер закрыл соединение во время согласования.
+    """
+    hello = {'id': 0, 'action': 'hello', 'payload': {'encoding': encoding}}
+    writer.write(encode_frame(json.dumps(hello).encode(), max_size))
+    await writer.drain()
+    response = json.loads(await read_frame(reader, max_size))
+    result = response.get('result') if response.get('success') else None
+    return isinstance(result, dict) and result.get('encoding') == encoding
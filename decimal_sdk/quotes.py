@@ -0,0 +1,270 @@
+import asyncio
+import time
+from decimal import Context, Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from .exceptions import ValidationError
+
+WEI = 10 ** 18
+
+# Точности хватает на любое значение uint256 (78 десятичных знаков)
+_CONTEXT = Context(prec=80)
+_HUNDRED = Decimal(100)
+
+
+UNITS = ('wei', 'ether')
+
+
+def to_wei(value: Any, unit: str) -> int:
+    """Приводит сумму из ответа Subgraph или IPC к wei.
+
+    Единица задаётся полем-источником, а не видом значения: строка '1000'
+    в поле с суммой в DEL — это 1000 DEL, а не 1000 wei. Объекты BigNumber
+    всегда содержат wei.
+
+    Args:
+        value (Any): Сумма.
+        unit (str): 'wei' — сумма уже в wei, 'ether' — в DEL или токенах.
+
+    Returns:
+        int: Сумма в wei.
+
+    Raises:
+        ValidationError: Если единица неизвестна или сумма не приводится к wei.
+    """
+    if unit not in UNITS:
+        raise ValidationError(f"Неизвестная единица суммы: {unit}")
+    if isinstance(value, bool):
+        raise ValidationError(f"Некорректная сумма: {value!r}")
+    if isinstance(value, dict) and 'hex' in value:
+        return int(value['hex'], 16)
+    if unit == 'ether':
+        return units_to_wei(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    raise ValidationError(f"Сумма в wei должна быть целым неотрицательным числом: {value!r}")
+
+
+def units_to_wei(amount: float) -> int:
+    """Переводит сумму в DEL или токенах в wei без ошибок двоичного представления.
+
+    Raises:
+        ValidationError: Если сумма не является конечным числом.
+    """
+    try:
+        return int((Decimal(str(amount)) * WEI).to_integral_value(ROUND_FLOOR))
+    except (ArithmeticError, ValueError):
+        raise ValidationError(f"Некорректная сумма: {amount!r}")
+
+
+class BondingCurve:
+    """Состояние кривой связывания токена и расчёт котировок в wei.
+
+    Формулы совпадают с calculate_buy_*/calculate_sell_* контракта токена:
+    покупка за DEL увеличивает резерв и эмиссию, продажа уменьшает их,
+    CRR задаётся в процентах. Выходы округляются вниз, входы — вверх.
+    """
+
+    def __init__(self, reserve: int, supply: int, crr: int):
+        """Инициализация состояния.
+
+        Args:
+            reserve (int): Резерв в wei DEL.
+            supply (int): Эмиссия токена в wei.
+            crr (int): Коэффициент резервирования, 1–100.
+        """
+        if not 0 < crr <= 100:
+            raise ValidationError("CRR должен быть в диапазоне от 1 до 100")
+        if reserve <= 0 or supply <= 0:
+            raise ValidationError("Резерв и эмиссия токена должны быть положительными")
+        self.reserve = reserve
+        self.supply = supply
+        self.crr = crr
+        self._reserve = Decimal(reserve)
+        self._supply = Decimal(supply)
+        self._crr_ratio = _CONTEXT.divide(Decimal(crr), _HUNDRED)
+        self._crr_inverse = _CONTEXT.divide(_HUNDRED, Decimal(crr))
+
+    @classmethod
+    def from_token(cls, token: Dict[str, Any]) -> 'BondingCurve':
+        """Создаёт кривую из данных get_token_by_address.
+
+        Args:
+            token (Dict[str, Any]): Токен с полями reserve, supply и crr.
+
+        Raises:
+            ValidationError: Если в данных нет резерва, эмиссии или CRR.
+        """
+        try:
+            # Subgraph отдаёт reserve и supply как BigInt в wei
+            return cls(to_wei(token['reserve'], 'wei'), to_wei(token['supply'], 'wei'), int(token['crr']))
+        except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+            raise ValidationError(f"Неполные данные токена для расчёта котировок: {str(e)}")
+
+    @staticmethod
+    def _round(value: Decimal, rounding: str) -> int:
+        return int(value.to_integral_value(rounding))
+
+    def buy_output(self, amount_del: int) -> int:
+        """Токены в wei за amount_del wei DEL."""
+        growth = _CONTEXT.power(_CONTEXT.divide(self._reserve + amount_del, self._reserve), self._crr_ratio)
+        return self._round(_CONTEXT.multiply(self._supply, growth - 1), ROUND_FLOOR)
+
+    def buy_input(self, amount_tokens: int) -> int:
+        """DEL в wei, необходимые для покупки amount_tokens wei токена."""
+        growth = _CONTEXT.power(_CONTEXT.divide(self._supply + amount_tokens, self._supply), self._crr_inverse)
+        return self._round(_CONTEXT.multiply(self._reserve, growth - 1), ROUND_CEILING)
+
+    def sell_output(self, amount_tokens: int) -> int:
+        """DEL в wei за продажу amount_tokens wei токена."""
+        if amount_tokens > self.supply:
+            raise ValidationError("Сумма продажи превышает эмиссию токена")
+        left = _CONTEXT.power(_CONTEXT.divide(self._supply - amount_tokens, self._supply), self._crr_inverse)
+        return self._round(_CONTEXT.multiply(self._reserve, 1 - left), ROUND_FLOOR)
+
+    def sell_input(self, amount_del: int) -> int:
+        """Токены в wei, которые нужно продать, чтобы получить amount_del wei DEL."""
+        if amount_del > self.reserve:
+            raise ValidationError("Запрошенная сумма превышает резерв токена")
+        left = _CONTEXT.power(_CONTEXT.divide(self._reserve - amount_del, self._reserve), self._crr_ratio)
+        return self._round(_CONTEXT.multiply(self._supply, 1 - left), ROUND_CEILING)
+
+
+LADDER_SIDES = ('buy_output', 'buy_input', 'sell_input', 'sell_output')
+
+
+def quote_ladder(curves: Sequence[BondingCurve], amounts: Any, side: str = 'buy_output') -> Any:
+    """Векторный расчёт котировок для многих сумм и токенов за один вызов.
+
+    Считает в float64 в единицах DEL/токена: log1p/expm1 сохраняют точность
+    для малых сумм, относительная погрешность — не хуже 1e-12. Для точного
+    результата в wei используйте методы BondingCurve.
+
+    Args:
+        curves (Sequence[BondingCurve]): Состояния кривых токенов.
+        amounts (array-like): Суммы в DEL или токенах (в зависимости от side).
+        side (str): 'buy_output', 'buy_input', 'sell_input' или 'sell_output'.
+
+    Returns:
+        numpy.ndarray: Массив формы (len(curves), len(amounts)). Суммы продажи
+        больше эмиссии (или резерва для sell_input) дают nan.
+
+    Raises:
+        ImportError: Если NumPy не установлен.
+        ValidationError: Если side неизвестен.
+    """
+    # NumPy импортируется при первом вызове: он заметно замедляет импорт пакета
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("Для векторных котировок установите NumPy: pip install -e .[numpy]")
+    if side not in LADDER_SIDES:
+        raise ValidationError(f"Неизвестный тип котировки: {side}")
+
+    amounts = np.asarray(amounts, dtype=np.float64)[np.newaxis, :]
+    reserve = np.array([curve.reserve / WEI for curve in curves])[:, np.newaxis]
+    supply = np.array([curve.supply / WEI for curve in curves])[:, np.newaxis]
+    ratio = np.array([curve.crr / 100 for curve in curves])[:, np.newaxis]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if side == 'buy_output':
+            return supply * np.expm1(ratio * np.log1p(amounts / reserve))
+        if side == 'buy_input':
+            return reserve * np.expm1(np.log1p(amounts / supply) / ratio)
+        if side == 'sell_output':
+            return -reserve * np.expm1(np.log1p(-amounts / supply) / ratio)
+        return -supply * np.expm1(ratio * np.log1p(-amounts / reserve))
+
+
+class QuoteEngine:
+    """Локальные котировки покупки и продажи токенов без обращения к IPC-серверу.
+
+    Состояние кривой каждого токена запрашивается один раз через
+    get_token_by_address и хранится до refresh или истечения ttl.
+    """
+
+    def __init__(self, sdk: Any, ttl: Optional[float] = None):
+        """Инициализация движка.
+
+        Args:
+            sdk (DecimalSDK): SDK для загрузки состояния токенов.
+            ttl (Optional[float]): Время жизни состояния токена в секундах; None — до refresh.
+        """
+        self.sdk = sdk
+        self.ttl = ttl
+        self._curves: Dict[str, Tuple[float, BondingCurve]] = {}
+
+    async def curve(self, token_address: str, refresh: bool = False) -> BondingCurve:
+        """Возвращает состояние кривой токена, загружая его при необходимости.
+
+        Args:
+            token_address (str): Адрес токена.
+            refresh (bool): Загрузить состояние заново.
+
+        Returns:
+            BondingCurve: Состояние для синхронного расчёта котировок.
+        """
+        key = token_address.lower()
+        entry = self._curves.get(key)
+        if entry is not None and not refresh and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+            return entry[1]
+        if refresh or entry is not None:
+            # Кэш ответов SDK не должен вернуть то же устаревшее состояние
+            self.sdk.cache.invalidate('get_token_by_address', {'token_address': token_address})
+        curve = BondingCurve.from_token(await self.sdk.get_token_by_address(token_address))
+        self._curves[key] = (time.monotonic(), curve)
+        return curve
+
+    def refresh(self, token_address: Optional[str] = None) -> None:
+        """Сбрасывает сохранённое состояние токена или всех токенов.
+
+        Args:
+            token_address (Optional[str]): Адрес токена; если не указан, сбрасываются все.
+        """
+        if token_address is None:
+            self._curves.clear()
+        else:
+            self._curves.pop(token_address.lower(), None)
+
+    async def ladder(self, token_addresses: Union[str, Sequence[str]], amounts: Any,
+                     side: str = 'buy_output') -> Any:
+        """Рассчитывает котировки для массива сумм по одному или нескольким токенам.
+
+        Пример:
+            depth = await quotes.ladder([token_a, token_b], numpy.linspace(1, 10_000, 1000))
+
+        Args:
+            token_addresses (Union[str, Sequence[str]]): Адрес токена или список адресов.
+            amounts (array-like): Суммы в DEL или токенах.
+            side (str): 'buy_output', 'buy_input', 'sell_input' или 'sell_output'.
+
+        Returns:
+            numpy.ndarray: Форма (len(amounts),) для одного адреса,
+            иначе (len(token_addresses), len(amounts)).
+        """
+        single = isinstance(token_addresses, str)
+        addresses = [token_addresses] if single else list(token_addresses)
+        curves = await asyncio.gather(*(self.curve(address) for address in addresses))
+        result = quote_ladder(curves, amounts, side)
+        return result[0] if single else result
+
+    async def calculate_buy_output(self, token_address: str, amount_del: float) -> float:
+        """Рассчитывает выход токенов при покупке за DEL."""
+        curve = await self.curve(token_address)
+        return curve.buy_output(units_to_wei(amount_del)) / WEI
+
+    async def calculate_buy_input(self, token_address: str, amount_tokens: float) -> float:
+        """Рассчитывает вход DEL для покупки токенов."""
+        curve = await self.curve(token_address)
+        return curve.buy_input(units_to_wei(amount_tokens)) / WEI
+
+    async def calculate_sell_input(self, token_address: str, amount_del: float) -> float:
+        """Рассчитывает вход токенов для продажи за DEL."""
+        curve = await self.curve(token_address)
+        return curve.sell_input(units_to_wei(amount_del)) / WEI
+
+    async def calculate_sell_output(self, token_address: str, amount_tokens: float) -> float:
+        """Рассчитывает выход DEL для продажи токенов."""
+        curve = await self.curve(token_address)
+        return curve.sell_output(units_to_wei(amount_tokens)) / WEI
@@ -0,0 +1,129 @@
+import random
+import time
+from typing import Any, Dict
+
+# Категории ошибок сервера, после которых чтение можно повторить: сбой узла,
+# Subgraph или сети (upstream) и перезапуск обработчика кластера (unavailable)
+RETRYABLE_KINDS = frozenset({'upstream', 'unavailable'})
+
+
+class RetryPolicy:
+    """Повтор запросов с экспоненциальной задержкой и полным джиттером.
+
+    Задержка перед повтором n (с нуля) выбирается случайно от 0 до
+    min(max_delay, base_delay * 2 ** n), поэтому клиенты, получившие ошибку
+    одновременно, не возвращаются на сервер одной волной.
+    """
+
+    def __init__(self, retries: int = 2, base_delay: float = 0.05, max_delay: float = 1.0):
+        """Инициализация политики.
+
+        Args:
+            retries (int): Число повторов после первой попытки; 0 — не повторять.
+            base_delay (float): Верхняя граница задержки перед первым повтором в секундах.
+            max_delay (float): Наибольшая задержка в секундах.
+        """
+        if retries < 0:
+            raise ValueError("Число повторов не может быть отрицательным")
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Задержка перед повтором с номером attempt (с нуля) в секундах."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Автомат защиты: после серии сбоев запросы временно не отправляются.
+
+    В закрытом состоянии запросы проходят; failure_threshold сбоев подряд
+    открывают автомат на reset_timeout секунд, и запросы сразу отклоняются.
+    По истечении срока автомат полуоткрыт: проходит один пробный запрос. Успех
+    закрывает автомат, сбой снова открывает его на удвоенный срок, но не дольше
+    max_reset_timeout.
+
+    Каждый вызов allow(), вернувший True, завершается record_success(),
+    record_failure() или, если исход неизвестен (например, запрос отменён), release().
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 1.0, max_reset_timeout: float = 30.0):
+        """Инициализация автомата.
+
+        Args:
+            failure_threshold (int): Число сбоев подряд, открывающее автомат.
+            reset_timeout (float): Срок первого открытия в секундах.
+            max_reset_timeout (float): Наибольший срок открытия в секундах.
+        """
+        if failure_threshold < 1:
+            raise ValueError("Порог сбоев должен быть положительным")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._open = False
+        self._opened_until = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return self.CLOSED
+        return self.OPEN if time.monotonic() < self._opened_until else self.HALF_OPEN
+
+    def available(self) -> bool:
+        """Проверяет, пропустит ли автомат запрос, не занимая место пробного запроса."""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+
+    def allow(self) -> bool:
+        """Разрешает запрос; в полуоткрытом состоянии — только один пробный."""
+        if not self.available():
+            self.rejected += 1
+            return False
+        if self._open:
+            self._probing = True
+        return True
+
+    def retry_after(self) -> float:
+        """Сколько секунд автомат ещё будет открыт."""
+        return max(0.0, self._opened_until - time.monotonic()) if self._open else 0.0
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.trips = 0
+        self._open = False
+        self._probing = False
+
+    def record_failure(self) -> None:
+        if not self._open:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.trip()
+        elif self.state == self.HALF_OPEN:
+            # Сбой пробного запроса; сбои запросов, начатых до открытия, срок не продлевают
+            self.trip()
+
+    def trip(self) -> None:
+        """Открывает автомат сразу, например, если к серверу не удалось подключиться."""
+        self._opened_until = time.monotonic() + min(self.reset_timeout * 2 ** self.trips, self.max_reset_timeout)
+        self.trips += 1
+        self.failures = 0
+        self._open = True
+        self._probing = False
+
+    def release(self) -> None:
+        """Освобождает место пробного запроса, исход которого неизвестен."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Состояние автомата: state, failures — сбоев подряд, trips — открытий подряд,
+        retry_after — секунд до пробного запроса, rejected — отклонённых запросов."""
+        return {'state': self.state, 'failures': self.failures, 'trips': self.trips,
+                'retry_after': round(self.retry_after(), 3), 'rejected': self.rejected}
@@ -0,0 +1,142 @@
+import inspect
+import types
+from typing import Any, Dict, Iterator, Optional
+
+from .client import DecimalSDK
+from .exceptions import EncryptionError, ValidationError, WalletRegistrationError
+
+
+class WalletSession:
+    """Кошелёк, работающий через транспорт общего DecimalSDK.
+
+    Сессия хранит ссылку на исходный SDK и не создаёт собственных Config,
+    Encryption и пула соединений: пул, кэш, реестр действий и запросы в полёте
+    берутся у SDK в момент обращения. Собственные у сессии только wallet_id,
+    wallet_address и зашифрованная мнемоника для повторной регистрации; методы DecimalSDK, включая batch() и iter_*, вызываются
+    от имени сессии и выполняются от имени её кошелька.
+    """
+
+    def __init__(self, sdk: DecimalSDK, wallet_id: str, wallet_address: Optional[str],
+                 encrypted_mnemonic: Optional[str] = None):
+        """Инициализация сессии.
+
+        Args:
+            sdk (DecimalSDK): SDK, транспорт которого используется сессией.
+            wallet_id (str): Идентификатор кошелька на IPC-сервере.
+            wallet_address (Optional[str]): Адрес кошелька.
+            encrypted_mnemonic (Optional[str]): Зашифрованная мнемоника; с ней кошелёк
+                регистрируется заново на сервере, который его не знает.
+        """
+        self._sdk = sdk
+        self.wallet_id = wallet_id
+        self.wallet_address = wallet_address
+        self._encrypted_mnemonic = encrypted_mnemonic
+
+    def __getattr__(self, name: str) -> Any:
+        # Вызывается только для имён, которых нет у самой сессии
+        if name == '_sdk':
+            raise AttributeError(name)
+        attribute = inspect.getattr_static(type(self._sdk), name, None)
+        if isinstance(attribute, types.FunctionType):
+            return types.MethodType(attribute, self)
+        return getattr(self._sdk, name)
+
+    async def __aenter__(self) -> 'WalletSession':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Ничего не закрывает: соединения принадлежат общему SDK."""
+
+
+class WalletSessions:
+    """Набор кошельков, обслуживаемых одним клиентом и одним пулом соединений.
+
+    Затраты памяти и времени запуска растут с числом соединений пула, а не
+    с числом кошельков; на IPC-сервере для каждого wallet_id переиспользуется
+    один объект DecimalEVM.
+
+    Пример:
+        sessions = WalletSessions(DecimalSDK())
+        hot = await sessions.register('hot-1', mnemonic)
+        await hot.send_del(to, 1.5)
+        await sessions['hot-1'].get_balance(hot.wallet_address)
+    """
+
+    def __init__(self, sdk: DecimalSDK):
+        """Инициализация набора.
+
+        Args:
+            sdk (DecimalSDK): SDK, транспорт которого разделяют все кошельки.
+        """
+        self.sdk = sdk
+        self._sessions: Dict[str, WalletSession] = {}
+
+    def __getitem__(self, wallet_id: str) -> WalletSession:
+        return self._sessions[wallet_id]
+
+    def __contains__(self, wallet_id: str) -> bool:
+        return wallet_id in self._sessions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sessions)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def register(self, wallet_id: str, mnemonic: str) -> WalletSession:
+        """Регистрирует кошелёк на IPC-сервере и создаёт для него сессию.
+
+        Args:
+            wallet_id (str): Идентификатор кошелька на IPC-сервере.
+            mnemonic (str): Мнемоника; передаётся на сервер зашифрованной.
+
+        Returns:
+            WalletSession: Сессия кошелька.
+
+        Raises:
+            EncryptionError: Если не удалось зашифровать мнемонику.
+            WalletRegistrationError: Если сервер не зарегистрировал кошелёк.
+        """
+        try:
+            encrypted_mnemonic = self.sdk.encryption.encrypt(mnemonic)
+        except EncryptionError as e:
+            raise EncryptionError(f"Ошибка шифрования мнемоники: {str(e)}")
+        # Запрос идёт от имени новой сессии: wallet_id добавляет _send_request
+        session = WalletSession(self.sdk, wallet_id, None, encrypted_mnemonic)
+        try:
+            result = await session._send_request('create_wallet', {'mnemonic': encrypted_mnemonic})
+        except Exception as e:
+            raise WalletRegistrationError(f"Ошибка создания кошелька {wallet_id}: {str(e)}")
+        address = result.get('address') if isinstance(result, dict) else None
+        if not address or not address.startswith('0x'):
+            raise WalletRegistrationError("Неверный формат адреса кошелька")
+        session.wallet_address = address
+        self._sessions[wallet_id] = session
+        return session
+
+    def attach(self, wallet_id: str, wallet_address: str) -> WalletSession:
+        """Создаёт сессию для кошелька, уже зарегистрированного на IPC-сервере.
+
+        Args:
+            wallet_id (str): Идентификатор кошелька на IPC-сервере.
+            wallet_address (str): Адрес кошелька.
+
+        Returns:
+            WalletSession: Сессия кошелька.
+        """
+        if not wallet_address.startswith('0x'):
+            raise ValidationError("Адрес кошелька должен быть в формате 0x...")
+        session = WalletSession(self.sdk, wallet_id, wallet_address)
+        self._sessions[wallet_id] = session
+        return session
+
+    def remove(self, wallet_id: str) -> None:
+        """Удаляет сессию кошелька; кошелёк на IPC-сервере остаётся зарегистрированным."""
+        self._sessions.pop(wallet_id, None)
+
+    async def close(self) -> None:
+        """Закрывает общий транспорт всех сессий."""
+        await self.sdk.close()
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import ValidationError
+from .pagination import DEFAULT_PAGE_SIZE
+
+# Зеркалируемые коллекции: действие IPC и индексируемые столбцы. Для каждого
+# столбца перечислены поля записи Subgraph, из которых берётся значение; ссылки
+# на сущности ({"id": ...}) заменяются их id.
+TABLES: Dict[str, Dict[str, Any]] = {
+    'validators': {'action': 'get_validators', 'paged': False, 'columns': {}},
+    'stakes': {'action': 'get_stakes', 'columns': {
+        'validator': ('validator',), 'delegator': ('delegator',), 'token': ('token',)}},
+    'tokens': {'action': 'get_tokens', 'columns': {
+        'symbol': ('symbol',), 'owner': ('creator', 'owner')}},
+    'transfer_stakes': {'action': 'get_transfer_stakes', 'columns': {
+        'validator': ('validator', 'from'), 'delegator': ('delegator',), 'token': ('token',)}},
+    'withdraw_stakes': {'action': 'get_withdraw_stakes', 'columns': {
+        'validator': ('validator',), 'delegator': ('delegator',), 'token': ('token',)}},
+    'penalties': {'action': 'get_validator_penalties_from_block', 'columns': {
+        'validator': ('validator',)}},
+}
+
+_BLOCK_FIELDS = ('blockNumber', 'block', 'createdAtBlock')
+# Число id в одном запросе: SQLite ограничивает число параметров запроса
+_SELECT_CHUNK = 500
+
+
+def _field(record: Dict[str, Any], names: Iterable[str]) -> Optional[str]:
+    """Возвращает первое найденное поле записи; адреса приводятся к нижнему регистру."""
+    for name in names:
+        value = record.get(name)
+        if isinstance(value, dict):
+            value = value.get('id')
+        if value is not None:
+            return str(value).lower() if str(value).startswith('0x') else str(value)
+    return None
+
+
+def _block(record: Dict[str, Any]) -> Optional[int]:
+    value = _field(record, _BLOCK_FIELDS)
+    try:
+        return int(value, 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LocalStore:
+    """Локальный индекс данных Subgraph в SQLite с инкрементальной синхронизацией.
+
+    Штрафы валидаторов догружаются начиная с последнего сохранённого блока.
+    Остальные коллекции Subgraph не фильтруются по блоку на сервере, поэтому
+    читаются параллельной выгрузкой, но в базу записываются только новые и
+    изменившиеся записи, а исчезнувшие удаляются. Высота синхронизации
+    берётся из номеров блоков самих записей и не требует кошелька.
+    Запросы к индексу выполняются локально и не обращаются к IPC-серверу.
+    """
+
+    def __init__(self, sdk: Any, path: str = 'decimal_index.sqlite3', page_size: int = DEFAULT_PAGE_SIZE,
+                 concurrency: int = 8):
+        """Инициализация хранилища.
+
+        Args:
+            sdk (DecimalSDK): SDK, через который выгружаются данные.
+            path (str): Путь к файлу базы SQLite.
+            page_size (int): Размер страницы при выгрузке.
+            concurrency (int): Число одновременных запросов страниц.
+        """
+        self.sdk = sdk
+        self.path = path
+        self.page_size = page_size
+        self.concurrency = concurrency
+        # SQLite-соединение используется только из одного рабочего потока,
+        # чтобы запись больших страниц не блокировала цикл событий
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='decimal-store')
+        self._db: Optional[sqlite3.Connection] = None
+
+    async def _run(self, func, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, '
+                             'generation INTEGER NOT NULL, block_number INTEGER, synced_at REAL)')
+            for name, spec in TABLES.items():
+                columns = ''.join(f', {column} TEXT' for column in spec['columns'])
+                self._db.execute(f'CREATE TABLE IF NOT EXISTS {name} (id TEXT PRIMARY KEY{columns}, '
+                                 f'block_number INTEGER, generation INTEGER NOT NULL, data TEXT NOT NULL)')
+                for column in (*spec['columns'], 'block_number'):
+                    self._db.execute(f'CREATE INDEX IF NOT EXISTS {name}_{column} ON {name} ({column})')
+            self._db.commit()
+        return self._db
+
+    def _state(self, name: str) -> Tuple[int, Optional[int], Optional[float]]:
+        row = self._connection().execute(
+            'SELECT generation, block_number, synced_at FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return row or (0, None, None)
+
+    def _save_state(self, name: str, generation: int, block_number: Optional[int]) -> None:
+        db = self._connection()
+        db.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)',
+                   (name, generation, block_number, time.time()))
+        db.commit()
+
+    def _upsert(self, name: str, records: List[Dict[str, Any]], generation: int, scan: bool = False) -> int:
+        """Записывает новые и изменившиеся записи; возвращает их число.
+
+        При scan id записей запоминаются, чтобы после полного обхода коллекции
+        удалить записи, которых в ней больше нет.
+        """
+        columns = TABLES[name]['columns']
+        records_by_id = {str(record['id']): record for record in records
+                         if isinstance(record, dict) and record.get('id') is not None}
+        db = self._connection()
+        ids = list(records_by_id)
+        if scan:
+            db.executemany('INSERT OR IGNORE INTO scan_ids VALUES (?)', [(record_id,) for record_id in ids])
+        stored: Dict[str, str] = {}
+        for start in range(0, len(ids), _SELECT_CHUNK):
+            chunk = ids[start:start + _SELECT_CHUNK]
+            stored.update(db.execute(f'SELECT id, data FROM {name} WHERE id IN ({", ".join("?" * len(chunk))})',
+                                     chunk))
+        rows = []
+        for record_id, record in records_by_id.items():
+            data = json.dumps(record)
+            if stored.get(record_id) == data:
+                continue
+            values = [_field(record, fields) for fields in columns.values()]
+            rows.append((record_id, *values, _block(record), generation, data))
+        placeholders = ', '.join('?' * (len(columns) + 4))
+        names = ', '.join(('id', *columns, 'block_number', 'generation', 'data'))
+        db.executemany(f'INSERT OR REPLACE INTO {name} ({names}) VALUES ({placeholders})', rows)
+        db.commit()
+        return len(rows)
+
+    def _begin_scan(self) -> None:
+        db = self._connection()
+        db.execute('CREATE TEMP TABLE IF NOT EXISTS scan_ids (id TEXT PRIMARY KEY)')
+        db.execute('DELETE FROM scan_ids')
+
+    def _drop_unseen(self, name: str) -> None:
+        db = self._connection()
+        db.execute(f'DELETE FROM {name} WHERE id NOT IN (SELECT id FROM scan_ids)')
+        db.execute('DELETE FROM scan_ids')
+        db.commit()
+
+    def _max_block(self, name: str) -> Optional[int]:
+        return self._connection().execute(f'SELECT MAX(block_number) FROM {name}').fetchone()[0]
+
+    def _select(self, name: str, filters: Dict[str, Any], min_block: Optional[int],
+                limit: Optional[int]) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in TABLES[name]['columns']:
+                raise ValidationError(f"Поле {column} не индексируется в таблице {name}")
+            clauses.append(f'{column} = ?')
+            params.append(value.lower() if isinstance(value, str) and value.startswith('0x') else value)
+        if min_block is not None:
+            clauses.append('block_number >= ?')
+            params.append(min_block)
+        sql = f'SELECT data FROM {name}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return [json.loads(data) for (data,) in self._connection().execute(sql, params)]
+
+    async def _sync_changes(self, name: str) -> int:
+        """Сверяет коллекцию с Subgraph: пишет изменения и удаляет исчезнувшие записи."""
+        spec = TABLES[name]
+        generation = (await self._run(self._state, name))[0] + 1
+        await self._run(self._begin_scan)
+        count = 0
+        if spec.get('paged', True):
+            pages: List[Dict[str, Any]] = []
+            async for record in self.sdk.bulk_fetch(spec['action'], page_size=self.page_size,
+                                                    concurrency=self.concurrency):
+                pages.append(record)
+                if len(pages) >= self.page_size:
+                    count += await self._run(self._upsert, name, pages, generation, True)
+                    pages = []
+            count += await self._run(self._upsert, name, pages, generation, True)
+        else:
+            count = await self._run(self._upsert, name, await self.sdk._send_request(spec['action'], {}),
+                                    generation, True)
+        # Удаление только после полного обхода: при ошибке выгрузки записи остаются
+        await self._run(self._drop_unseen, name)
+        await self._run(self._save_state, name, generation, await self._run(self._max_block, name))
+        return count
+
+    async def _sync_penalties(self) -> int:
+        """Догружает штрафы каждого валидатора с последнего сохранённого блока."""
+        validators = await self._run(self._select, 'validators', {}, None, None)
+        count = 0
+        for validator in validators:
+            address = _field(validator, ('id',))
+            state_name = f'penalties:{address}'
+            generation, from_block, _ = await self._run(self._state, state_name)
+            from_block = from_block or 0
+            last_block = from_block
+            records: List[Dict[str, Any]] = []
+            # Запрос с блока включительно: повторно полученные записи обновятся по id
+            async for record in self.sdk.bulk_fetch('get_validator_penalties_from_block',
+                                                    {'validator': address, 'blockNumber': from_block},
+                                                    page_size=self.page_size, concurrency=self.concurrency):
+                records.append(record)
+                last_block = max(last_block, _block(record) or 0)
+            count += await self._run(self._upsert, 'penalties', records, generation + 1)
+            await self._run(self._save_state, state_name, generation + 1, last_block)
+        await self._run(self._save_state, 'penalties', 0, await self._run(self._max_block, 'penalties'))
+        return count
+
+    async def sync(self, tables: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        """Синхронизирует индекс с Subgraph.
+
+        Args:
+            tables (Optional[Iterable[str]]): Таблицы из TABLES; по умолчанию все.
+                Штрафы синхронизируются по списку валидаторов из индекса.
+            max_age (Optional[float]): Пропускать таблицы, синхронизированные не раньше
+                чем max_age секунд назад.
+
+        Returns:
+            Dict[str, int]: Число новых и изменившихся записей по таблицам.
+
+        Raises:
+            ValidationError: Если указана неизвестная таблица.
+        """
+        names = list(tables) if tables is not None else list(TABLES)
+        unknown = set(names) - set(TABLES)
+        if unknown:
+            raise ValidationError(f"Неизвестные таблицы: {', '.join(sorted(unknown))}")
+        if 'penalties' in names and 'validators' in names:
+            # Штрафам нужен актуальный список валидаторов
+            names.remove('validators')
+            names.insert(0, 'validators')
+
+        counts = {}
+        for name in names:
+            synced_at = (await self._run(self._state, name))[2]
+            if max_age is not None and synced_at is not None and time.time() - synced_at < max_age:
+                continue
+            if name == 'penalties':
+                counts[name] = await self._sync_penalties()
+            else:
+                counts[name] = await self._sync_changes(name)
+        return counts
+
+    async def last_synced(self, name: str) -> Dict[str, Any]:
+        """Возвращает состояние синхронизации таблицы.
+
+        Returns:
+            Dict[str, Any]: block_number — последний блок среди записей таблицы (None, если
+            в записях нет блока), synced_at — время синхронизации (unix).
+        """
+        _, block_number, synced_at = await self._run(self._state, name)
+        return {'block_number': block_number, 'synced_at': synced_at}
+
+    async def query(self, table: str, limit: Optional[int] = None, min_block: Optional[int] = None,
+                    **filters: Any) -> List[Dict[str, Any]]:
+        """Выбирает записи из индекса по индексируемым полям.
+
+        Пример:
+            stakes = await store.query('stakes', validator=address)
+
+        Args:
+            table (str): Таблица из TABLES.
+            limit (Optional[int]): Максимальное число записей.
+            min_block (Optional[int]): Только записи с блока min_block включительно.
+            **filters: Равенство индексируемых полей таблицы.
+
+        Returns:
+            List[Dict[str, Any]]: Записи Subgraph в исходном виде.
+        """
+        if table not in TABLES:
+            raise ValidationError(f"Неизвестная таблица: {table}")
+        return await self._run(self._select, table, filters, min_block, limit)
+
+    async def get_stakes_by_validator(self, validator: str) -> List[Dict[str, Any]]:
+        """Стейки валидатора из индекса."""
+        return await self.query('stakes', validator=validator)
+
+    async def get_stakes_by_address(self, delegator: str) -> List[Dict[str, Any]]:
+        """Стейки делегатора из индекса."""
+        return await self.query('stakes', delegator=delegator)
+
+    async def get_validator_penalties(self, validator: str, from_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Штрафы валидатора из индекса, при необходимости начиная с блока."""
+        return await self.query('penalties', min_block=from_block, validator=validator)
+
+    async def get_token_by_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Токен по символу из индекса."""
+        tokens = await self.query('tokens', limit=1, symbol=symbol)
+        return tokens[0] if tokens else None
+
+    async def close(self) -> None:
+        """Закрывает базу и рабочий поток."""
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        # Закрытие базы было последней задачей потока, ждать его завершения не нужно
+        self._executor.shutdown(wait=False)
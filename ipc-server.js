@@ -1,6 +1,8 @@
 const net = require('net');
 const fs = require('fs');
 const path = require('path');
+const os = require('os');
+const cluster = require('cluster');
 const { Fernet, encode, decode } = require('fernet');
 require('dotenv').config();
 
@@ -9,1044 +11,1491 @@ const dscSdkPath = path.resolve(__dirname, 'dsc-js-sdk');
 const SDK = require(dscSdkPath);
 const { Wallet, DecimalEVM, DecimalNetworks, Subgraph } = SDK;
 
+// MessagePack — необязательный бинарный формат, который клиент предлагает при подключении
+let msgpack = null;
+try {
+    msgpack = require('@msgpack/msgpack');
+} catch (err) {
+    msgpack = null;
+}
+
 // Конфигурация
 const SOCKET_PATH = process.env.SOCKET_PATH || '/tmp/decimal_ipc.sock';
+const MAX_MESSAGE_SIZE = Number(process.env.IPC_MAX_MESSAGE_SIZE || 64 * 1024 * 1024);
 const ENCRYPTION_KEY = process.env.ENCRYPTION_KEY;
+const NONCE_MANAGER = process.env.NONCE_MANAGER !== '0';
+const WARMUP_ON_REGISTER = process.env.WARMUP_ON_REGISTER !== '0';
+// Сколько помнить ключи идемпотентности транзакций и сколько их хранить
+const IDEMPOTENCY_TTL_MS = Number(process.env.IDEMPOTENCY_TTL_MS || 10 * 60 * 1000);
+const IDEMPOTENCY_MAX_KEYS = Number(process.env.IDEMPOTENCY_MAX_KEYS || 10000);
+// Число процессов-обработчиков: 1 — всё в одном процессе, auto — по числу ядер
+const IPC_WORKERS = process.env.IPC_WORKERS === 'auto'
+    ? (os.availableParallelism ? os.availableParallelism() : os.cpus().length)
+    : Math.max(1, Number(process.env.IPC_WORKERS || 1));
 if (!ENCRYPTION_KEY) throw new Error('ENCRYPTION_KEY not set in .env');
 
 const fernet = new Fernet({ secret: encode(ENCRYPTION_KEY) });
 
-// Удаляем старый сокет
-if (fs.existsSync(SOCKET_PATH)) {
-    fs.unlinkSync(SOCKET_PATH);
-}
-
 // Хранилище кошельков и EVM
 const tempWallets = {};
 const decimalEVMs = {};
 const subgraphs = {};
 
-async function getDecimalEVM(walletId) {
-    if (decimalEVMs[walletId]) return decimalEVMs[walletId];
-
-    const wallet = tempWallets[walletId];
-    if (!wallet) throw new Error(`Кошелёк "${walletId}" не найден`);
-
-    decimalEVMs[walletId] = new DecimalEVM(wallet, DecimalNetworks.mainnet);
-    await decimalEVMs[walletId].connect(); // Инициализация всех контрактов
-    console.log(`✅ DecimalEVM создан для ${walletId}`);
+function getDecimalEVM(walletId) {
+    // Хранится обещание: одновременные первые запросы кошелька ждут одну
+    // инициализацию и не получают объект до connect() и подключения nonce
+    if (!decimalEVMs[walletId]) {
+        decimalEVMs[walletId] = createDecimalEVM(walletId).catch((err) => {
+            delete decimalEVMs[walletId];
+            throw err;
+        });
+    }
     return decimalEVMs[walletId];
 }
 
-async function getSubgraph() {
-    if (subgraphs['mainnet']) return subgraphs['mainnet'];
+async function createDecimalEVM(walletId) {
+    const wallet = tempWallets[walletId];
+    // Отдельная категория: клиент регистрирует кошелёк заново (например, после перезапуска обработчика)
+    if (!wallet) throw actionError(`Кошелёк "${walletId}" не найден`, 'unknown_wallet');
 
-    subgraphs['mainnet'] = new Subgraph(DecimalNetworks.mainnet);
-    console.log(`✅ Subgraph подключён для mainnet`);
-    return subgraphs['mainnet'];
+    const decimalEVM = new DecimalEVM(wallet, DecimalNetworks.mainnet);
+    await decimalEVM.connect(); // Инициализация всех контрактов
+    if (NONCE_MANAGER) attachNonceManager(walletId, decimalEVM);
+    console.log(`✅ DecimalEVM создан для ${walletId}`);
+    return decimalEVM;
 }
 
-// Сервер
-const server = net.createServer(async (socket) => {
-    console.log('🔌 Клиент подключён');
+// Локальное распределение nonce: одновременные транзакции одного кошелька
+// подписываются и отправляются без ожидания майнинга предыдущих.
+// Без него каждая транзакция берёт getTransactionCount('pending'), и
+// параллельные отправки получают одинаковый nonce.
+const nonceManagers = {};
+const NONCE_PRUNE_THRESHOLD = 256;
+
+class NonceManager {
+    constructor(signer) {
+        this.signer = signer;
+        this.next = null;           // следующий ещё не выданный nonce
+        this.gaps = [];             // неиспользованные nonce ниже next, выдаются первыми
+        this.inFlight = new Set();  // выданы, отправка не завершена
+        this.accepted = new Set();  // приняты узлом, но могут стоять в очереди за пропуском
+        this.syncing = null;
+        this.pruneAt = NONCE_PRUNE_THRESHOLD;
+        this.releases = 0;          // число nonce, освобождённых после ошибки отправки
+        this.scanned = 0;           // сколько из них учла последняя сверка
+    }
+
+    // Сверка с сетью. getTransactionCount('pending') не учитывает транзакции,
+    // ожидающие в очереди за пропуском, поэтому пропусками считаются только nonce
+    // из [pending, next), которые не отправляются сейчас и не были приняты узлом.
+    // reset забывает принятые: так восстанавливаются транзакции, вытесненные из мемпула.
+    sync(reset = false) {
+        if (!this.syncing) {
+            this.syncing = this._sync(reset).finally(() => {
+                this.syncing = null;
+            });
+        }
+        return this.syncing;
+    }
+
+    async _sync(reset) {
+        const pending = await this.signer.getTransactionCount('pending');
+        this.scanned = this.releases;
+        for (const nonce of this.accepted) {
+            if (reset || nonce < pending) this.accepted.delete(nonce);
+        }
+        const highest = Math.max(pending, this.next || 0);
+        this.gaps = [];
+        for (let nonce = pending; nonce < highest; nonce++) {
+            if (!this.inFlight.has(nonce) && !this.accepted.has(nonce)) this.gaps.push(nonce);
+        }
+        this.next = highest;
+        // Если очередь не уменьшается (застрявший пропуск), сверки не повторяются на каждой транзакции
+        this.pruneAt = Math.max(NONCE_PRUNE_THRESHOLD, this.accepted.size * 2);
+    }
+
+    async allocate() {
+        while (this.next === null || this.syncing) {
+            await (this.syncing || this.sync());
+        }
+        const nonce = this.gaps.length ? this.gaps.shift() : this.next++;
+        this.inFlight.add(nonce);
+        return nonce;
+    }
 
-    socket.on('data', async (data) => {
+    async send(sendTransaction) {
+        const nonce = await this.allocate();
         try {
-            const request = JSON.parse(data.toString());
-            const { action, payload } = request;
-
-            let result;
-            const decimalEVM = await getDecimalEVM(payload.wallet_id);
-            const subgraph = await getSubgraph();
-
-            switch (action) {
-                // Wallet Management
-                case 'create_wallet':
-                    const { mnemonic: encryptedMnemonic, wallet_id } = payload;
-                    if (!encryptedMnemonic || !wallet_id) throw new Error('Не указан wallet_id или mnemonic');
-
-                    const mnemonic = fernet.decrypt(decode(encryptedMnemonic)).toString();
-                    const bip39 = require('bip39');
-                    if (!bip39.validateMnemonic(mnemonic)) {
-                        throw new Error('❌ Неверная мнемоника');
-                    }
-
-                    tempWallets[wallet_id] = new Wallet(mnemonic);
-                    result = { success: true, wallet_id, address: tempWallets[wallet_id].evmAddress };
-                    break;
-
-                // DEL Operations
-                case 'send_del':
-                    const amountToSend = decimalEVM.parseEther(payload.amount);
-                    result = await decimalEVM.sendDEL(payload.to, amountToSend);
-                    break;
-
-                case 'burn_del':
-                    const amountToBurn = decimalEVM.parseEther(payload.amount);
-                    result = await decimalEVM.burnDEL(amountToBurn);
-                    break;
-
-                // Token Operations
-                case 'create_token':
-                    const tokenParams = {
-                        creator: tempWallets[payload.wallet_id].evmAddress,
-                        symbol: payload.symbol,
-                        name: payload.name,
-                        crr: payload.crr,
-                        initialMint: decimalEVM.parseEther(payload.initialMint),
-                        minTotalSupply: decimalEVM.parseEther(payload.minTotalSupply),
-                        maxTotalSupply: decimalEVM.parseEther(payload.maxTotalSupply),
-                        identity: payload.identity
-                    };
-                    const commission = calculateTokenCommission(payload.symbol);
-                    const reserve = decimalEVM.parseEther(Number(payload.initialMint) + commission);
-                    result = await decimalEVM.createToken(tokenParams, reserve);
-                    break;
-
-                case 'create_token_reserveless':
-                    const reservelessParams = {
-                        name: payload.name,
-                        symbol: payload.symbol,
-                        mintable: payload.mintable,
-                        burnable: payload.burnable,
-                        initialMint: decimalEVM.parseEther(payload.initialMint),
-                        cap: payload.cap ? decimalEVM.parseEther(payload.cap) : undefined,
-                        identity: payload.identity
-                    };
-                    result = await decimalEVM.createTokenReserveless(
-                        reservelessParams.name,
-                        reservelessParams.symbol,
-                        reservelessParams.mintable,
-                        reservelessParams.burnable,
-                        reservelessParams.initialMint,
-                        reservelessParams.cap,
-                        reservelessParams.identity
-                    );
-                    break;
-
-                case 'convert_to_del':
-                    const convertAmount = decimalEVM.parseEther(payload.amount);
-                    const estimateGas = decimalEVM.parseEther(payload.estimateGas);
-                    const signConvert = await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.gasCenterAddress, convertAmount);
-                    result = await decimalEVM.convertToDEL(
-                        tempWallets[payload.wallet_id].evmAddress,
-                        payload.tokenAddress,
-                        convertAmount,
-                        estimateGas,
-                        signConvert
-                    );
-                    break;
-
-                case 'approve_token':
-                    result = await decimalEVM.approveToken(payload.tokenAddress, payload.spender, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'transfer_token':
-                    result = await decimalEVM.transferToken(payload.tokenAddress, payload.to, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'transfer_from_token':
-                    result = await decimalEVM.transferFromToken(payload.tokenAddress, payload.from, payload.to, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'burn_token':
-                    result = await decimalEVM.burnToken(payload.tokenAddress, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'buy_token_for_exact_del':
-                    const buyDelAmount = decimalEVM.parseEther(payload.amountDel);
-                    const amountOutMin = await decimalEVM.calculateBuyOutput(payload.tokenAddress, buyDelAmount);
-                    result = await decimalEVM.buyTokenForExactDEL(payload.tokenAddress, buyDelAmount, amountOutMin, payload.recipient);
-                    break;
-
-                case 'buy_exact_token_for_del':
-                    const buyTokenAmount = decimalEVM.parseEther(payload.amountOut);
-                    const amountDel = await decimalEVM.calculateBuyInput(payload.tokenAddress, buyTokenAmount);
-                    result = await decimalEVM.buyExactTokenForDEL(payload.tokenAddress, amountDel, buyTokenAmount, payload.recipient);
-                    break;
-
-                case 'sell_tokens_for_exact_del':
-                    const sellDelAmount = decimalEVM.parseEther(payload.amountOut);
-                    const amountInMax = await decimalEVM.calculateSellInput(payload.tokenAddress, sellDelAmount);
-                    result = await decimalEVM.sellTokensForExactDEL(payload.tokenAddress, sellDelAmount, amountInMax, payload.recipient);
-                    break;
-
-                case 'sell_exact_tokens_for_del':
-                    const sellTokenAmount = decimalEVM.parseEther(payload.amountIn);
-                    const amountOutMinSell = await decimalEVM.calculateSellOutput(payload.tokenAddress, sellTokenAmount);
-                    result = await decimalEVM.sellExactTokensForDEL(payload.tokenAddress, sellTokenAmount, amountOutMinSell, payload.recipient);
-                    break;
-
-                case 'convert_token':
-                    const convertTokenAmount = decimalEVM.parseEther(payload.amountIn);
-                    const futureDEL = await decimalEVM.calculateSellOutput(payload.tokenAddress1, convertTokenAmount);
-                    const amountOutMinConvert = await decimalEVM.calculateBuyOutput(payload.tokenAddress2, futureDEL);
-                    const signConvertToken = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress1, payload.tokenCenterAddress, convertTokenAmount);
-                    result = await decimalEVM.convertToken(
-                        payload.tokenAddress1,
-                        payload.tokenAddress2,
-                        convertTokenAmount,
-                        amountOutMinConvert,
-                        payload.recipient,
-                        signConvertToken
-                    );
-                    break;
-
-                case 'permit_token':
-                    const signPermit = await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.spender, decimalEVM.parseEther(payload.amount));
-                    result = await decimalEVM.permitToken(payload.tokenAddress, payload.owner, payload.spender, decimalEVM.parseEther(payload.amount), signPermit);
-                    break;
-
-                case 'update_token_identity':
-                    result = await decimalEVM.updateTokenIdentity(payload.tokenAddress, payload.newIdentity);
-                    break;
-
-                case 'update_token_max_supply':
-                    result = await decimalEVM.updateTokenMaxTotalSupply(payload.tokenAddress, decimalEVM.parseEther(payload.newMaxTotalSupply));
-                    break;
-
-                case 'update_token_min_supply':
-                    result = await decimalEVM.updateTokenMinTotalSupply(payload.tokenAddress, decimalEVM.parseEther(payload.newMinTotalSupply));
-                    break;
-
-                // NFT Operations
-                case 'create_nft_collection':
-                    const nftParams = {
-                        creator: tempWallets[payload.wallet_id].evmAddress,
-                        symbol: payload.symbol,
-                        name: payload.name,
-                        contractURI: payload.contractURI,
-                        refundable: payload.refundable,
-                        allowMint: payload.allowMint
-                    };
-                    if (payload.reserveless) {
-                        if (payload.type === 'DRC721') {
-                            result = await decimalEVM.createCollectionDRC721Reserveless(nftParams);
-                        } else {
-                            result = await decimalEVM.createCollectionDRC1155Reserveless(nftParams);
-                        }
-                    } else {
-                        if (payload.type === 'DRC721') {
-                            result = await decimalEVM.createCollectionDRC721(nftParams);
-                        } else {
-                            result = await decimalEVM.createCollectionDRC1155(nftParams);
-                        }
-                    }
-                    break;
-
-                case 'mint_nft':
-                    if (payload.reserveless) {
-                        if (payload.type === 'DRC721') {
-                            result = await decimalEVM.mintNFT(payload.nftCollectionAddress, payload.to, payload.tokenURI);
-                        } else {
-                            result = await decimalEVM.mintNFT(payload.nftCollectionAddress, payload.to, payload.tokenURI, payload.tokenId, payload.amount);
-                        }
-                    } else if (payload.reserveType === 'DEL') {
-                        const reserve = decimalEVM.parseEther(payload.reserve);
-                        if (payload.type === 'DRC721') {
-                            result = await decimalEVM.mintNFTWithDELReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve);
-                        } else {
-                            result = await decimalEVM.mintNFTWithDELReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve, payload.tokenId, payload.amount);
-                        }
-                    } else {
-                        const reserve = decimalEVM.parseEther(payload.reserve);
-                        const signMint = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.nftCollectionAddress, reserve);
-                        if (payload.type === 'DRC721') {
-                            result = await decimalEVM.mintNFTWithTokenReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve, payload.tokenAddress, signMint);
-                        } else {
-                            result = await decimalEVM.mintNFTWithTokenReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve, payload.tokenAddress, signMint, payload.tokenId, payload.amount);
-                        }
-                    }
-                    break;
-
-                case 'add_del_reserve_nft':
-                    result = await decimalEVM.addDELReserveNFT(payload.nftCollectionAddress, payload.tokenId, decimalEVM.parseEther(payload.reserve));
-                    break;
-
-                case 'add_token_reserve_nft':
-                    const reserveAdd = decimalEVM.parseEther(payload.reserve);
-                    const signAdd = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.nftCollectionAddress, reserveAdd);
-                    result = await decimalEVM.addTokenReserveNFT(payload.nftCollectionAddress, payload.tokenId, reserveAdd, signAdd);
-                    break;
-
-                case 'transfer_nft':
-                    if (payload.type === 'DRC721') {
-                        result = await decimalEVM.transferNFT(payload.nftCollectionAddress, payload.from, payload.to, payload.tokenId);
-                    } else {
-                        result = await decimalEVM.transferNFT(payload.nftCollectionAddress, payload.from, payload.to, payload.tokenId, payload.amount);
-                    }
-                    break;
-
-                case 'transfer_batch_nft1155':
-                    result = await decimalEVM.transferBatchNFT1155(payload.nftCollectionAddress, payload.from, payload.to, payload.tokenIds, payload.amounts);
-                    break;
-
-                case 'disable_mint_nft':
-                    result = await decimalEVM.disableMintNFT(payload.nftCollectionAddress);
-                    break;
-
-                case 'burn_nft':
-                    if (payload.type === 'DRC721') {
-                        result = await decimalEVM.burnNFT(payload.nftCollectionAddress, payload.tokenId);
-                    } else {
-                        result = await decimalEVM.burnNFT(payload.nftCollectionAddress, payload.tokenId, payload.amount);
-                    }
-                    break;
-
-                case 'set_token_uri_nft':
-                    result = await decimalEVM.setTokenURINFT(payload.nftCollectionAddress, payload.tokenId, payload.tokenURI);
-                    break;
-
-                case 'approve_nft721':
-                    result = await decimalEVM.approveNFT721(payload.nftCollectionAddress, payload.to, payload.tokenId);
-                    break;
-
-                case 'approve_for_all_nft':
-                    result = await decimalEVM.approveForAllNFT(payload.nftCollectionAddress, payload.to, payload.approved);
-                    break;
-
-                // Delegation Operations
-                case 'delegate_del':
-                    const amountDelegate = decimalEVM.parseEther(payload.amount);
-                    if (payload.days > 0) {
-                        const latestBlock = await decimalEVM.getLatestBlock();
-                        const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
-                        result = await decimalEVM.delegateDELHold(payload.validator, amountDelegate, holdTimestamp);
-                    } else {
-                        result = await decimalEVM.delegateDEL(payload.validator, amountDelegate);
-                    }
-                    break;
-
-                case 'delegate_token':
-                    const amountToken = decimalEVM.parseEther(payload.amount);
-                    const delegationAddress = await decimalEVM.getDecimalContractAddress('delegation');
-                    const signDelegate = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, delegationAddress, amountToken);
-                    if (payload.days > 0) {
-                        const latestBlock = await decimalEVM.getLatestBlock();
-                        const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
-                        result = await decimalEVM.delegateTokenHold(payload.validator, payload.tokenAddress, amountToken, holdTimestamp, signDelegate);
-                    } else {
-                        result = await decimalEVM.delegateToken(payload.validator, payload.tokenAddress, amountToken, signDelegate);
-                    }
-                    break;
-
-                case 'delegate_nft':
-                    const delegationNftAddress = await decimalEVM.getDecimalContractAddress('delegation-nft');
-                    const signDelegateNFT = payload.sign ? payload.sign : payload.type === 'DRC721'
-                        ? await decimalEVM.getSignPermitDRC721(payload.nftCollectionAddress, delegationNftAddress, payload.tokenId)
-                        : await decimalEVM.getSignPermitDRC1155(payload.nftCollectionAddress, delegationNftAddress);
-                    if (payload.type === 'DRC721') {
-                        if (payload.days > 0) {
-                            const latestBlock = await decimalEVM.getLatestBlock();
-                            const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
-                            result = await decimalEVM.delegateDRC721Hold(payload.validator, payload.nftCollectionAddress, payload.tokenId, holdTimestamp, signDelegateNFT);
-                        } else {
-                            result = await decimalEVM.delegateDRC721(payload.validator, payload.nftCollectionAddress, payload.tokenId, signDelegateNFT);
-                        }
-                    } else {
-                        if (payload.days > 0) {
-                            const latestBlock = await decimalEVM.getLatestBlock();
-                            const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
-                            result = await decimalEVM.delegateDRC1155Hold(payload.validator, payload.nftCollectionAddress, payload.tokenId, payload.amount, holdTimestamp, signDelegateNFT);
-                        } else {
-                            result = await decimalEVM.delegateDRC1155(payload.validator, payload.nftCollectionAddress, payload.tokenId, payload.amount, signDelegateNFT);
-                        }
-                    }
-                    break;
-
-                case 'transfer_stake_token':
-                    if (payload.holdTimestamp) {
-                        result = await decimalEVM.transferStakeTokenHold(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.holdTimestamp, payload.newValidator);
-                    } else {
-                        result = await decimalEVM.transferStakeToken(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.newValidator);
-                    }
-                    break;
-
-                case 'withdraw_stake_token':
-                    result = await decimalEVM.withdrawStakeToken(payload.validator, payload.token, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'stake_token_to_hold':
-                    const latestBlock = await decimalEVM.getLatestBlock();
-                    const newHoldTimestamp = latestBlock.timestamp + payload.days * 86400;
-                    result = await decimalEVM.stakeTokenToHold(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.oldHoldTimestamp, newHoldTimestamp);
-                    break;
-
-                case 'stake_token_reset_hold':
-                    result = await decimalEVM.stakeTokenResetHold(payload.validator, payload.delegator, payload.token, payload.holdTimestamp);
-                    break;
-
-                case 'stake_token_reset_hold_del':
-                    result = await decimalEVM.stakeTokenResetHoldDEL(payload.validator, payload.delegator, payload.holdTimestamp);
-                    break;
-
-                case 'withdraw_token_with_reset':
-                    result = await decimalEVM.withdrawTokenWithReset(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.holdTimestamps);
-                    break;
-
-                case 'transfer_token_with_reset':
-                    result = await decimalEVM.transferTokenWithReset(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.newValidator, payload.holdTimestamps);
-                    break;
-
-                case 'hold_token_with_reset':
-                    const holdLatestBlock = await decimalEVM.getLatestBlock();
-                    const newHoldTimestampToken = holdLatestBlock.timestamp + payload.days * 86400;
-                    result = await decimalEVM.holdTokenWithReset(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), newHoldTimestampToken, payload.holdTimestamps);
-                    break;
-
-                case 'apply_penalty_to_stake_token':
-                    result = await decimalEVM.applyPenaltyToStakeToken(payload.validator, payload.delegator, payload.token);
-                    break;
-
-                case 'apply_penalties_to_stake_token':
-                    result = await decimalEVM.applyPenaltiesToStakeToken(payload.validator, payload.delegator, payload.token);
-                    break;
-
-                case 'complete_stake_token':
-                    result = await decimalEVM.completeStakeToken(payload.stakeIndexes);
-                    break;
-
-                case 'transfer_stake_nft':
-                    if (payload.holdTimestamp) {
-                        result = await decimalEVM.transferStakeNFTHold(payload.validator, payload.token, payload.tokenId, payload.amount, payload.newValidator, payload.holdTimestamp);
-                    } else {
-                        result = await decimalEVM.transferStakeNFT(payload.validator, payload.token, payload.tokenId, payload.amount, payload.newValidator);
-                    }
-                    break;
-
-                case 'withdraw_stake_nft':
-                    if (payload.holdTimestamp) {
-                        result = await decimalEVM.withdrawStakeNFTHold(payload.validator, payload.token, payload.tokenId, payload.amount, payload.holdTimestamp);
-                    } else {
-                        result = await decimalEVM.withdrawStakeNFT(payload.validator, payload.token, payload.tokenId, payload.amount);
-                    }
-                    break;
-
-                case 'stake_nft_to_hold':
-                    const nftLatestBlock = await decimalEVM.getLatestBlock();
-                    const newHoldTimestampNFT = nftLatestBlock.timestamp + payload.days * 86400;
-                    result = await decimalEVM.stakeNFTToHold(payload.validator, payload.token, payload.tokenId, payload.amount, payload.oldHoldTimestamp, newHoldTimestampNFT);
-                    break;
-
-                case 'stake_nft_reset_hold':
-                    result = await decimalEVM.stakeNFTResetHold(payload.validator, payload.delegator, payload.token, payload.tokenId, payload.holdTimestamp);
-                    break;
-
-                case 'withdraw_nft_with_reset':
-                    result = await decimalEVM.withdrawNFTWithReset(payload.validator, payload.token, payload.tokenId, payload.amount, payload.holdTimestamps);
-                    break;
-
-                case 'transfer_nft_with_reset':
-                    result = await decimalEVM.transferNFTWithReset(payload.validator, payload.token, payload.tokenId, payload.amount, payload.newValidator, payload.holdTimestamps);
-                    break;
-
-                case 'hold_nft_with_reset':
-                    const nftHoldLatestBlock = await decimalEVM.getLatestBlock();
-                    const newHoldTimestampNFTHold = nftHoldLatestBlock.timestamp + payload.days * 86400;
-                    result = await decimalEVM.holdNFTWithReset(payload.validator, payload.token, payload.tokenId, payload.amount, newHoldTimestampNFTHold, payload.holdTimestamps);
-                    break;
-
-                case 'complete_stake_nft':
-                    result = await decimalEVM.completeStakeNFT(payload.stakeIndexes);
-                    break;
-
-                // Validator Operations
-                case 'add_validator_with_del':
-                    const validatorParams = {
-                        operator_address: tempWallets[payload.wallet_id].evmAddress,
-                        reward_address: payload.reward_address,
-                        consensus_pubkey: Buffer.from(tempWallets[payload.wallet_id].getPublicKey().key.buffer).toString('base64'),
-                        description: payload.description,
-                        commission: payload.commission
-                    };
-                    result = await decimalEVM.addValidatorWithETH(validatorParams, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'add_validator_with_token':
-                    const validatorTokenParams = {
-                        operator_address: tempWallets[payload.wallet_id].evmAddress,
-                        reward_address: payload.reward_address,
-                        consensus_pubkey: Buffer.from(tempWallets[payload.wallet_id].getPublicKey().key.buffer).toString('base64'),
-                        description: payload.description,
-                        commission: payload.commission
-                    };
-                    const stakeValidator = {
-                        token: payload.tokenAddress,
-                        amount: decimalEVM.parseEther(payload.amount)
-                    };
-                    const masterValidatorAddress = await decimalEVM.getDecimalContractAddress('master-validator');
-                    const signValidator = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, masterValidatorAddress, stakeValidator.amount);
-                    result = await decimalEVM.addValidatorWithToken(validatorTokenParams, stakeValidator, signValidator);
-                    break;
-
-                case 'pause_validator':
-                    result = await decimalEVM.pauseValidator(payload.validator);
-                    break;
-
-                case 'unpause_validator':
-                    result = await decimalEVM.unpauseValidator(payload.validator);
-                    break;
-
-                case 'update_validator_meta':
-                    const validatorMeta = {
-                        operator_address: tempWallets[payload.wallet_id].evmAddress,
-                        reward_address: payload.reward_address,
-                        consensus_pubkey: Buffer.from(tempWallets[payload.wallet_id].getPublicKey().key.buffer).toString('base64'),
-                        description: payload.description,
-                        commission: payload.commission
-                    };
-                    result = await decimalEVM.updateValidatorMeta(validatorMeta);
-                    break;
-
-                // Multicall Operations
-                case 'multi_send_token':
-                    result = await decimalEVM.multiSendToken(payload.data, payload.memo);
-                    break;
-
-                case 'multi_call':
-                    result = await decimalEVM.multiCall(payload.callDatas);
-                    break;
-
-                // MultiSig Operations
-                case 'create_multisig':
-                    result = await decimalEVM.multisig.create(payload.ownerData, payload.weightThreshold);
-                    break;
-
-                case 'build_tx_send_del':
-                    result = await decimalEVM.multisig.buildTxSendDEL(payload.multisigAddress, payload.to, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'build_tx_send_token':
-                    result = await decimalEVM.multisig.buildTxSendToken(payload.multisigAddress, payload.tokenAddress, payload.to, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'build_tx_send_nft':
-                    if (payload.type === 'DRC721') {
-                        result = await decimalEVM.multisig.buildTxSendNFT(payload.multisigAddress, payload.tokenAddress, payload.to, payload.tokenId);
-                    } else {
-                        result = await decimalEVM.multisig.buildTxSendNFT(payload.multisigAddress, payload.tokenAddress, payload.to, payload.tokenId, payload.amount);
-                    }
-                    break;
-
-                case 'sign_multisig_tx':
-                    result = await decimalEVM.multisig.signTx(payload.multisigAddress, payload.safeTx);
-                    break;
-
-                case 'approve_hash_multisig':
-                    result = await decimalEVM.multisig.approveHash(payload.multisigAddress, payload.safeTx);
-                    break;
-
-                case 'execute_multisig_tx':
-                    result = await decimalEVM.multisig.executeTx(payload.multisigAddress, payload.safeTx, payload.signatures);
-                    break;
-
-                case 'get_current_approve_transactions':
-                    result = await decimalEVM.multisig.getCurrentApproveTransactions(payload.multisigAddress);
-                    break;
-
-                case 'get_expired_approve_transactions':
-                    result = await decimalEVM.multisig.getExpiredApproveTransactions(payload.multisigAddress);
-                    break;
-
-                // Bridge Operations
-                case 'bridge_transfer_native':
-                    const serviceFee = await decimalEVM.getBridgeServiceFees(payload.toChainId);
-                    result = await decimalEVM.bridgeTransferNative(
-                        payload.to,
-                        decimalEVM.parseEther(payload.amount),
-                        serviceFee,
-                        payload.fromChainId,
-                        payload.toChainId
-                    );
-                    break;
-
-                case 'bridge_transfer_tokens':
-                    const bridgeAddress = await decimalEVM.getDecimalContractAddress('bridge');
-                    await decimalEVM.approveToken(payload.tokenAddress, bridgeAddress, decimalEVM.parseEther(payload.amount));
-                    const serviceFeeTokens = await decimalEVM.getBridgeServiceFees(payload.toChainId);
-                    result = await decimalEVM.bridgeTransferTokens(
-                        payload.tokenAddress,
-                        payload.to,
-                        decimalEVM.parseEther(payload.amount),
-                        serviceFeeTokens,
-                        payload.fromChainId,
-                        payload.toChainId
-                    );
-                    break;
-
-                case 'bridge_complete_transfer':
-                    result = await decimalEVM.bridgeCompleteTransfer(payload.toChainId, payload.encodedVM, payload.unwrapWETH);
-                    break;
-
-                // Checks Operations
-                case 'create_checks_del':
-                    const latestBlockChecks = await decimalEVM.getLatestBlock();
-                    const dueBlock = latestBlockChecks.number + payload.blockOffset;
-                    const amountWei = decimalEVM.parseEther(payload.amount);
-                    const totalAmount = decimalEVM.parseEther(payload.passwords.length * payload.amount);
-                    result = await decimalEVM.createChecksDEL(payload.passwords, amountWei, dueBlock);
-                    result.totalAmount = totalAmount.toString();
-                    break;
-
-                case 'create_checks_token':
-                    const latestBlockTokenChecks = await decimalEVM.getLatestBlock();
-                    const dueBlockToken = latestBlockTokenChecks.number + payload.blockOffset;
-                    const amountWeiToken = decimalEVM.parseEther(payload.amount);
-                    const totalAmountToken = decimalEVM.parseEther(payload.passwords.length * payload.amount);
-                    const checksAddress = await decimalEVM.getDecimalContractAddress('checks');
-                    const signChecks = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, checksAddress, totalAmountToken);
-                    result = await decimalEVM.createChecksToken(payload.passwords, amountWeiToken, dueBlockToken, payload.tokenAddress, signChecks);
-                    result.totalAmount = totalAmountToken.toString();
-                    break;
-
-                case 'redeem_checks':
-                    result = await decimalEVM.redeemChecks(payload.passwords, payload.checks);
-                    break;
-
-                // Viewing Functions
-                case 'get_balance':
-                    result = { balance: decimalEVM.formatEther(await decimalEVM.getBalance(payload.address)) };
-                    break;
-
-                case 'get_balance_eth':
-                    result = { balance: decimalEVM.formatEther(await decimalEVM.getBalanceETH(payload.address)) };
-                    break;
-
-                case 'get_balance_bnb':
-                    result = { balance: decimalEVM.formatEther(await decimalEVM.getBalanceBNB(payload.address)) };
-                    break;
-
-                case 'check_token_exists':
-                    result = await decimalEVM.checkTokenExists(payload.tokenAddress);
-                    break;
-
-                case 'get_address_token_by_symbol':
-                    result = await decimalEVM.getAddressTokenBySymbol(payload.symbol);
-                    break;
-
-                case 'get_commission_symbol':
-                    result = await decimalEVM.getCommissionSymbol(payload.symbol);
-                    break;
-
-                case 'calculate_buy_output':
-                    result = await decimalEVM.calculateBuyOutput(payload.tokenAddress, decimalEVM.parseEther(payload.amountDel));
-                    break;
-
-                case 'calculate_buy_input':
-                    result = await decimalEVM.calculateBuyInput(payload.tokenAddress, decimalEVM.parseEther(payload.amountTokens));
-                    break;
-
-                case 'calculate_sell_input':
-                    result = await decimalEVM.calculateSellInput(payload.tokenAddress, decimalEVM.parseEther(payload.amountDEL));
-                    break;
-
-                case 'calculate_sell_output':
-                    result = await decimalEVM.calculateSellOutput(payload.tokenAddress, decimalEVM.parseEther(payload.amountTokens));
-                    break;
-
-                case 'get_sign_permit_token':
-                    result = await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.spender, decimalEVM.parseEther(payload.amount));
-                    break;
-
-                case 'allowance_token':
-                    result = await decimalEVM.allowanceToken(payload.tokenAddress, payload.owner, payload.spender);
-                    break;
-
-                case 'balance_of_token':
-                    result = await decimalEVM.balanceOfToken(payload.tokenAddress, payload.account);
-                    break;
-
-                case 'supports_interface_token':
-                    result = await decimalEVM.supportsInterfaceToken(payload.tokenAddress, payload.interfaceId);
-                    break;
-
-                case 'get_nft_type':
-                    result = await decimalEVM.getNftType(payload.nftCollectionAddress);
-                    break;
-
-                case 'get_nft_type_from_contract':
-                    result = await decimalEVM.getNftTypeFromContract(payload.nftCollectionAddress);
-                    break;
-
-                case 'get_approved_nft721':
-                    result = await decimalEVM.getApprovedNFT721(payload.nftCollectionAddress, payload.tokenId);
-                    break;
-
-                case 'is_approved_for_all_nft':
-                    result = await decimalEVM.isApprovedForAllNFT(payload.nftCollectionAddress, payload.owner, payload.spender);
-                    break;
-
-                case 'owner_of_nft721':
-                    result = await decimalEVM.ownerOfNFT721(payload.nftCollectionAddress, payload.tokenId);
-                    break;
-
-                case 'get_token_uri_nft':
-                    result = await decimalEVM.getTokenURINFT(payload.nftCollectionAddress, payload.tokenId);
-                    break;
-
-                case 'get_allow_mint_nft':
-                    result = await decimalEVM.getAllowMintNFT(payload.nftCollectionAddress);
-                    break;
-
-                case 'balance_of_nft':
-                    if (payload.type === 'DRC721') {
-                        result = await decimalEVM.balanceOfNFT(payload.nftCollectionAddress, payload.account);
-                    } else {
-                        result = await decimalEVM.balanceOfNFT(payload.nftCollectionAddress, payload.account, payload.tokenId);
-                    }
-                    break;
-
-                case 'supports_interface_nft':
-                    result = await decimalEVM.supportsInterfaceNFT(payload.nftCollectionAddress, payload.interfaceId);
-                    break;
-
-                case 'get_rate_nft1155':
-                    result = await decimalEVM.getRateNFT1155(payload.nftCollectionAddress, payload.tokenId);
-                    break;
-
-                case 'calc_reserve_nft1155':
-                    result = await decimalEVM.calcReserveNFT1155(payload.nftCollectionAddress, payload.tokenId, payload.quantity);
-                    break;
-
-                case 'get_sign_permit_nft':
-                    if (payload.type === 'DRC721') {
-                        result = await decimalEVM.getSignPermitDRC721(payload.nftCollectionAddress, payload.spender, payload.tokenId);
-                    } else {
-                        result = await decimalEVM.getSignPermitDRC1155(payload.nftCollectionAddress, payload.spender);
-                    }
-                    break;
-
-                case 'get_reserve_nft':
-                    result = await decimalEVM.getReserveNFT(payload.nftCollectionAddress, payload.tokenId);
-                    break;
-
-                case 'get_refundable_nft':
-                    result = await decimalEVM.getRefundableNFT(payload.nftCollectionAddress);
-                    break;
-
-                case 'get_supply_nft1155':
-                    result = await decimalEVM.getSupplyNFT1155(payload.nftCollectionAddress, payload.tokenId);
-                    break;
+            const response = await sendTransaction(nonce);
+            this.inFlight.delete(nonce);
+            this.accepted.add(nonce);
+            if (this.accepted.size > this.pruneAt && !this.syncing) {
+                // Замайненные nonce удаляются только при сверке
+                this.sync().catch(() => {});
+            }
+            return response;
+        } catch (err) {
+            // Неизвестно, дошла ли транзакция до узла: состояние сверяется с сетью,
+            // и неиспользованный nonce станет пропуском. Идущая сверка могла просканировать
+            // пропуски до освобождения nonce — тогда после неё запускается новая
+            this.inFlight.delete(nonce);
+            const release = ++this.releases;
+            try {
+                while (this.scanned < release) await this.sync();
+            } catch (syncErr) {
+                this.next = null;
+            }
+            throw err;
+        }
+    }
+
+    state() {
+        return {
+            next: this.next,
+            gaps: [...this.gaps],
+            in_flight: [...this.inFlight].sort((a, b) => a - b),
+            queued: [...this.accepted].sort((a, b) => a - b)
+        };
+    }
+}
 
-                case 'get_token_stakes_page_by_member':
-                    result = await decimalEVM.getTokenStakesPageByMember(payload.account, payload.size, payload.offset);
-                    break;
+// Подписанты ethers внутри DecimalEVM (кошелёк и контракты ссылаются на один объект)
+function findSigners(root, depth = 2, found = new Set()) {
+    if (!root || typeof root !== 'object' || depth < 0) return found;
+    for (const value of Object.values(root)) {
+        if (value && typeof value === 'object') {
+            if (value._isSigner && typeof value.sendTransaction === 'function') {
+                found.add(value);
+            } else {
+                findSigners(value, depth - 1, found);
+            }
+        }
+    }
+    return found;
+}
 
-                case 'get_frozen_stakes_queue_token':
-                    result = await decimalEVM.getFrozenStakesQueueToken();
-                    break;
+function attachNonceManager(walletId, decimalEVM) {
+    const signers = [...findSigners(decimalEVM)];
+    if (signers.length === 0) {
+        console.warn(`⚠️ Подписант не найден, nonce для ${walletId} назначает сеть`);
+        return;
+    }
+    const manager = new NonceManager(signers[0]);
+    for (const signer of signers) {
+        const sendTransaction = signer.sendTransaction.bind(signer);
+        signer.sendTransaction = (transaction) => {
+            if (transaction.nonce != null) return sendTransaction(transaction);
+            return manager.send((nonce) => sendTransaction({ ...transaction, nonce }));
+        };
+    }
+    nonceManagers[walletId] = manager;
+}
 
-                case 'get_freeze_time_token':
-                    result = await decimalEVM.getFreezeTimeToken();
-                    break;
+// Инициализация в фоне: ошибка не теряется, а повторится при первом действии кошелька
+function warmUpWallet(walletId) {
+    getDecimalEVM(walletId).catch((err) => {
+        console.error(`❌ Не удалось подготовить DecimalEVM для ${walletId}:`, err.message);
+    });
+}
 
-                case 'get_stake_token':
-                    result = await decimalEVM.getStakeToken(payload.validator, payload.delegator, payload.tokenAddress);
-                    break;
+// Заранее подключает Subgraph и DecimalEVM кошельков, чтобы первый запрос после
+// запуска не ждал инициализации контрактов
+async function warmUp(walletIds) {
+    const wallets = {};
+    await Promise.all([getSubgraph(), ...walletIds.map(async (walletId) => {
+        try {
+            await getDecimalEVM(walletId);
+            wallets[walletId] = { success: true };
+        } catch (err) {
+            wallets[walletId] = { success: false, error: err.message };
+        }
+    })]);
+    return { wallets };
+}
 
-                case 'get_stake_id_token':
-                    result = await decimalEVM.getStakeIdToken(payload.validator, payload.delegator, payload.tokenAddress);
-                    break;
+// Подключение Subgraph при запуске процесса, до первого запроса
+function warmUpSubgraph() {
+    getSubgraph().catch((err) => {
+        console.error('❌ Не удалось подключить Subgraph:', err.message);
+    });
+}
 
-                case 'get_nft_stakes_page_by_member':
-                    result = await decimalEVM.getNFTStakesPageByMember(payload.account, payload.size, payload.offset);
-                    break;
+async function getSubgraph() {
+    if (subgraphs['mainnet']) return subgraphs['mainnet'];
 
-                case 'get_frozen_stakes_queue_nft':
-                    result = await decimalEVM.getFrozenStakesQueueNFT();
-                    break;
+    subgraphs['mainnet'] = new Subgraph(DecimalNetworks.mainnet);
+    console.log(`✅ Subgraph подключён для mainnet`);
+    return subgraphs['mainnet'];
+}
 
-                case 'get_freeze_time_nft':
-                    result = await decimalEVM.getFreezeTimeNFT();
-                    break;
+// Реестр действий. Каждое действие описано обработчиком и свойствами:
+//   evm          — нужен DecimalEVM кошелька (для остальных контракты не инициализируются);
+//   readOnly     — не меняет состояние сети и кошелька;
+//   batch        — может выполняться внутри пакетного запроса;
+//   walletScoped — результат зависит от кошелька запроса;
+//   cacheTtl     — время жизни результата в кэше клиента в секундах (null — без срока),
+//                  действия без cacheTtl не кэшируются.
+// Клиент получает свойства действием describe_actions.
+function defineAction(defaults) {
+    return (options, handler) => {
+        if (typeof options === 'function') [options, handler] = [{}, options];
+        return { ...defaults, ...options, handler };
+    };
+}
 
-                case 'get_validator_status':
-                    result = await decimalEVM.getValidatorStatus(payload.validator);
-                    break;
+// Операции, отправляющие транзакцию от имени кошелька
+const transaction = defineAction({ evm: true, readOnly: false, batch: false, walletScoped: true });
+// Чтение из контрактов через DecimalEVM
+const evmRead = defineAction({ evm: true, readOnly: true, batch: true, walletScoped: false });
+// Чтение из Subgraph
+const subgraphRead = defineAction({ evm: false, readOnly: true, batch: true, walletScoped: false });
+// Служебные действия сервера
+const serviceAction = defineAction({ evm: false, readOnly: false, batch: false, walletScoped: false });
+
+// Ошибка с категорией, которую клиент получает в поле kind ответа
+function actionError(message, kind) {
+    const err = new Error(message);
+    err.kind = kind;
+    return err;
+}
 
-                case 'validator_is_active':
-                    result = await decimalEVM.validatorIsActive(payload.validator);
-                    break;
+const ACTIONS = new Map(Object.entries({
+    // Wallet Management
+    create_wallet: serviceAction(async ({ payload }) => {
+        const { mnemonic: encryptedMnemonic, wallet_id } = payload;
+        if (!encryptedMnemonic || !wallet_id) throw actionError('Не указан wallet_id или mnemonic', 'validation');
 
-                case 'validator_is_member':
-                    result = await decimalEVM.validatorIsMember(payload.validator);
-                    break;
+        const mnemonic = fernet.decrypt(decode(encryptedMnemonic)).toString();
+        const bip39 = require('bip39');
+        if (!bip39.validateMnemonic(mnemonic)) {
+            throw actionError('❌ Неверная мнемоника', 'validation');
+        }
 
-                // Subgraph Operations
-                case 'get_decimal_contracts':
-                    result = await subgraph.getDecimalContracts();
-                    break;
+        const previousWallet = tempWallets[wallet_id];
+        tempWallets[wallet_id] = new Wallet(mnemonic);
+        if (previousWallet && previousWallet.evmAddress !== tempWallets[wallet_id].evmAddress) {
+            // Под тем же wallet_id зарегистрирован другой кошелёк
+            delete decimalEVMs[wallet_id];
+            delete nonceManagers[wallet_id];
+        }
+        if (WARMUP_ON_REGISTER) warmUpWallet(wallet_id);
+        return { success: true, wallet_id, address: tempWallets[wallet_id].evmAddress };
+    }),
+
+    // Warm-up: состояние сети не меняется, ключ идемпотентности не нужен
+    warm_up: serviceAction({ readOnly: true }, ({ payload }) =>
+        warmUp(payload.wallet_ids || Object.keys(tempWallets))),
+
+    // DEL Operations
+    send_del: transaction(async ({ payload, decimalEVM }) => {
+        const amountToSend = decimalEVM.parseEther(payload.amount);
+        return decimalEVM.sendDEL(payload.to, amountToSend);
+    }),
+
+    burn_del: transaction(async ({ payload, decimalEVM }) => {
+        const amountToBurn = decimalEVM.parseEther(payload.amount);
+        return decimalEVM.burnDEL(amountToBurn);
+    }),
+
+    // Token Operations
+    create_token: transaction(async ({ payload, decimalEVM }) => {
+        const tokenParams = {
+            creator: tempWallets[payload.wallet_id].evmAddress,
+            symbol: payload.symbol,
+            name: payload.name,
+            crr: payload.crr,
+            initialMint: decimalEVM.parseEther(payload.initialMint),
+            minTotalSupply: decimalEVM.parseEther(payload.minTotalSupply),
+            maxTotalSupply: decimalEVM.parseEther(payload.maxTotalSupply),
+            identity: payload.identity
+        };
+        const commission = calculateTokenCommission(payload.symbol);
+        const reserve = decimalEVM.parseEther(Number(payload.initialMint) + commission);
+        return decimalEVM.createToken(tokenParams, reserve);
+    }),
+
+    create_token_reserveless: transaction(async ({ payload, decimalEVM }) => {
+        const reservelessParams = {
+            name: payload.name,
+            symbol: payload.symbol,
+            mintable: payload.mintable,
+            burnable: payload.burnable,
+            initialMint: decimalEVM.parseEther(payload.initialMint),
+            cap: payload.cap ? decimalEVM.parseEther(payload.cap) : undefined,
+            identity: payload.identity
+        };
+        return decimalEVM.createTokenReserveless(
+            reservelessParams.name,
+            reservelessParams.symbol,
+            reservelessParams.mintable,
+            reservelessParams.burnable,
+            reservelessParams.initialMint,
+            reservelessParams.cap,
+            reservelessParams.identity
+        );
+    }),
+
+    convert_to_del: transaction(async ({ payload, decimalEVM }) => {
+        const convertAmount = decimalEVM.parseEther(payload.amount);
+        const estimateGas = decimalEVM.parseEther(payload.estimateGas);
+        const signConvert = await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.gasCenterAddress, convertAmount);
+        return decimalEVM.convertToDEL(
+            tempWallets[payload.wallet_id].evmAddress,
+            payload.tokenAddress,
+            convertAmount,
+            estimateGas,
+            signConvert
+        );
+    }),
+
+    approve_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.approveToken(payload.tokenAddress, payload.spender, decimalEVM.parseEther(payload.amount))),
+    transfer_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.transferToken(payload.tokenAddress, payload.to, decimalEVM.parseEther(payload.amount))),
+    transfer_from_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.transferFromToken(payload.tokenAddress, payload.from, payload.to, decimalEVM.parseEther(payload.amount))),
+    burn_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.burnToken(payload.tokenAddress, decimalEVM.parseEther(payload.amount))),
+    buy_token_for_exact_del: transaction(async ({ payload, decimalEVM }) => {
+        const buyDelAmount = decimalEVM.parseEther(payload.amountDel);
+        const amountOutMin = await decimalEVM.calculateBuyOutput(payload.tokenAddress, buyDelAmount);
+        return decimalEVM.buyTokenForExactDEL(payload.tokenAddress, buyDelAmount, amountOutMin, payload.recipient);
+    }),
+
+    buy_exact_token_for_del: transaction(async ({ payload, decimalEVM }) => {
+        const buyTokenAmount = decimalEVM.parseEther(payload.amountOut);
+        const amountDel = await decimalEVM.calculateBuyInput(payload.tokenAddress, buyTokenAmount);
+        return decimalEVM.buyExactTokenForDEL(payload.tokenAddress, amountDel, buyTokenAmount, payload.recipient);
+    }),
+
+    sell_tokens_for_exact_del: transaction(async ({ payload, decimalEVM }) => {
+        const sellDelAmount = decimalEVM.parseEther(payload.amountOut);
+        const amountInMax = await decimalEVM.calculateSellInput(payload.tokenAddress, sellDelAmount);
+        return decimalEVM.sellTokensForExactDEL(payload.tokenAddress, sellDelAmount, amountInMax, payload.recipient);
+    }),
+
+    sell_exact_tokens_for_del: transaction(async ({ payload, decimalEVM }) => {
+        const sellTokenAmount = decimalEVM.parseEther(payload.amountIn);
+        const amountOutMinSell = await decimalEVM.calculateSellOutput(payload.tokenAddress, sellTokenAmount);
+        return decimalEVM.sellExactTokensForDEL(payload.tokenAddress, sellTokenAmount, amountOutMinSell, payload.recipient);
+    }),
+
+    convert_token: transaction(async ({ payload, decimalEVM }) => {
+        const convertTokenAmount = decimalEVM.parseEther(payload.amountIn);
+        const futureDEL = await decimalEVM.calculateSellOutput(payload.tokenAddress1, convertTokenAmount);
+        const amountOutMinConvert = await decimalEVM.calculateBuyOutput(payload.tokenAddress2, futureDEL);
+        const signConvertToken = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress1, payload.tokenCenterAddress, convertTokenAmount);
+        return decimalEVM.convertToken(
+            payload.tokenAddress1,
+            payload.tokenAddress2,
+            convertTokenAmount,
+            amountOutMinConvert,
+            payload.recipient,
+            signConvertToken
+        );
+    }),
+
+    permit_token: transaction(async ({ payload, decimalEVM }) => {
+        const signPermit = await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.spender, decimalEVM.parseEther(payload.amount));
+        return decimalEVM.permitToken(payload.tokenAddress, payload.owner, payload.spender, decimalEVM.parseEther(payload.amount), signPermit);
+    }),
+
+    update_token_identity: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.updateTokenIdentity(payload.tokenAddress, payload.newIdentity)),
+    update_token_max_supply: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.updateTokenMaxTotalSupply(payload.tokenAddress, decimalEVM.parseEther(payload.newMaxTotalSupply))),
+    update_token_min_supply: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.updateTokenMinTotalSupply(payload.tokenAddress, decimalEVM.parseEther(payload.newMinTotalSupply))),
+
+    // NFT Operations
+    create_nft_collection: transaction(async ({ payload, decimalEVM }) => {
+        const nftParams = {
+            creator: tempWallets[payload.wallet_id].evmAddress,
+            symbol: payload.symbol,
+            name: payload.name,
+            contractURI: payload.contractURI,
+            refundable: payload.refundable,
+            allowMint: payload.allowMint
+        };
+        if (payload.reserveless) {
+            if (payload.type === 'DRC721') {
+                return decimalEVM.createCollectionDRC721Reserveless(nftParams);
+            } else {
+                return decimalEVM.createCollectionDRC1155Reserveless(nftParams);
+            }
+        } else {
+            if (payload.type === 'DRC721') {
+                return decimalEVM.createCollectionDRC721(nftParams);
+            } else {
+                return decimalEVM.createCollectionDRC1155(nftParams);
+            }
+        }
+    }),
+
+    mint_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.reserveless) {
+            if (payload.type === 'DRC721') {
+                return decimalEVM.mintNFT(payload.nftCollectionAddress, payload.to, payload.tokenURI);
+            } else {
+                return decimalEVM.mintNFT(payload.nftCollectionAddress, payload.to, payload.tokenURI, payload.tokenId, payload.amount);
+            }
+        } else if (payload.reserveType === 'DEL') {
+            const reserve = decimalEVM.parseEther(payload.reserve);
+            if (payload.type === 'DRC721') {
+                return decimalEVM.mintNFTWithDELReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve);
+            } else {
+                return decimalEVM.mintNFTWithDELReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve, payload.tokenId, payload.amount);
+            }
+        } else {
+            const reserve = decimalEVM.parseEther(payload.reserve);
+            const signMint = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.nftCollectionAddress, reserve);
+            if (payload.type === 'DRC721') {
+                return decimalEVM.mintNFTWithTokenReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve, payload.tokenAddress, signMint);
+            } else {
+                return decimalEVM.mintNFTWithTokenReserve(payload.nftCollectionAddress, payload.to, payload.tokenURI, reserve, payload.tokenAddress, signMint, payload.tokenId, payload.amount);
+            }
+        }
+    }),
+
+    add_del_reserve_nft: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.addDELReserveNFT(payload.nftCollectionAddress, payload.tokenId, decimalEVM.parseEther(payload.reserve))),
+    add_token_reserve_nft: transaction(async ({ payload, decimalEVM }) => {
+        const reserveAdd = decimalEVM.parseEther(payload.reserve);
+        const signAdd = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, payload.nftCollectionAddress, reserveAdd);
+        return decimalEVM.addTokenReserveNFT(payload.nftCollectionAddress, payload.tokenId, reserveAdd, signAdd);
+    }),
+
+    transfer_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.type === 'DRC721') {
+            return decimalEVM.transferNFT(payload.nftCollectionAddress, payload.from, payload.to, payload.tokenId);
+        } else {
+            return decimalEVM.transferNFT(payload.nftCollectionAddress, payload.from, payload.to, payload.tokenId, payload.amount);
+        }
+    }),
+
+    transfer_batch_nft1155: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.transferBatchNFT1155(payload.nftCollectionAddress, payload.from, payload.to, payload.tokenIds, payload.amounts)),
+    disable_mint_nft: transaction(({ payload, decimalEVM }) => decimalEVM.disableMintNFT(payload.nftCollectionAddress)),
+    burn_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.type === 'DRC721') {
+            return decimalEVM.burnNFT(payload.nftCollectionAddress, payload.tokenId);
+        } else {
+            return decimalEVM.burnNFT(payload.nftCollectionAddress, payload.tokenId, payload.amount);
+        }
+    }),
+
+    set_token_uri_nft: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.setTokenURINFT(payload.nftCollectionAddress, payload.tokenId, payload.tokenURI)),
+    approve_nft721: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.approveNFT721(payload.nftCollectionAddress, payload.to, payload.tokenId)),
+    approve_for_all_nft: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.approveForAllNFT(payload.nftCollectionAddress, payload.to, payload.approved)),
+
+    // Delegation Operations
+    delegate_del: transaction(async ({ payload, decimalEVM }) => {
+        const amountDelegate = decimalEVM.parseEther(payload.amount);
+        if (payload.days > 0) {
+            const latestBlock = await decimalEVM.getLatestBlock();
+            const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
+            return decimalEVM.delegateDELHold(payload.validator, amountDelegate, holdTimestamp);
+        } else {
+            return decimalEVM.delegateDEL(payload.validator, amountDelegate);
+        }
+    }),
+
+    delegate_token: transaction(async ({ payload, decimalEVM }) => {
+        const amountToken = decimalEVM.parseEther(payload.amount);
+        const delegationAddress = await decimalEVM.getDecimalContractAddress('delegation');
+        const signDelegate = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, delegationAddress, amountToken);
+        if (payload.days > 0) {
+            const latestBlock = await decimalEVM.getLatestBlock();
+            const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
+            return decimalEVM.delegateTokenHold(payload.validator, payload.tokenAddress, amountToken, holdTimestamp, signDelegate);
+        } else {
+            return decimalEVM.delegateToken(payload.validator, payload.tokenAddress, amountToken, signDelegate);
+        }
+    }),
+
+    delegate_nft: transaction(async ({ payload, decimalEVM }) => {
+        const delegationNftAddress = await decimalEVM.getDecimalContractAddress('delegation-nft');
+        const signDelegateNFT = payload.sign ? payload.sign : payload.type === 'DRC721'
+            ? await decimalEVM.getSignPermitDRC721(payload.nftCollectionAddress, delegationNftAddress, payload.tokenId)
+            : await decimalEVM.getSignPermitDRC1155(payload.nftCollectionAddress, delegationNftAddress);
+        if (payload.type === 'DRC721') {
+            if (payload.days > 0) {
+                const latestBlock = await decimalEVM.getLatestBlock();
+                const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
+                return decimalEVM.delegateDRC721Hold(payload.validator, payload.nftCollectionAddress, payload.tokenId, holdTimestamp, signDelegateNFT);
+            } else {
+                return decimalEVM.delegateDRC721(payload.validator, payload.nftCollectionAddress, payload.tokenId, signDelegateNFT);
+            }
+        } else {
+            if (payload.days > 0) {
+                const latestBlock = await decimalEVM.getLatestBlock();
+                const holdTimestamp = latestBlock.timestamp + payload.days * 86400;
+                return decimalEVM.delegateDRC1155Hold(payload.validator, payload.nftCollectionAddress, payload.tokenId, payload.amount, holdTimestamp, signDelegateNFT);
+            } else {
+                return decimalEVM.delegateDRC1155(payload.validator, payload.nftCollectionAddress, payload.tokenId, payload.amount, signDelegateNFT);
+            }
+        }
+    }),
 
-                case 'get_validators':
-                    result = await subgraph.getValidators();
-                    break;
+    transfer_stake_token: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.holdTimestamp) {
+            return decimalEVM.transferStakeTokenHold(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.holdTimestamp, payload.newValidator);
+        } else {
+            return decimalEVM.transferStakeToken(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.newValidator);
+        }
+    }),
+
+    withdraw_stake_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.withdrawStakeToken(payload.validator, payload.token, decimalEVM.parseEther(payload.amount))),
+    stake_token_to_hold: transaction(async ({ payload, decimalEVM }) => {
+        const latestBlock = await decimalEVM.getLatestBlock();
+        const newHoldTimestamp = latestBlock.timestamp + payload.days * 86400;
+        return decimalEVM.stakeTokenToHold(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.oldHoldTimestamp, newHoldTimestamp);
+    }),
+
+    stake_token_reset_hold: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.stakeTokenResetHold(payload.validator, payload.delegator, payload.token, payload.holdTimestamp)),
+    stake_token_reset_hold_del: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.stakeTokenResetHoldDEL(payload.validator, payload.delegator, payload.holdTimestamp)),
+    withdraw_token_with_reset: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.withdrawTokenWithReset(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.holdTimestamps)),
+    transfer_token_with_reset: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.transferTokenWithReset(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), payload.newValidator, payload.holdTimestamps)),
+    hold_token_with_reset: transaction(async ({ payload, decimalEVM }) => {
+        const holdLatestBlock = await decimalEVM.getLatestBlock();
+        const newHoldTimestampToken = holdLatestBlock.timestamp + payload.days * 86400;
+        return decimalEVM.holdTokenWithReset(payload.validator, payload.token, decimalEVM.parseEther(payload.amount), newHoldTimestampToken, payload.holdTimestamps);
+    }),
+
+    apply_penalty_to_stake_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.applyPenaltyToStakeToken(payload.validator, payload.delegator, payload.token)),
+    apply_penalties_to_stake_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.applyPenaltiesToStakeToken(payload.validator, payload.delegator, payload.token)),
+    complete_stake_token: transaction(({ payload, decimalEVM }) => decimalEVM.completeStakeToken(payload.stakeIndexes)),
+    transfer_stake_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.holdTimestamp) {
+            return decimalEVM.transferStakeNFTHold(payload.validator, payload.token, payload.tokenId, payload.amount, payload.newValidator, payload.holdTimestamp);
+        } else {
+            return decimalEVM.transferStakeNFT(payload.validator, payload.token, payload.tokenId, payload.amount, payload.newValidator);
+        }
+    }),
 
-                case 'get_validator':
-                    result = await subgraph.getValidator(payload.validator);
-                    break;
+    withdraw_stake_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.holdTimestamp) {
+            return decimalEVM.withdrawStakeNFTHold(payload.validator, payload.token, payload.tokenId, payload.amount, payload.holdTimestamp);
+        } else {
+            return decimalEVM.withdrawStakeNFT(payload.validator, payload.token, payload.tokenId, payload.amount);
+        }
+    }),
+
+    stake_nft_to_hold: transaction(async ({ payload, decimalEVM }) => {
+        const nftLatestBlock = await decimalEVM.getLatestBlock();
+        const newHoldTimestampNFT = nftLatestBlock.timestamp + payload.days * 86400;
+        return decimalEVM.stakeNFTToHold(payload.validator, payload.token, payload.tokenId, payload.amount, payload.oldHoldTimestamp, newHoldTimestampNFT);
+    }),
+
+    stake_nft_reset_hold: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.stakeNFTResetHold(payload.validator, payload.delegator, payload.token, payload.tokenId, payload.holdTimestamp)),
+    withdraw_nft_with_reset: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.withdrawNFTWithReset(payload.validator, payload.token, payload.tokenId, payload.amount, payload.holdTimestamps)),
+    transfer_nft_with_reset: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.transferNFTWithReset(payload.validator, payload.token, payload.tokenId, payload.amount, payload.newValidator, payload.holdTimestamps)),
+    hold_nft_with_reset: transaction(async ({ payload, decimalEVM }) => {
+        const nftHoldLatestBlock = await decimalEVM.getLatestBlock();
+        const newHoldTimestampNFTHold = nftHoldLatestBlock.timestamp + payload.days * 86400;
+        return decimalEVM.holdNFTWithReset(payload.validator, payload.token, payload.tokenId, payload.amount, newHoldTimestampNFTHold, payload.holdTimestamps);
+    }),
+
+    complete_stake_nft: transaction(({ payload, decimalEVM }) => decimalEVM.completeStakeNFT(payload.stakeIndexes)),
+
+    // Validator Operations
+    add_validator_with_del: transaction(async ({ payload, decimalEVM }) => {
+        const validatorParams = {
+            operator_address: tempWallets[payload.wallet_id].evmAddress,
+            reward_address: payload.reward_address,
+            consensus_pubkey: Buffer.from(tempWallets[payload.wallet_id].getPublicKey().key.buffer).toString('base64'),
+            description: payload.description,
+            commission: payload.commission
+        };
+        return decimalEVM.addValidatorWithETH(validatorParams, decimalEVM.parseEther(payload.amount));
+    }),
+
+    add_validator_with_token: transaction(async ({ payload, decimalEVM }) => {
+        const validatorTokenParams = {
+            operator_address: tempWallets[payload.wallet_id].evmAddress,
+            reward_address: payload.reward_address,
+            consensus_pubkey: Buffer.from(tempWallets[payload.wallet_id].getPublicKey().key.buffer).toString('base64'),
+            description: payload.description,
+            commission: payload.commission
+        };
+        const stakeValidator = {
+            token: payload.tokenAddress,
+            amount: decimalEVM.parseEther(payload.amount)
+        };
+        const masterValidatorAddress = await decimalEVM.getDecimalContractAddress('master-validator');
+        const signValidator = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, masterValidatorAddress, stakeValidator.amount);
+        return decimalEVM.addValidatorWithToken(validatorTokenParams, stakeValidator, signValidator);
+    }),
+
+    pause_validator: transaction(({ payload, decimalEVM }) => decimalEVM.pauseValidator(payload.validator)),
+    unpause_validator: transaction(({ payload, decimalEVM }) => decimalEVM.unpauseValidator(payload.validator)),
+    update_validator_meta: transaction(async ({ payload, decimalEVM }) => {
+        const validatorMeta = {
+            operator_address: tempWallets[payload.wallet_id].evmAddress,
+            reward_address: payload.reward_address,
+            consensus_pubkey: Buffer.from(tempWallets[payload.wallet_id].getPublicKey().key.buffer).toString('base64'),
+            description: payload.description,
+            commission: payload.commission
+        };
+        return decimalEVM.updateValidatorMeta(validatorMeta);
+    }),
+
+    // Multicall Operations
+    multi_send_token: transaction(({ payload, decimalEVM }) => decimalEVM.multiSendToken(payload.data, payload.memo)),
+    multi_call: transaction(({ payload, decimalEVM }) => decimalEVM.multiCall(payload.callDatas)),
+
+    // MultiSig Operations
+    create_multisig: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.create(payload.ownerData, payload.weightThreshold)),
+    build_tx_send_del: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.buildTxSendDEL(payload.multisigAddress, payload.to, decimalEVM.parseEther(payload.amount))),
+    build_tx_send_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.buildTxSendToken(payload.multisigAddress, payload.tokenAddress, payload.to, decimalEVM.parseEther(payload.amount))),
+    build_tx_send_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.type === 'DRC721') {
+            return decimalEVM.multisig.buildTxSendNFT(payload.multisigAddress, payload.tokenAddress, payload.to, payload.tokenId);
+        } else {
+            return decimalEVM.multisig.buildTxSendNFT(payload.multisigAddress, payload.tokenAddress, payload.to, payload.tokenId, payload.amount);
+        }
+    }),
+
+    sign_multisig_tx: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.signTx(payload.multisigAddress, payload.safeTx)),
+    approve_hash_multisig: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.approveHash(payload.multisigAddress, payload.safeTx)),
+    execute_multisig_tx: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.executeTx(payload.multisigAddress, payload.safeTx, payload.signatures)),
+    get_current_approve_transactions: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.getCurrentApproveTransactions(payload.multisigAddress)),
+    get_expired_approve_transactions: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.multisig.getExpiredApproveTransactions(payload.multisigAddress)),
+
+    // Bridge Operations
+    bridge_transfer_native: transaction(async ({ payload, decimalEVM }) => {
+        const serviceFee = await decimalEVM.getBridgeServiceFees(payload.toChainId);
+        return decimalEVM.bridgeTransferNative(
+            payload.to,
+            decimalEVM.parseEther(payload.amount),
+            serviceFee,
+            payload.fromChainId,
+            payload.toChainId
+        );
+    }),
+
+    bridge_transfer_tokens: transaction(async ({ payload, decimalEVM }) => {
+        const bridgeAddress = await decimalEVM.getDecimalContractAddress('bridge');
+        await decimalEVM.approveToken(payload.tokenAddress, bridgeAddress, decimalEVM.parseEther(payload.amount));
+        const serviceFeeTokens = await decimalEVM.getBridgeServiceFees(payload.toChainId);
+        return decimalEVM.bridgeTransferTokens(
+            payload.tokenAddress,
+            payload.to,
+            decimalEVM.parseEther(payload.amount),
+            serviceFeeTokens,
+            payload.fromChainId,
+            payload.toChainId
+        );
+    }),
+
+    bridge_complete_transfer: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.bridgeCompleteTransfer(payload.toChainId, payload.encodedVM, payload.unwrapWETH)),
+
+    // Checks Operations
+    create_checks_del: transaction(async ({ payload, decimalEVM }) => {
+        let result;
+        const latestBlockChecks = await decimalEVM.getLatestBlock();
+        const dueBlock = latestBlockChecks.number + payload.blockOffset;
+        const amountWei = decimalEVM.parseEther(payload.amount);
+        const totalAmount = decimalEVM.parseEther(payload.passwords.length * payload.amount);
+        result = await decimalEVM.createChecksDEL(payload.passwords, amountWei, dueBlock);
+        result.totalAmount = totalAmount.toString();
+        return result;
+    }),
+
+    create_checks_token: transaction(async ({ payload, decimalEVM }) => {
+        let result;
+        const latestBlockTokenChecks = await decimalEVM.getLatestBlock();
+        const dueBlockToken = latestBlockTokenChecks.number + payload.blockOffset;
+        const amountWeiToken = decimalEVM.parseEther(payload.amount);
+        const totalAmountToken = decimalEVM.parseEther(payload.passwords.length * payload.amount);
+        const checksAddress = await decimalEVM.getDecimalContractAddress('checks');
+        const signChecks = payload.sign ? payload.sign : await decimalEVM.getSignPermitToken(payload.tokenAddress, checksAddress, totalAmountToken);
+        result = await decimalEVM.createChecksToken(payload.passwords, amountWeiToken, dueBlockToken, payload.tokenAddress, signChecks);
+        result.totalAmount = totalAmountToken.toString();
+        return result;
+    }),
+
+    redeem_checks: transaction(({ payload, decimalEVM }) => decimalEVM.redeemChecks(payload.passwords, payload.checks)),
+
+    // Viewing Functions
+    get_balance: evmRead(async ({ payload, decimalEVM }) =>
+        ({ balance: decimalEVM.formatEther(await decimalEVM.getBalance(payload.address)) })),
+    get_balance_eth: evmRead(async ({ payload, decimalEVM }) =>
+        ({ balance: decimalEVM.formatEther(await decimalEVM.getBalanceETH(payload.address)) })),
+    get_balance_bnb: evmRead(async ({ payload, decimalEVM }) =>
+        ({ balance: decimalEVM.formatEther(await decimalEVM.getBalanceBNB(payload.address)) })),
+    check_token_exists: evmRead(({ payload, decimalEVM }) => decimalEVM.checkTokenExists(payload.tokenAddress)),
+    get_address_token_by_symbol: evmRead({ cacheTtl: 3600 }, ({ payload, decimalEVM }) =>
+        decimalEVM.getAddressTokenBySymbol(payload.symbol)),
+    get_commission_symbol: evmRead({ cacheTtl: 300 }, ({ payload, decimalEVM }) =>
+        decimalEVM.getCommissionSymbol(payload.symbol)),
+    calculate_buy_output: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.calculateBuyOutput(payload.tokenAddress, decimalEVM.parseEther(payload.amountDel))),
+    calculate_buy_input: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.calculateBuyInput(payload.tokenAddress, decimalEVM.parseEther(payload.amountTokens))),
+    calculate_sell_input: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.calculateSellInput(payload.tokenAddress, decimalEVM.parseEther(payload.amountDEL))),
+    calculate_sell_output: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.calculateSellOutput(payload.tokenAddress, decimalEVM.parseEther(payload.amountTokens))),
+    get_sign_permit_token: transaction(({ payload, decimalEVM }) =>
+        decimalEVM.getSignPermitToken(payload.tokenAddress, payload.spender, decimalEVM.parseEther(payload.amount))),
+    allowance_token: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.allowanceToken(payload.tokenAddress, payload.owner, payload.spender)),
+    balance_of_token: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.balanceOfToken(payload.tokenAddress, payload.account)),
+    supports_interface_token: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.supportsInterfaceToken(payload.tokenAddress, payload.interfaceId)),
+    get_nft_type: evmRead({ cacheTtl: null }, ({ payload, decimalEVM }) =>
+        decimalEVM.getNftType(payload.nftCollectionAddress)),
+    get_nft_type_from_contract: evmRead({ cacheTtl: null }, ({ payload, decimalEVM }) =>
+        decimalEVM.getNftTypeFromContract(payload.nftCollectionAddress)),
+    get_approved_nft721: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getApprovedNFT721(payload.nftCollectionAddress, payload.tokenId)),
+    is_approved_for_all_nft: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.isApprovedForAllNFT(payload.nftCollectionAddress, payload.owner, payload.spender)),
+    owner_of_nft721: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.ownerOfNFT721(payload.nftCollectionAddress, payload.tokenId)),
+    get_token_uri_nft: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getTokenURINFT(payload.nftCollectionAddress, payload.tokenId)),
+    get_allow_mint_nft: evmRead(({ payload, decimalEVM }) => decimalEVM.getAllowMintNFT(payload.nftCollectionAddress)),
+    balance_of_nft: evmRead(async ({ payload, decimalEVM }) => {
+        if (payload.type === 'DRC721') {
+            return decimalEVM.balanceOfNFT(payload.nftCollectionAddress, payload.account);
+        } else {
+            return decimalEVM.balanceOfNFT(payload.nftCollectionAddress, payload.account, payload.tokenId);
+        }
+    }),
+
+    supports_interface_nft: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.supportsInterfaceNFT(payload.nftCollectionAddress, payload.interfaceId)),
+    get_rate_nft1155: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getRateNFT1155(payload.nftCollectionAddress, payload.tokenId)),
+    calc_reserve_nft1155: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.calcReserveNFT1155(payload.nftCollectionAddress, payload.tokenId, payload.quantity)),
+    get_sign_permit_nft: transaction(async ({ payload, decimalEVM }) => {
+        if (payload.type === 'DRC721') {
+            return decimalEVM.getSignPermitDRC721(payload.nftCollectionAddress, payload.spender, payload.tokenId);
+        } else {
+            return decimalEVM.getSignPermitDRC1155(payload.nftCollectionAddress, payload.spender);
+        }
+    }),
+
+    get_reserve_nft: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getReserveNFT(payload.nftCollectionAddress, payload.tokenId)),
+    get_refundable_nft: evmRead({ cacheTtl: null }, ({ payload, decimalEVM }) =>
+        decimalEVM.getRefundableNFT(payload.nftCollectionAddress)),
+    get_supply_nft1155: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getSupplyNFT1155(payload.nftCollectionAddress, payload.tokenId)),
+    get_token_stakes_page_by_member: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getTokenStakesPageByMember(payload.account, payload.size, payload.offset)),
+    get_frozen_stakes_queue_token: evmRead(({ decimalEVM }) => decimalEVM.getFrozenStakesQueueToken()),
+    get_freeze_time_token: evmRead({ cacheTtl: 3600 }, ({ decimalEVM }) => decimalEVM.getFreezeTimeToken()),
+    get_stake_token: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getStakeToken(payload.validator, payload.delegator, payload.tokenAddress)),
+    get_stake_id_token: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getStakeIdToken(payload.validator, payload.delegator, payload.tokenAddress)),
+    get_nft_stakes_page_by_member: evmRead(({ payload, decimalEVM }) =>
+        decimalEVM.getNFTStakesPageByMember(payload.account, payload.size, payload.offset)),
+    get_frozen_stakes_queue_nft: evmRead(({ decimalEVM }) => decimalEVM.getFrozenStakesQueueNFT()),
+    get_freeze_time_nft: evmRead({ cacheTtl: 3600 }, ({ decimalEVM }) => decimalEVM.getFreezeTimeNFT()),
+    get_validator_status: evmRead(({ payload, decimalEVM }) => decimalEVM.getValidatorStatus(payload.validator)),
+    validator_is_active: evmRead(({ payload, decimalEVM }) => decimalEVM.validatorIsActive(payload.validator)),
+    validator_is_member: evmRead(({ payload, decimalEVM }) => decimalEVM.validatorIsMember(payload.validator)),
+
+    // Subgraph Operations
+    get_decimal_contracts: subgraphRead({ cacheTtl: 3600 }, ({ subgraph }) => subgraph.getDecimalContracts()),
+    get_validators: subgraphRead(({ subgraph }) => subgraph.getValidators()),
+    get_validator: subgraphRead(({ payload, subgraph }) => subgraph.getValidator(payload.validator)),
+    get_validator_penalties: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getValidatorPenalties(payload.validator, payload.first, payload.skip)),
+    get_validator_penalties_from_block: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getValidatorPenaltiesFromBlock(payload.validator, payload.blockNumber, payload.first, payload.skip)),
+    get_sum_amount_to_penalty: subgraphRead(({ subgraph }) => subgraph.getSumAmountToPenalty()),
+    get_tokens: subgraphRead(({ payload, subgraph }) => subgraph.getTokens(payload.first, payload.skip)),
+    get_tokens_by_owner: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getTokensByOwner(payload.owner, payload.first, payload.skip)),
+    get_token_by_symbol: subgraphRead({ cacheTtl: 30 }, ({ payload, subgraph }) =>
+        subgraph.getTokenBySymbol(payload.symbol)),
+    get_token_by_address: subgraphRead({ cacheTtl: 30 }, ({ payload, subgraph }) =>
+        subgraph.getTokenByAddress(payload.tokenAddress)),
+    get_address_balances: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getAddressBalances(payload.account, payload.first, payload.skip)),
+    get_stakes: subgraphRead(({ payload, subgraph }) => subgraph.getStakes(payload.first, payload.skip)),
+    get_stakes_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getStakesByAddress(payload.delegator, payload.first, payload.skip)),
+    get_stakes_by_validator: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getStakesByValidotor(payload.validator, payload.first, payload.skip)),
+    get_transfer_stakes: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getTransferStakes(payload.first, payload.skip)),
+    get_transfer_stakes_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getTransferStakesByAddress(payload.delegator, payload.first, payload.skip)),
+    get_withdraw_stakes: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getWithdrawStakes(payload.first, payload.skip)),
+    get_withdraw_stakes_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getWithdrawStakesByAddress(payload.delegator, payload.first, payload.skip)),
+    get_nft_collections: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNftCollections(payload.first, payload.skip)),
+    get_nft_collections_by_creator: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNftCollectionsByCreator(payload.owner, payload.first, payload.skip)),
+    get_nft_collection_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNftCollectionByAddress(payload.nftCollectionAddress)),
+    get_nft_collection_type: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNftCollectionType(payload.nftCollectionAddress)),
+    get_nfts: subgraphRead(({ payload, subgraph }) => subgraph.getNfts(payload.first, payload.skip)),
+    get_nfts_by_collection: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNftsByCollection(payload.nftCollectionAddress, payload.first, payload.skip)),
+    get_address_balances_nfts: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getAddressBalancesNfts(payload.account, payload.first, payload.skip)),
+    get_address_balances_nfts_by_collection: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getAddressBalancesNftsByCollection(payload.account, payload.nftCollectionAddress, payload.first, payload.skip)),
+    get_nft_by_collection_and_token_id: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNftByCollectionAndTokenId(payload.nftCollectionAddress, payload.tokenId)),
+    get_nft_stakes: subgraphRead(({ payload, subgraph }) => subgraph.getNFTStakes(payload.first, payload.skip)),
+    get_nft_stakes_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNFTStakesByAddress(payload.account, payload.first, payload.skip)),
+    get_nft_stakes_by_validator: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getNFTStakesByValidotor(payload.validator, payload.first, payload.skip)),
+    get_transfer_nft_stakes: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getTransferNFTStakes(payload.first, payload.skip)),
+    get_transfer_nft_stakes_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getTransferNFTStakesByAddress(payload.account, payload.first, payload.skip)),
+    get_withdraw_nft_stakes: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getWithdrawNFTStakes(payload.first, payload.skip)),
+    get_withdraw_nft_stakes_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getWithdrawNFTStakesByAddress(payload.account, payload.first, payload.skip)),
+    get_bridge_tokens: subgraphRead(({ payload, subgraph }) => subgraph.getBridgeTokens(payload.first, payload.skip)),
+    get_bridge_token_by_address: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getBridgeTokenByAddress(payload.address)),
+    get_bridge_token_by_symbol: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getBridgeTokenBySymbol(payload.symbol)),
+    get_bridge_transfers: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getBridgeTransfers(payload.first, payload.skip)),
+    get_bridge_transfers_by_from: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getBridgeTransfersByFrom(payload.address, payload.first, payload.skip)),
+    get_bridge_transfers_by_to: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getBridgeTransfersByTo(payload.address, payload.first, payload.skip)),
+    get_bridge_transfers_by_token: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getBridgeTransfersByToken(payload.address, payload.first, payload.skip)),
+    get_multisig_wallets: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getMultisigWallets(payload.first, payload.skip)),
+    get_multisig_wallets_by_participant: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getMultisigWalletsByParticipant(payload.participant, payload.first, payload.skip)),
+    get_multisig_approve_transactions: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getMultisigApproveTransactionsByMultisigAddressAndNonce(payload.addressMultisig, payload.nonce, payload.first, payload.skip)),
+    get_multisig_expired_approve_transactions: subgraphRead(({ payload, subgraph }) =>
+        subgraph.getMultisigApproveTransactionsByMultisigAddressAndNonceNot(payload.addressMultisig, payload.nonce, payload.first, payload.skip)),
+
+    // IPFS Operations
+    upload_token_buffer_to_ipfs: transaction(async ({ payload, decimalEVM }) => {
+        const bufferToken = Buffer.from(payload.buffer, 'base64');
+        return decimalEVM.uploadTokenBufferToIPFS(bufferToken, payload.filename);
+    }),
+
+    upload_nft_buffer_to_ipfs: transaction(async ({ payload, decimalEVM }) => {
+        const bufferNFT = Buffer.from(payload.buffer, 'base64');
+        return decimalEVM.uploadNFTBufferToIPFS(bufferNFT, payload.filename, payload.name, payload.description);
+    }),
+
+    get_url_from_cid: evmRead(({ payload, decimalEVM }) => decimalEVM.getUrlFromCid(payload.cid)),
+
+    // Helper Functions
+    parse_ether: evmRead(({ payload, decimalEVM }) => decimalEVM.parseEther(payload.amount).toString()),
+    format_ether: evmRead(({ payload, decimalEVM }) => decimalEVM.formatEther(payload.amountWei)),
+    get_address: evmRead(({ payload, decimalEVM }) => decimalEVM.getAddress(payload.address)),
+    get_latest_block: evmRead(({ decimalEVM }) => decimalEVM.getLatestBlock()),
+    get_fee_data: evmRead(({ decimalEVM }) => decimalEVM.getFeeData()),
+
+    // Contract Operations
+    verify_contract: transaction(async ({ payload, decimalEVM }) => {
+        return decimalEVM.verifyСontract(
+            payload.contractAddress,
+            payload.contractCode,
+            payload.compiler,
+            payload.optimizer,
+            payload.runs,
+            payload.evm_version
+        );
+    }),
+
+    call_contract: evmRead(async ({ payload, decimalEVM }) => {
+        const contract = await decimalEVM.connectToContract(payload.contractAddress);
+        return contract.call(payload.method, payload.params);
+    }),
+
+    call_write_contract: transaction(async ({ payload, decimalEVM }) => {
+        const writeContract = await decimalEVM.connectToContract(payload.contractAddress);
+        const options = payload.options ? payload.options : await writeContract.getDefaultOptions();
+        return writeContract.call(payload.method, payload.params, options);
+    }),
+
+    send_signed_transaction: transaction(async ({ payload, decimalEVM }) => {
+        const signedContract = await decimalEVM.connectToContract(payload.contractAddress);
+        const signedOptions = payload.options ? payload.options : await signedContract.getDefaultOptions();
+        const sendSigned = async (nonce) => {
+            const options = nonce === undefined ? signedOptions : { ...signedOptions, nonce };
+            const populateTransaction = await signedContract.populateTransaction(payload.method, payload.params, options);
+            populateTransaction.chainId = payload.chainId || 20202020;
+            const signTransaction = await signedContract.signTransaction(populateTransaction);
+            return signedContract.sendSignedTransaction(signTransaction);
+        };
+        const signedManager = nonceManagers[payload.wallet_id];
+        return signedManager && signedOptions.nonce == null
+            ? await signedManager.send(sendSigned)
+            : await sendSigned();
+    }),
+
+    // Nonce
+    get_nonce_state: serviceAction({ readOnly: true, batch: true, walletScoped: true }, ({ payload }) =>
+        nonceManagers[payload.wallet_id] ? nonceManagers[payload.wallet_id].state() : null),
+    resync_nonce: transaction(async ({ payload }) => {
+        if (!nonceManagers[payload.wallet_id]) throw new Error('Локальное распределение nonce не включено');
+        await nonceManagers[payload.wallet_id].sync(!!payload.reset);
+        return nonceManagers[payload.wallet_id].state();
+    }),
+
+    // Batch
+    batch: serviceAction({ readOnly: true, walletScoped: true }, ({ payload }) => handleBatch(payload)),
+
+    // Check Wallet
+    is_wallet_registered: subgraphRead({ walletScoped: true }, async ({ payload }) => {
+        return {
+            success: true,
+            registered: !!tempWallets[payload.wallet_id],
+            message: tempWallets[payload.wallet_id]
+                ? `Кошелёк "${payload.wallet_id}" существует`
+                : `Кошелёк "${payload.wallet_id}" не зарегистрирован`
+        };
+    }),
+
+    // Registry
+    describe_actions: serviceAction({ readOnly: true }, () => describeActions()),
+
+    // Проверка простаивавшего соединения пулом клиента
+    ping: serviceAction({ readOnly: true }, () => ({ pong: true })),
+}));
+
+function describeActions() {
+    const actions = {};
+    for (const [name, definition] of ACTIONS) {
+        actions[name] = {
+            evm: definition.evm,
+            read_only: definition.readOnly,
+            batch: definition.batch,
+            wallet_scoped: definition.walletScoped,
+            cacheable: definition.cacheTtl !== undefined,
+            cache_ttl: definition.cacheTtl === undefined ? null : definition.cacheTtl
+        };
+    }
+    return { actions, idempotency: IDEMPOTENCY_MAX_KEYS > 0 };
+}
 
-                case 'get_validator_penalties':
-                    result = await subgraph.getValidatorPenalties(payload.validator, payload.first, payload.skip);
-                    break;
+// Сбой узла, Subgraph или сети: чтение можно повторить, исход транзакции неизвестен
+const UPSTREAM_ERROR_CODES = new Set([
+    'NETWORK_ERROR', 'SERVER_ERROR', 'TIMEOUT',
+    'ECONNREFUSED', 'ECONNRESET', 'ETIMEDOUT', 'EAI_AGAIN', 'ENOTFOUND', 'EPIPE',
+    'UND_ERR_CONNECT_TIMEOUT', 'UND_ERR_SOCKET'
+]);
+
+function isUpstreamError(err) {
+    for (let current = err, depth = 0; current && depth < 3; current = current.cause || current.error, depth++) {
+        if (UPSTREAM_ERROR_CODES.has(current.code)) return true;
+    }
+    return false;
+}
 
-                case 'get_validator_penalties_from_block':
-                    result = await subgraph.getValidatorPenaltiesFromBlock(payload.validator, payload.blockNumber, payload.first, payload.skip);
-                    break;
+// Категория ошибки действия: клиент выбирает по ней тип исключения
+function errorKind(err, definition) {
+    if (err.kind) return err.kind;
+    if (isUpstreamError(err)) return 'upstream';
+    return definition && !definition.readOnly ? 'transaction' : 'action';
+}
 
-                case 'get_sum_amount_to_penalty':
-                    result = await subgraph.getSumAmountToPenalty();
-                    break;
+// Пакетный запрос: несколько действий за один обмен, результат и ошибка — отдельно для каждого
+async function handleBatch(payload) {
+    const { requests = [], wallet_id, wallet_address } = payload;
+    return Promise.all(requests.map(async ({ action, payload: itemPayload = {} }) => {
+        const definition = ACTIONS.get(action);
+        try {
+            if (definition && !definition.batch) {
+                throw actionError(`Действие ${action} не может выполняться в пакетном запросе`, 'validation');
+            }
+            const result = await handleAction(action, { wallet_id, wallet_address, ...itemPayload });
+            return { success: true, result };
+        } catch (err) {
+            return { success: false, error: err.message, kind: errorKind(err, definition) };
+        }
+    }));
+}
 
-                case 'get_tokens':
-                    result = await subgraph.getTokens(payload.first, payload.skip);
-                    break;
+// Идемпотентность транзакций: клиент передаёт idempotency_key, повтор запроса с
+// тем же ключом (после обрыва соединения) получает исход первого вызова — результат,
+// ошибку или ещё выполняющийся вызов — вместо повторной отправки транзакции.
+// Ключи живут в памяти процесса; в кластере транзакции кошелька всегда выполняет
+// один обработчик, поэтому повтор попадает туда же, но после перезапуска
+// обработчика его ключи потеряны (см. режим кластера).
+const idempotentCalls = new Map();
+
+function runIdempotent(key, run) {
+    const now = Date.now();
+    const known = idempotentCalls.get(key);
+    if (known && known.expiresAt > now) return known.promise;
+
+    const promise = run();
+    // Исход запоминается и для ошибок: неудачная транзакция могла попасть в сеть
+    promise.catch(() => {});
+    idempotentCalls.delete(key);
+    idempotentCalls.set(key, { promise, expiresAt: now + IDEMPOTENCY_TTL_MS });
+    // Map хранит порядок вставки, поэтому первыми идут самые старые ключи
+    for (const [oldest, entry] of idempotentCalls) {
+        if (idempotentCalls.size <= IDEMPOTENCY_MAX_KEYS && entry.expiresAt > now) break;
+        idempotentCalls.delete(oldest);
+    }
+    return promise;
+}
 
-                case 'get_tokens_by_owner':
-                    result = await subgraph.getTokensByOwner(payload.owner, payload.first, payload.skip);
-                    break;
+// Выполнение одного действия
+async function handleAction(action, payload) {
+    const definition = ACTIONS.get(action);
+    if (!definition) throw actionError(`Неизвестное действие: ${action}`, 'unknown_action');
+
+    const key = payload.idempotency_key;
+    if (key && !definition.readOnly && IDEMPOTENCY_MAX_KEYS > 0) {
+        return runIdempotent(`${action}:${payload.wallet_id || ''}:${key}`,
+            () => executeAction(definition, payload));
+    }
+    return executeAction(definition, payload);
+}
 
-                case 'get_token_by_symbol':
-                    result = await subgraph.getTokenBySymbol(payload.symbol);
-                    break;
+async function executeAction(definition, payload) {
+    const decimalEVM = definition.evm ? await getDecimalEVM(payload.wallet_id) : null;
+    const subgraph = await getSubgraph();
+    return definition.handler({ payload, decimalEVM, subgraph });
+}
 
-                case 'get_token_by_address':
-                    result = await subgraph.getTokenByAddress(payload.tokenAddress);
-                    break;
+// BigNumber в MessagePack передаётся расширением: 1 байт знака и модуль в big-endian.
+// В Python такие значения приходят целыми числами, без разбора hex-строк.
+const BIG_INT_EXT_TYPE = 1;
+let extensionCodec = null;
+if (msgpack) {
+    extensionCodec = new msgpack.ExtensionCodec();
+    extensionCodec.register({
+        type: BIG_INT_EXT_TYPE,
+        encode: (value) => {
+            if (!value || !value._isBigNumber) return null;
+            const big = BigInt(value.toString());
+            const negative = big < 0n;
+            let hex = (negative ? -big : big).toString(16);
+            if (hex.length % 2) hex = '0' + hex;
+            return Buffer.concat([Buffer.from([negative ? 1 : 0]), Buffer.from(hex, 'hex')]);
+        },
+        decode: (data) => {
+            const bytes = Buffer.from(data.buffer, data.byteOffset, data.byteLength);
+            const magnitude = bytes.length > 1 ? BigInt('0x' + bytes.toString('hex', 1)) : 0n;
+            return bytes[0] ? -magnitude : magnitude;
+        }
+    });
+}
 
-                case 'get_address_balances':
-                    result = await subgraph.getAddressBalances(payload.account, payload.first, payload.skip);
-                    break;
+// MessagePack кодирует объекты как есть, поэтому ответ сначала приводится к тем же
+// данным, что получил бы клиент в JSON: учитывается toJSON, функции (например, wait
+// у ответа транзакции), undefined и символы отбрасываются, в массивах заменяются
+// на null. BigNumber остаются объектами и кодируются расширением
+function toWireValue(value, parents = new Set()) {
+    if (typeof value === 'function' || typeof value === 'symbol' || value === undefined) return undefined;
+    if (value === null) return null;
+    if (value._isBigNumber) return value;
+    if (typeof value.toJSON === 'function') return toWireValue(value.toJSON(), parents);
+    if (typeof value === 'number') return Number.isFinite(value) ? value : null;
+    if (typeof value !== 'object') return value;
+    if (parents.has(value)) throw new TypeError('Циклическая ссылка в ответе');
+    parents.add(value);
+    let wire;
+    if (Array.isArray(value)) {
+        wire = value.map((item) => {
+            const itemWire = toWireValue(item, parents);
+            return itemWire === undefined ? null : itemWire;
+        });
+    } else {
+        wire = {};
+        for (const key of Object.keys(value)) {
+            const fieldWire = toWireValue(value[key], parents);
+            if (fieldWire !== undefined) wire[key] = fieldWire;
+        }
+    }
+    parents.delete(value);
+    return wire;
+}
 
-                case 'get_stakes':
-                    result = await subgraph.getStakes(payload.first, payload.skip);
-                    break;
+function encodeBody(message, encoding) {
+    if (encoding === 'msgpack') {
+        const bytes = msgpack.encode(toWireValue(message), { extensionCodec });
+        return Buffer.from(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    }
+    return Buffer.from(JSON.stringify(message));
+}
 
-                case 'get_stakes_by_address':
-                    result = await subgraph.getStakesByAddress(payload.delegator, payload.first, payload.skip);
-                    break;
+function decodeBody(buffer, start, end, encoding) {
+    if (encoding === 'msgpack') {
+        return msgpack.decode(buffer.subarray(start, end), { extensionCodec });
+    }
+    return JSON.parse(buffer.toString('utf8', start, end));
+}
 
-                case 'get_stakes_by_validator':
-                    result = await subgraph.getStakesByValidotor(payload.validator, payload.first, payload.skip);
-                    break;
+// Протокол: каждое сообщение — кадр из 4 байт длины (big-endian) и тела в JSON
+// (или MessagePack, если клиент согласовал его запросом hello).
+// Запрос: { id, action, payload }, ответ: { id, success, result | error }.
+// Запросы одного соединения выполняются параллельно, ответы отправляются по мере готовности.
+function encodeResponse(message, encoding) {
+    let body;
+    try {
+        body = encodeBody(message, encoding);
+    } catch (err) {
+        return encodeBody(encodeFailure(message.id, err), encoding);
+    }
+    if (body.length <= MAX_MESSAGE_SIZE) return body;
+    return encodeBody({
+        id: message.id,
+        success: false,
+        error: `Размер ответа ${body.length} байт превышает лимит ${MAX_MESSAGE_SIZE} байт`
+    }, encoding);
+}
 
-                case 'get_transfer_stakes':
-                    result = await subgraph.getTransferStakes(payload.first, payload.skip);
-                    break;
+// Результат, который не удалось закодировать (BigInt, циклические ссылки),
+// возвращается клиенту ошибкой, а не роняет процесс
+function encodeFailure(id, err) {
+    console.error('❌ Ошибка кодирования ответа:', err.message);
+    return { id, success: false, error: `Не удалось закодировать ответ: ${err.message}`, kind: 'action' };
+}
 
-                case 'get_transfer_stakes_by_address':
-                    result = await subgraph.getTransferStakesByAddress(payload.delegator, payload.first, payload.skip);
-                    break;
+function writeFrame(socket, message) {
+    if (socket.destroyed) return;
+    writeBody(socket, encodeResponse(message, socket.frameEncoding));
+}
 
-                case 'get_withdraw_stakes':
-                    result = await subgraph.getWithdrawStakes(payload.first, payload.skip);
-                    break;
+function writeBody(socket, body) {
+    if (socket.destroyed) return;
+    const header = Buffer.alloc(4);
+    header.writeUInt32BE(body.length, 0);
+    socket.write(header);
+    socket.write(body);
+}
 
-                case 'get_withdraw_stakes_by_address':
-                    result = await subgraph.getWithdrawStakesByAddress(payload.delegator, payload.first, payload.skip);
-                    break;
+// Накопитель входящих кадров с переиспользуемым буфером: данные копируются
+// в один растущий буфер без повторной склейки, а разобранные кадры сдвигаются к началу.
+class FrameDecoder {
+    constructor(maxSize) {
+        this.maxSize = maxSize;
+        this.buffer = Buffer.allocUnsafe(64 * 1024);
+        this.start = 0;
+        this.end = 0;
+    }
+
+    ensureCapacity(extra) {
+        if (this.end + extra <= this.buffer.length) return;
+        const used = this.end - this.start;
+        if (used + extra <= this.buffer.length) {
+            this.buffer.copy(this.buffer, 0, this.start, this.end);
+        } else {
+            let size = this.buffer.length;
+            while (size < used + extra) size *= 2;
+            const grown = Buffer.allocUnsafe(size);
+            this.buffer.copy(grown, 0, this.start, this.end);
+            this.buffer = grown;
+        }
+        this.start = 0;
+        this.end = used;
+    }
+
+    // Добавляет фрагмент и передаёт onFrame(buffer, start, end) тело каждого полностью
+    // полученного кадра. Тело действительно только во время вызова: буфер переиспользуется.
+    push(chunk, onFrame) {
+        this.ensureCapacity(chunk.length);
+        chunk.copy(this.buffer, this.end);
+        this.end += chunk.length;
+
+        while (this.end - this.start >= 4) {
+            const length = this.buffer.readUInt32BE(this.start);
+            if (length > this.maxSize) {
+                throw new Error(`Размер запроса ${length} байт превышает лимит ${this.maxSize} байт`);
+            }
+            if (this.end - this.start < 4 + length) {
+                this.ensureCapacity(4 + length - (this.end - this.start));
+                break;
+            }
+            const start = this.start + 4;
+            this.start = start + length;
+            onFrame(this.buffer, start, start + length);
+        }
+        if (this.start === this.end) {
+            this.start = 0;
+            this.end = 0;
+        }
+    }
+}
 
-                case 'get_nft_collections':
-                    result = await subgraph.getNftCollections(payload.first, payload.skip);
-                    break;
+// Согласование формата: ответ отправляется в текущем формате, после чего
+// все следующие кадры соединения кодируются в выбранном
+function handleHello(socket, request) {
+    const encoding = request.payload && request.payload.encoding;
+    if (encoding === 'msgpack' && msgpack) {
+        writeFrame(socket, { id: request.id, success: true, result: { encoding } });
+        socket.frameEncoding = encoding;
+    } else {
+        writeFrame(socket, { id: request.id, success: false, error: `Формат ${encoding} не поддерживается` });
+    }
+}
 
-                case 'get_nft_collections_by_creator':
-                    result = await subgraph.getNftCollectionsByCreator(payload.owner, payload.first, payload.skip);
-                    break;
+async function executeRequest(request) {
+    const { id, action, payload } = request;
+    try {
+        const result = await handleAction(action, payload);
+        return { id, success: true, result };
+    } catch (err) {
+        console.error('❌ Ошибка в обработке запроса:', err.message);
+        return { id, success: false, error: err.message, kind: errorKind(err, ACTIONS.get(action)) };
+    }
+}
 
-                case 'get_nft_collection_by_address':
-                    result = await subgraph.getNftCollectionByAddress(payload.nftCollectionAddress);
-                    break;
-
-                case 'get_nft_collection_type':
-                    result = await subgraph.getNftCollectionType(payload.nftCollectionAddress);
-                    break;
-
-                case 'get_nfts':
-                    result = await subgraph.getNfts(payload.first, payload.skip);
-                    break;
-
-                case 'get_nfts_by_collection':
-                    result = await subgraph.getNftsByCollection(payload.nftCollectionAddress, payload.first, payload.skip);
-                    break;
-
-                case 'get_address_balances_nfts':
-                    result = await subgraph.getAddressBalancesNfts(payload.account, payload.first, payload.skip);
-                    break;
-
-                case 'get_address_balances_nfts_by_collection':
-                    result = await subgraph.getAddressBalancesNftsByCollection(payload.account, payload.nftCollectionAddress, payload.first, payload.skip);
-                    break;
+async function handleRequest(socket, request) {
+    writeFrame(socket, await executeRequest(request));
+}
 
-                case 'get_nft_by_collection_and_token_id':
-                    result = await subgraph.getNftByCollectionAndTokenId(payload.nftCollectionAddress, payload.tokenId);
-                    break;
+// Режим кластера (IPC_WORKERS > 1): основной процесс принимает соединения и
+// разбирает кадры, а действия выполняют процессы-обработчики. Запросы кошелька
+// всегда попадают в один обработчик, где живут его DecimalEVM и nonce; чтения
+// Subgraph без состояния получает наименее загруженный обработчик. Ответ
+// кодируется в обработчике, основной процесс только пересылает готовое тело кадра.
+//
+// Кошельки, DecimalEVM, nonce и ключи идемпотентности хранятся в памяти
+// обработчика. Упавший обработчик перезапускается без них: запросы, бывшие в нём
+// в полёте, получают kind 'unavailable' (исход неизвестен), а запросы его кошельков
+// до повторной регистрации — kind 'unknown_wallet'. Повтор транзакции с прежним
+// ключом идемпотентности после перезапуска не распознаётся и выполнится заново.
+const WORKER_RESTART_DELAY_MS = 500;
+
+// FNV-1a: один и тот же wallet_id всегда попадает в один обработчик
+function walletShard(walletId, count) {
+    const key = walletId == null ? '' : String(walletId);
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < key.length; i++) {
+        hash ^= key.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193);
+    }
+    return (hash >>> 0) % count;
+}
 
-                case 'get_nft_stakes':
-                    result = await subgraph.getNFTStakes(payload.first, payload.skip);
-                    break;
+// Действие не зависит от состояния кошелька и может выполняться в любом обработчике
+function isStateless(definition) {
+    return !!definition && definition.readOnly && !definition.evm && !definition.walletScoped;
+}
 
-                case 'get_nft_stakes_by_address':
-                    result = await subgraph.getNFTStakesByAddress(payload.account, payload.first, payload.skip);
-                    break;
+class WorkerRouter {
+    constructor(size) {
+        this.size = size;
+        this.workers = new Array(size).fill(null);
+        this.pending = new Map();
+        this.sequence = 0;
+    }
+
+    start() {
+        // Тела ответов передаются Buffer без перекодирования в JSON
+        cluster.setupPrimary({ serialization: 'advanced' });
+        for (let slot = 0; slot < this.size; slot++) this.fork(slot);
+    }
+
+    fork(slot) {
+        const worker = cluster.fork({ IPC_WORKER_SLOT: String(slot) });
+        worker.inFlight = 0;
+        // До сигнала готовности запросы копятся: обработчик ещё не подписан на сообщения
+        worker.backlog = [];
+        worker.on('message', (message) => {
+            if (message.ready) {
+                const backlog = worker.backlog;
+                worker.backlog = null;
+                for (const queued of backlog) worker.send(queued);
+                return;
+            }
+            this.complete(message);
+        });
+        worker.on('exit', (code, signal) => {
+            console.error(`❌ Обработчик ${slot} завершился (${signal || code}), перезапуск`);
+            this.workers[slot] = null;
+            this.fail(worker);
+            setTimeout(() => this.fork(slot), WORKER_RESTART_DELAY_MS);
+        });
+        this.workers[slot] = worker;
+    }
+
+    pick(action, payload) {
+        if (!isStateless(ACTIONS.get(action))) {
+            return this.workers[walletShard(payload && payload.wallet_id, this.size)];
+        }
+        let best = null;
+        for (const worker of this.workers) {
+            if (worker && (!best || worker.inFlight < best.inFlight)) best = worker;
+        }
+        return best;
+    }
+
+    // Передаёт запрос обработчику. С encoding обработчик возвращает закодированное
+    // тело кадра (body), без него — ответ объектом (response)
+    send(worker, request, encoding) {
+        return new Promise((resolve) => {
+            const key = ++this.sequence;
+            this.pending.set(key, { resolve, worker, id: request.id });
+            worker.inFlight++;
+            const message = { key, request, encoding };
+            if (worker.backlog) {
+                worker.backlog.push(message);
+            } else {
+                worker.send(message);
+            }
+        });
+    }
+
+    complete(message) {
+        const entry = this.pending.get(message.key);
+        if (!entry) return;
+        this.pending.delete(message.key);
+        entry.worker.inFlight--;
+        entry.resolve(message);
+    }
+
+    // Запросы завершившегося обработчика получают ошибку: неизвестно, выполнены ли они
+    fail(worker) {
+        for (const [key, entry] of this.pending) {
+            if (entry.worker !== worker) continue;
+            this.pending.delete(key);
+            entry.resolve({ response: unavailable(entry.id) });
+        }
+    }
 
-                case 'get_nft_stakes_by_validator':
-                    result = await subgraph.getNFTStakesByValidotor(payload.validator, payload.first, payload.skip);
-                    break;
-
-                case 'get_transfer_nft_stakes':
-                    result = await subgraph.getTransferNFTStakes(payload.first, payload.skip);
-                    break;
-
-                case 'get_transfer_nft_stakes_by_address':
-                    result = await subgraph.getTransferNFTStakesByAddress(payload.account, payload.first, payload.skip);
-                    break;
-
-                case 'get_withdraw_nft_stakes':
-                    result = await subgraph.getWithdrawNFTStakes(payload.first, payload.skip);
-                    break;
-
-                case 'get_withdraw_nft_stakes_by_address':
-                    result = await subgraph.getWithdrawNFTStakesByAddress(payload.account, payload.first, payload.skip);
-                    break;
-
-                case 'get_bridge_tokens':
-                    result = await subgraph.getBridgeTokens(payload.first, payload.skip);
-                    break;
-
-                case 'get_bridge_token_by_address':
-                    result = await subgraph.getBridgeTokenByAddress(payload.address);
-                    break;
-
-                case 'get_bridge_token_by_symbol':
-                    result = await subgraph.getBridgeTokenBySymbol(payload.symbol);
-                    break;
-
-                case 'get_bridge_transfers':
-                    result = await subgraph.getBridgeTransfers(payload.first, payload.skip);
-                    break;
-
-                case 'get_bridge_transfers_by_from':
-                    result = await subgraph.getBridgeTransfersByFrom(payload.address, payload.first, payload.skip);
-                    break;
-
-                case 'get_bridge_transfers_by_to':
-                    result = await subgraph.getBridgeTransfersByTo(payload.address, payload.first, payload.skip);
-                    break;
-
-                case 'get_bridge_transfers_by_token':
-                    result = await subgraph.getBridgeTransfersByToken(payload.address, payload.first, payload.skip);
-                    break;
-
-                case 'get_multisig_wallets':
-                    result = await subgraph.getMultisigWallets(payload.first, payload.skip);
-                    break;
-
-                case 'get_multisig_wallets_by_participant':
-                    result = await subgraph.getMultisigWalletsByParticipant(payload.participant, payload.first, payload.skip);
-                    break;
-
-                case 'get_multisig_approve_transactions':
-                    result = await subgraph.getMultisigApproveTransactionsByMultisigAddressAndNonce(payload.addressMultisig, payload.nonce, payload.first, payload.skip);
-                    break;
-
-                case 'get_multisig_expired_approve_transactions':
-                    result = await subgraph.getMultisigApproveTransactionsByMultisigAddressAndNonceNot(payload.addressMultisig, payload.nonce, payload.first, payload.skip);
-                    break;
-
-                // IPFS Operations
-                case 'upload_token_buffer_to_ipfs':
-                    const bufferToken = Buffer.from(payload.buffer, 'base64');
-                    result = await decimalEVM.uploadTokenBufferToIPFS(bufferToken, payload.filename);
-                    break;
-
-                case 'upload_nft_buffer_to_ipfs':
-                    const bufferNFT = Buffer.from(payload.buffer, 'base64');
-                    result = await decimalEVM.uploadNFTBufferToIPFS(bufferNFT, payload.filename, payload.name, payload.description);
-                    break;
-
-                case 'get_url_from_cid':
-                    result = decimalEVM.getUrlFromCid(payload.cid);
-                    break;
-
-                // Helper Functions
-                case 'parse_ether':
-                    result = decimalEVM.parseEther(payload.amount).toString();
-                    break;
-
-                case 'format_ether':
-                    result = decimalEVM.formatEther(payload.amountWei);
-                    break;
-
-                case 'get_address':
-                    result = decimalEVM.getAddress(payload.address);
-                    break;
-
-                case 'get_latest_block':
-                    result = await decimalEVM.getLatestBlock();
-                    break;
-
-                case 'get_fee_data':
-                    result = await decimalEVM.getFeeData();
-                    break;
-
-                // Contract Operations
-                case 'verify_contract':
-                    result = await decimalEVM.verifyСontract(
-                        payload.contractAddress,
-                        payload.contractCode,
-                        payload.compiler,
-                        payload.optimizer,
-                        payload.runs,
-                        payload.evm_version
-                    );
-                    break;
-
-                case 'call_contract':
-                    const contract = await decimalEVM.connectToContract(payload.contractAddress);
-                    result = await contract.call(payload.method, payload.params);
-                    break;
-
-                case 'call_write_contract':
-                    const writeContract = await decimalEVM.connectToContract(payload.contractAddress);
-                    const options = payload.options ? payload.options : await writeContract.getDefaultOptions();
-                    result = await writeContract.call(payload.method, payload.params, options);
-                    break;
-
-                case 'send_signed_transaction':
-                    const signedContract = await decimalEVM.connectToContract(payload.contractAddress);
-                    const signedOptions = payload.options ? payload.options : await signedContract.getDefaultOptions();
-                    const populateTransaction = await signedContract.populateTransaction(payload.method, payload.params, signedOptions);
-                    populateTransaction.chainId = payload.chainId || 20202020;
-                    const signTransaction = await signedContract.signTransaction(populateTransaction);
-                    result = await signedContract.sendSignedTransaction(signTransaction);
-                    break;
-
-                // Check Wallet
-                case 'is_wallet_registered':
-                    result = {
-                        success: true,
-                        registered: !!tempWallets[payload.wallet_id],
-                        message: tempWallets[payload.wallet_id]
-                            ? `Кошелёк "${payload.wallet_id}" существует`
-                            : `Кошелёк "${payload.wallet_id}" не зарегистрирован`
-                    };
-                    break;
-
-                default:
-                    throw new Error(`Неизвестное действие: ${action}`);
+    async dispatch(socket, request) {
+        const { id, action, payload } = request;
+        if (action === 'warm_up') {
+            writeFrame(socket, await this.warmUp(id, payload || {}));
+            return;
+        }
+        const worker = this.pick(action, payload);
+        if (!worker) {
+            writeFrame(socket, unavailable(id));
+            return;
+        }
+        const message = await this.send(worker, request, socket.frameEncoding);
+        if (message.body) {
+            writeBody(socket, message.body);
+        } else {
+            writeFrame(socket, message.response);
+        }
+    }
+
+    // Каждый обработчик прогревает свои кошельки, результаты объединяются
+    async warmUp(id, payload) {
+        const groups = new Map();
+        if (payload.wallet_ids) {
+            for (const walletId of payload.wallet_ids) {
+                const slot = walletShard(walletId, this.size);
+                if (!groups.has(slot)) groups.set(slot, []);
+                groups.get(slot).push(walletId);
             }
+        } else {
+            this.workers.forEach((worker, slot) => groups.set(slot, undefined));
+        }
+        const wallets = {};
+        await Promise.all([...groups].map(async ([slot, walletIds]) => {
+            const worker = this.workers[slot];
+            const { response } = worker
+                ? await this.send(worker, { id, action: 'warm_up', payload: walletIds ? { wallet_ids: walletIds } : {} })
+                : { response: unavailable(id) };
+            if (response.success) {
+                Object.assign(wallets, response.result.wallets);
+            } else {
+                for (const walletId of walletIds || []) wallets[walletId] = { success: false, error: response.error };
+            }
+        }));
+        return { id, success: true, result: { wallets } };
+    }
+}
 
-            socket.write(JSON.stringify({ success: true, result }));
+function unavailable(id) {
+    return { id, success: false, error: 'Обработчик IPC-сервера перезапускается', kind: 'unavailable' };
+}
+
+// Процесс-обработчик кластера: выполняет запросы, полученные от основного процесса
+function startWorker() {
+    process.on('message', async ({ key, request, encoding }) => {
+        const response = await executeRequest(request);
+        try {
+            process.send(encoding ? { key, body: encodeResponse(response, encoding) } : { key, response });
         } catch (err) {
-            console.error('❌ Ошибка в обработке запроса:', err.message);
-            socket.write(JSON.stringify({ success: false, error: err.message }));
+            process.send({ key, response: encodeFailure(response.id, err) });
         }
     });
+    // Основной процесс завершился
+    process.on('disconnect', () => process.exit(0));
+    process.send({ ready: true });
+    // Кошельков при запуске ещё нет: DecimalEVM готовится при регистрации (WARMUP_ON_REGISTER)
+    warmUpSubgraph();
+}
 
-    socket.on('end', () => {
-        console.log('🔌 Клиент отключён');
+// Сервер
+function createServer(onRequest) {
+    return net.createServer((socket) => {
+        console.log('🔌 Клиент подключён');
+
+        const decoder = new FrameDecoder(MAX_MESSAGE_SIZE);
+        socket.frameEncoding = 'json';
+
+        socket.on('data', (data) => {
+            try {
+                // Кадры обрабатываются по одному: после hello следующие кадры того же
+                // фрагмента уже декодируются в согласованном формате
+                decoder.push(data, (buffer, start, end) => {
+                    const request = decodeBody(buffer, start, end, socket.frameEncoding);
+                    if (request.action === 'hello') {
+                        handleHello(socket, request);
+                    } else {
+                        onRequest(socket, request);
+                    }
+                });
+            } catch (err) {
+                console.error('❌ Неверный формат запроса:', err.message);
+                socket.destroy();
+            }
+        });
+
+        socket.on('end', () => {
+            console.log('🔌 Клиент отключён');
+        });
+
+        // Клиенты держат соединения в пуле и могут оборвать их в любой момент
+        socket.on('error', (err) => {
+            console.error('❌ Ошибка сокета клиента:', err.message);
+        });
     });
-});
+}
 
 // Расчет комиссии для создания токена
 function calculateTokenCommission(symbol) {
@@ -1058,7 +1507,28 @@ function calculateTokenCommission(symbol) {
     return 250; // 7-10 букв
 }
 
-server.listen(SOCKET_PATH, () => {
-    fs.chmodSync(SOCKET_PATH, '700');
-    console.log(`⚙️ IPC-сервер запущен по пути: ${SOCKET_PATH}`);
-});
\ No newline at end of file
+// При подключении через require (например, в тестах) сервер не запускается
+if (require.main === module) {
+    if (cluster.isWorker) {
+        startWorker();
+    } else {
+        // Удаляем старый сокет; обработчики кластера сокет не слушают
+        if (fs.existsSync(SOCKET_PATH)) {
+            fs.unlinkSync(SOCKET_PATH);
+        }
+        const router = IPC_WORKERS > 1 ? new WorkerRouter(IPC_WORKERS) : null;
+        const server = createServer(router ? (socket, request) => router.dispatch(socket, request) : handleRequest);
+        server.listen(SOCKET_PATH, () => {
+            fs.chmodSync(SOCKET_PATH, '700');
+            if (router) {
+                router.start();
+                console.log(`⚙️ IPC-сервер запущен по пути: ${SOCKET_PATH}, обработчиков: ${IPC_WORKERS}`);
+            } else {
+                console.log(`⚙️ IPC-сервер запущен по пути: ${SOCKET_PATH}`);
+                warmUpSubgraph();
+            }
+        });
+    }
+}
+
+module.exports = { ACTIONS, NonceManager, FrameDecoder, executeRequest, encodeResponse, decodeBody, toWireValue };
\ No newline at end of file
@@ -8,4 +8,10 @@ setup(
         "aiohttp",
         "python-dotenv",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "msgspec": ["msgspec"],
+        "msgpack": ["msgpack"],
+        "numpy": ["numpy"],
+    },
 )
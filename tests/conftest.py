@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Callable, Dict, Optional
+
+import pytest
+
+from decimal_sdk.config import get_config
+from decimal_sdk.protocol import encode_frame, read_frame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Свойства действий, которые отдаёт describe_actions тестового сервера
+ACTIONS = {
+    'get_balance': {'evm': True, 'read_only': True, 'batch': True, 'wallet_scoped': False,
+                    'cacheable': False, 'cache_ttl': None},
+    'get_validators': {'evm': False, 'read_only': True, 'batch': True, 'wallet_scoped': False,
+                       'cacheable': False, 'cache_ttl': None},
+    'is_wallet_registered': {'evm': False, 'read_only': True, 'batch': True, 'wallet_scoped': True,
+                             'cacheable': False, 'cache_ttl': None},
+    'send_del': {'evm': True, 'read_only': False, 'batch': False, 'wallet_scoped': True,
+                 'cacheable': False, 'cache_ttl': None},
+    'burn_del': {'evm': True, 'read_only': False, 'batch': False, 'wallet_scoped': True,
+                 'cacheable': False, 'cache_ttl': None},
+    'create_wallet': {'evm': False, 'read_only': False, 'batch': False, 'wallet_scoped': False,
+                      'cacheable': False, 'cache_ttl': None},
+    'multi_send_token': {'evm': True, 'read_only': False, 'batch': False, 'wallet_scoped': True,
+                         'cacheable': False, 'cache_ttl': None},
+    'batch': {'evm': False, 'read_only': True, 'batch': False, 'wallet_scoped': True,
+              'cacheable': False, 'cache_ttl': None},
+}
+# Списки Subgraph: читаются без кошелька
+ACTIONS.update({action: {'evm': False, 'read_only': True, 'batch': True, 'wallet_scoped': False,
+                         'cacheable': False, 'cache_ttl': None}
+                for action in ('get_stakes', 'get_tokens', 'get_transfer_stakes', 'get_withdraw_stakes',
+                               'get_validator_penalties_from_block')})
+ACTIONS['get_token_by_address'] = {'evm': False, 'read_only': True, 'batch': True, 'wallet_scoped': False,
+                                   'cacheable': True, 'cache_ttl': 30}
+
+
+class FakeIPCServer:
+    """IPC-сервер на Unix-сокете для тестов SDK.
+
+    Отвечает на hello отказом (соединение остаётся на JSON), на describe_actions —
+    реестром ACTIONS, на batch — ответами handler по каждому вложенному запросу,
+    на остальные действия — ответом handler(action, payload). Если handler
+    возвращает None, соединение закрывается без ответа (обрыв после отправки запроса).
+    Корутина, возвращённая handler, выполняется отдельно: ответы на такие запросы
+    приходят по мере готовности, как у настоящего сервера.
+    """
+
+    def __init__(self, handler: Callable[[str, Dict[str, Any]], Dict[str, Any]]):
+        self.handler = handler
+        self.requests = []
+        self._directory = tempfile.mkdtemp(prefix='ipc-')
+        self.socket_path = os.path.join(self._directory, 'ipc.sock')
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._replies = set()
+
+    async def __aenter__(self) -> 'FakeIPCServer':
+        self._server = await asyncio.start_unix_server(self._serve, path=self.socket_path)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def _respond(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if action == 'hello':
+            return {'success': False, 'error': 'Формат не поддерживается'}
+        if action == 'describe_actions':
+            return {'success': True, 'result': {'actions': ACTIONS, 'idempotency': True}}
+        if action == 'batch':
+            return {'success': True, 'result': [self.handler(item['action'], item.get('payload', {}))
+                                                for item in payload['requests']]}
+        return self.handler(action, payload)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = json.loads(await read_frame(reader))
+                self.requests.append(request)
+                result = self._respond(request['action'], request.get('payload') or {})
+                if asyncio.iscoroutine(result):
+                    reply = asyncio.ensure_future(self._reply_later(writer, request['id'], result))
+                    self._replies.add(reply)
+                    reply.add_done_callback(self._replies.discard)
+                    continue
+                if result is None:
+                    break
+                await self._reply(writer, request['id'], result)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, request_id: int, result: Dict[str, Any]) -> None:
+        response = {'id': request_id, **result}
+        writer.write(encode_frame(json.dumps(response).encode()))
+        await writer.drain()
+
+    async def _reply_later(self, writer: asyncio.StreamWriter, request_id: int, result: Any) -> None:
+        result = await result
+        if writer.is_closing():
+            return
+        if result is None:
+            writer.close()
+        else:
+            await self._reply(writer, request_id, result)
+
+
+def ok(result: Any) -> Dict[str, Any]:
+    """Успешный ответ IPC-сервера."""
+    return {'success': True, 'result': result}
+
+
+def run(coroutine: Any) -> Any:
+    """Выполняет сценарий теста в новом цикле событий с ограничением по времени."""
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+@pytest.fixture
+def sdk_env(monkeypatch):
+    """Окружение, в котором DecimalSDK создаётся без .env."""
+    monkeypatch.setenv('ENCRYPTION_KEY', 'test-key')
+    get_config.cache_clear()
+    yield
+    get_config.cache_clear()
+
+
+def run_node(script: str, **env: str) -> Any:
+    """Выполняет скрипт Node.js в корне репозитория и возвращает его вывод, разобранный как JSON.
+
+    Тест пропускается, если не установлены Node.js или зависимости ipc-server.js.
+    """
+    if shutil.which('node') is None:
+        pytest.skip('Node.js не установлен')
+    check = subprocess.run(['node', '-e', "require.resolve('fernet'); require.resolve('dotenv'); "
+                                          "require.resolve('./dsc-js-sdk')"],
+                           cwd=ROOT, capture_output=True)
+    if check.returncode != 0:
+        pytest.skip('Зависимости ipc-server.js не установлены (npm install, dsc-js-sdk)')
+    completed = subprocess.run(['node', '-e', script], cwd=ROOT, capture_output=True, text=True, timeout=30,
+                               env=dict(os.environ, ENCRYPTION_KEY='test-key', **env))
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
@@ -0,0 +1,695 @@
+import asyncio
+
+import pytest
+
+from conftest import FakeIPCServer, ok, run
+from decimal_sdk import DecimalSDK
+from decimal_sdk.admission import AdmissionController
+from decimal_sdk.cache import ResponseCache
+from decimal_sdk.config import get_config
+from decimal_sdk.codec import get_codec
+from decimal_sdk.exceptions import CircuitOpenError, IPCConnectionError, IPCError, OverloadError, \
+    RequestNotSentError, TransactionError, ValidationError
+from decimal_sdk.ipc_client import IPCClient
+from decimal_sdk.pagination import fetch_pages, paginate
+from decimal_sdk.pool import ConnectionPool
+from decimal_sdk.retry import CircuitBreaker, RetryPolicy
+
+
+def test_batch_on_fresh_sdk(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok({'balance': payload['address']})) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                async with sdk.batch() as batch:
+                    first = batch.get_balance('0x1')
+                    second = batch.get_balance('0x2')
+            finally:
+                await sdk.close()
+            return first.result(), second.result(), [request['action'] for request in server.requests]
+
+    first, second, actions = run(scenario())
+    assert first == {'balance': '0x1'}
+    assert second == {'balance': '0x2'}
+    assert actions.count('batch') == 1
+
+
+def test_batch_execute_on_fresh_sdk(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok([{'id': '0xaa'}])) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            try:
+                batch = sdk.batch()
+                validators = batch.get_validators()
+                return await batch.execute(), validators.result()
+            finally:
+                await sdk.close()
+
+    results, validators = run(scenario())
+    assert results == [[{'id': '0xaa'}]]
+    assert validators == [{'id': '0xaa'}]
+
+
+def test_error_kind_selects_exception(sdk_env):
+    errors = {
+        'burn_del': {'success': False, 'error': 'execution reverted', 'kind': 'transaction'},
+        'get_balance': {'success': False, 'error': 'bad address', 'kind': 'validation'},
+        'get_validators': {'success': False, 'error': 'boom', 'kind': 'action'},
+    }
+
+    async def call(sdk, method, *args):
+        try:
+            await getattr(sdk, method)(*args)
+        except Exception as e:
+            return e
+
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: errors[action]) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                return (await call(sdk, 'burn_del', 1), await call(sdk, 'get_balance', '0x1'),
+                        await call(sdk, 'get_validators'))
+            finally:
+                await sdk.close()
+
+    transaction, validation, other = run(scenario())
+    assert type(transaction) is TransactionError and 'execution reverted' in str(transaction)
+    assert type(validation) is ValidationError
+    assert type(other) is IPCError
+
+
+def test_burst_waits_for_opening_connection():
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok(payload)) as server:
+            pool = ConnectionPool(server.socket_path, max_size=8, codec=get_codec('json'))
+            try:
+                await asyncio.gather(*[pool.request({'action': 'get_validators', 'payload': {}})
+                                       for _ in range(50)])
+                return len(pool._connections)
+            finally:
+                await pool.close()
+
+    assert run(scenario()) == 1
+
+
+def test_unsent_request_is_not_retried(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok({'balance': '1'})) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, max_message_size=4096)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            send = sdk._pool.request
+            attempts = []
+
+            async def counting_request(message):
+                attempts.append(message['action'])
+                return await send(message)
+
+            sdk._pool.request = counting_request
+            try:
+                with pytest.raises(RequestNotSentError):
+                    await sdk.get_balance('0x' + 'f' * 8192)
+            finally:
+                await sdk.close()
+            return attempts
+
+    assert run(scenario()).count('get_balance') == 1
+
+
+def test_retried_write_on_restarted_server_is_not_resent(sdk_env):
+    # Первая попытка оборвана, на повтор перезапущенный обработчик не знает кошелёк
+    responses = [None, {'success': False, 'error': 'Кошелёк "w1" не найден', 'kind': 'unknown_wallet'}]
+
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: responses.pop(0)) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, retries=2)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                with pytest.raises(IPCConnectionError) as error:
+                    await sdk.burn_del(1)
+            finally:
+                await sdk.close()
+            return error.value, [request['payload'] for request in server.requests if request['action'] == 'burn_del']
+
+    error, payloads = run(scenario())
+    # Исход первой попытки неизвестен: не WalletRegistrationError, которая означала бы отказ до отправки
+    assert error.kind is None
+    assert len(payloads) == 2 and payloads[0]['idempotency_key'] == payloads[1]['idempotency_key']
+
+
+def wallet_server_handler(wallets):
+    """Обработчик сервера, который знает только зарегистрированные в нём кошельки."""
+    def handler(action, payload):
+        if action == 'create_wallet':
+            wallets.add(payload['wallet_id'])
+            return ok({'success': True, 'wallet_id': payload['wallet_id'], 'address': '0xabc'})
+        if payload.get('wallet_id') not in wallets:
+            return {'success': False, 'error': f"Кошелёк \"{payload.get('wallet_id')}\" не найден",
+                    'kind': 'unknown_wallet'}
+        return ok({'balance': '1'})
+    return handler
+
+
+def test_registration_lands_on_wallet_server(sdk_env):
+    async def scenario():
+        wallets = [set(), set()]
+        async with FakeIPCServer(wallet_server_handler(wallets[0])) as first, \
+                FakeIPCServer(wallet_server_handler(wallets[1])) as second:
+            results = []
+            for _ in range(8):
+                sdk = DecimalSDK(socket_path=[first.socket_path, second.socket_path])
+                try:
+                    await sdk.create_wallet('word ' * 12)
+                    results.append((await sdk.get_balance('0x1'), await sdk.burn_del(1)))
+                finally:
+                    await sdk.close()
+            registrations = [request['action'] for server in (first, second) for request in server.requests
+                             ].count('create_wallet')
+            return results, registrations, wallets
+
+    results, registrations, wallets = run(scenario())
+    assert results == [({'balance': '1'}, {'balance': '1'})] * 8
+    # Без повторных регистраций: последующие запросы попали на сервер, где кошелёк зарегистрирован
+    assert registrations == 8
+    assert len(wallets[0] | wallets[1]) == 8 and wallets[0] and wallets[1]
+
+
+def test_wallet_is_registered_again_on_unknown_wallet(sdk_env):
+    async def scenario():
+        wallets = set()
+        async with FakeIPCServer(wallet_server_handler(wallets)) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            try:
+                await sdk.create_wallet('word ' * 12, wallet_id='hot-1')
+                # Сервер перезапущен и потерял кошельки
+                wallets.clear()
+                balance = await sdk.get_balance('0x1')
+                wallets.clear()
+                burned = await sdk.burn_del(1)
+            finally:
+                await sdk.close()
+            return balance, burned, [(request['action'], request['payload']) for request in server.requests
+                                     if request['action'] != 'describe_actions']
+
+    balance, burned, requests = run(scenario())
+    assert balance == burned == {'balance': '1'}
+    assert [action for action, _ in requests] == ['create_wallet', 'get_balance', 'create_wallet', 'get_balance',
+                                                  'burn_del', 'create_wallet', 'burn_del']
+    assert all(payload['wallet_id'] == 'hot-1' for _, payload in requests)
+    # Отказ запомнен сервером под первым ключом идемпотентности: повтор идёт с новым
+    assert requests[4][1]['idempotency_key'] != requests[6][1]['idempotency_key']
+
+
+def test_warm_up_reaches_every_server(sdk_env):
+    def handler(action, payload):
+        return ok({'wallets': {wallet_id: {'success': True} for wallet_id in payload.get('wallet_ids', [])}})
+
+    async def scenario():
+        async with FakeIPCServer(handler) as first, FakeIPCServer(handler) as second:
+            sdk = DecimalSDK(socket_path=[first.socket_path, second.socket_path])
+            try:
+                everything = await sdk.warm_up()
+                wallet_ids = [f'w{i}' for i in range(8)]
+                selected = await sdk.warm_up(wallet_ids)
+                owners = {wallet_id: sdk._pool.owner(wallet_id) for wallet_id in wallet_ids}
+            finally:
+                await sdk.close()
+            received = {server.socket_path: [request['payload'] for request in server.requests
+                                             if request['action'] == 'warm_up'] for server in (first, second)}
+            return everything, selected, owners, received
+
+    everything, selected, owners, received = run(scenario())
+    assert everything == {'wallets': {}}
+    assert selected == {'wallets': {f'w{i}': {'success': True} for i in range(8)}}
+    for path, payloads in received.items():
+        assert payloads[0] == {}
+        # Кошелёк прогревается только на сервере, за которым он закреплён
+        assert payloads[1] == {'wallet_ids': [wallet_id for wallet_id, owner in owners.items() if owner == path]}
+        assert all('idempotency_key' not in payload for payload in payloads)
+
+
+@pytest.mark.parametrize('codec', ['json', 'auto'])
+def test_ipc_client_converts_big_numbers(codec):
+    def big_number(wei):
+        return {'type': 'BigNumber', 'hex': hex(wei)}
+
+    stakes = [{'id': str(i), 'amount': big_number(i * 10 ** 18), 'fee': big_number(10 ** 15),
+               'rewards': [big_number(5 * 10 ** 17)], 'meta': {'type': 'stake'}} for i in range(3)]
+
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok(stakes)) as server:
+            client = IPCClient(server.socket_path, codec=codec)
+            try:
+                return await client.send_request('get_stakes', {})
+            finally:
+                await client.close()
+
+    response = run(scenario())
+    assert response['result'] == [{'id': str(i), 'amount': float(i), 'fee': 0.001, 'rewards': [0.5],
+                                   'meta': {'type': 'stake'}} for i in range(3)]
+
+
+def test_cache_ttl_follows_server_policy_and_overrides(sdk_env):
+    token = '0x' + 'ab' * 20
+
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok({'id': payload.get('token_address')})) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, cache_ttl={'get_validators': 0.05})
+            try:
+                first = await sdk.get_token_by_address(token)
+                cached = await sdk.get_token_by_address(token)
+                await sdk.get_validators()
+                await sdk.get_validators()
+                # Срок из cache_ttl SDK сохраняется поверх политики сервера
+                await asyncio.sleep(0.1)
+                await sdk.get_validators()
+                sdk.cache.invalidate('get_token_by_address', {'token_address': token})
+                await sdk.get_token_by_address(token)
+                return first, cached, sdk.cache.ttl, [request['action'] for request in server.requests]
+            finally:
+                await sdk.close()
+
+    first, cached, ttl, actions = run(scenario())
+    assert cached is first
+    assert ttl == {'get_token_by_address': 30, 'get_validators': 0.05}
+    assert actions.count('get_token_by_address') == 2
+    assert actions.count('get_validators') == 2
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('decimal_sdk.cache.time.monotonic', lambda: now[0])
+    cache = ResponseCache(max_size=2, ttl={'get_validator': 10.0, 'get_nft_type': None})
+    keys = [cache.make_key('get_validator', {'validator': name}) for name in 'abc']
+    cache.set(keys[0], 'a')
+    cache.set(keys[1], 'b')
+    assert cache.get(keys[0]) == 'a'
+    cache.set(keys[2], 'c')
+    # Вытесняется давно не использованная запись, а не первая добавленная
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 'a'
+    now[0] += 11
+    assert cache.get(keys[0]) is None
+    forever = cache.make_key('get_nft_type', {'address': '0x1'})
+    cache.set(forever, 'drc721')
+    cache.set(cache.make_key('get_nft_type', {'address': '0x2'}), None)
+    # Пустой результат не сохраняется
+    assert len(cache) == 2
+    now[0] += 10 ** 6
+    assert cache.get(forever) == 'drc721'
+    assert cache.make_key('get_validator', {'a': 1, 'b': 2}) == cache.make_key('get_validator', {'b': 2, 'a': 1})
+    assert not ResponseCache(max_size=0).is_cacheable('get_token_by_address')
+    assert not ResponseCache(ttl={'get_token_by_address': 0}).is_cacheable('get_token_by_address')
+
+
+async def slow(response, delay=0.05):
+    """Ответ сервера, который приходит через delay секунд."""
+    await asyncio.sleep(delay)
+    return response
+
+
+def test_identical_reads_share_one_call(sdk_env):
+    async def handler(action, payload):
+        if payload.get('address') == '0xbad':
+            return await slow({'success': False, 'error': 'bad address', 'kind': 'validation'})
+        return await slow(ok({'action': action, 'address': payload.get('address')}))
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                validators = await asyncio.gather(*(sdk.get_validators() for _ in range(10)))
+                balances = await asyncio.gather(sdk.get_balance('0x1'), sdk.get_balance('0x1'),
+                                                sdk.get_balance('0x2'))
+                # Отмена одного ожидающего не прерывает общий вызов для остальных
+                cancelled = asyncio.ensure_future(sdk.get_balance('0x3'))
+                kept = asyncio.ensure_future(sdk.get_balance('0x3'))
+                await asyncio.sleep(0.01)
+                cancelled.cancel()
+                kept = await kept
+                errors = await asyncio.gather(sdk.get_balance('0xbad'), sdk.get_balance('0xbad'),
+                                              return_exceptions=True)
+                await asyncio.gather(sdk.send_del('0x1', 1), sdk.send_del('0x1', 1))
+            finally:
+                await sdk.close()
+            return validators, balances, kept, errors, [request['action'] for request in server.requests]
+
+    validators, balances, kept, errors, actions = run(scenario())
+    assert all(result is validators[0] for result in validators)
+    assert balances[0] is balances[1] and balances[2]['address'] == '0x2'
+    assert kept['address'] == '0x3'
+    assert [type(error) for error in errors] == [ValidationError, ValidationError]
+    assert actions.count('get_validators') == 1
+    # 0x1, 0x2, 0x3 и 0xbad — по одному запросу; транзакции не объединяются
+    assert actions.count('get_balance') == 4
+    assert actions.count('send_del') == 2
+
+
+def test_coalescing_can_be_disabled(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: slow(ok([]))) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, coalesce=False)
+            try:
+                await asyncio.gather(*(sdk.get_validators() for _ in range(3)))
+            finally:
+                await sdk.close()
+            return [request['action'] for request in server.requests]
+
+    assert run(scenario()).count('get_validators') == 3
+
+
+class Pages:
+    """Постраничный источник записей 0..total-1 со счётчиком одновременных запросов."""
+
+    def __init__(self, total, delay=0.01, slow_from=None):
+        self.total = total
+        self.delay = delay
+        # Страницы с этого смещения отвечают так долго, что их можно только отменить
+        self.slow_from = slow_from
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def fetch(self, limit, offset):
+        self.calls.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            slow = self.slow_from is not None and offset >= self.slow_from
+            delay = self.delay(offset) if callable(self.delay) else self.delay
+            await asyncio.sleep(10 if slow else delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        return list(range(offset, min(offset + limit, self.total)))
+
+
+@pytest.mark.parametrize('total,prefetch', [(25, 1), (30, 2), (0, 1), (7, 0)])
+def test_paginate_streams_records_with_bounded_prefetch(total, prefetch):
+    pages = Pages(total)
+
+    async def scenario():
+        return [record async for record in paginate(pages.fetch, page_size=10, prefetch=prefetch)]
+
+    assert run(scenario()) == list(range(total))
+    assert pages.max_in_flight == max(prefetch, 1)
+    # Полная последняя страница требует ещё одного запроса, чтобы увидеть конец
+    assert pages.calls[:total // 10 + 1] == list(range(0, total // 10 * 10 + 1, 10))
+
+
+def test_paginate_cancels_prefetch_when_loop_ends_early():
+    pages = Pages(100, slow_from=20)
+
+    async def scenario():
+        records = paginate(pages.fetch, page_size=10, prefetch=3)
+        async for record in records:
+            if record == 12:
+                break
+        await records.aclose()
+
+        # Отменённые запросы завершаются на следующем шаге цикла
+        await asyncio.sleep(0)
+
+    run(scenario())
+    assert pages.calls == [0, 10, 20, 30]
+    assert pages.cancelled == 2
+    assert pages.in_flight == 0
+
+
+def test_iter_methods_page_through_sdk_requests(sdk_env):
+    stakes = [{'id': str(i)} for i in range(23)]
+
+    def handler(action, payload):
+        return ok(stakes[payload['skip']:payload['skip'] + payload['first']])
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            try:
+                records = [stake async for stake in sdk.iter_stakes(page_size=10, prefetch=2)]
+            finally:
+                await sdk.close()
+            return records, [request['payload'] for request in server.requests if request['action'] == 'get_stakes']
+
+    records, payloads = run(scenario())
+    assert records == stakes
+    assert sorted((payload['first'], payload['skip']) for payload in payloads) == [(10, 0), (10, 10), (10, 20)]
+
+
+def test_fetch_pages_keeps_offset_order_within_window():
+    # Поздние страницы отвечают раньше ранних
+    pages = Pages(95, delay=lambda offset: 0.05 - offset / 5000, slow_from=110)
+
+    async def scenario():
+        return [page async for page in fetch_pages(pages.fetch, page_size=10, concurrency=4)]
+
+    result = run(scenario())
+    assert [record for page in result for record in page] == list(range(95))
+    assert [len(page) for page in result] == [10] * 9 + [5]
+    assert pages.max_in_flight == 4
+    # Запросы за неполной страницей отменяются, а не ждут ответа
+    beyond = [offset for offset in pages.calls if offset >= 110]
+    assert beyond and pages.cancelled == len(beyond)
+    assert max(pages.calls) < 95 + 10 * 4
+    with pytest.raises(ValueError):
+        run(fetch_pages(pages.fetch, concurrency=0).__anext__())
+
+
+def test_bulk_fetch_covers_paged_actions(sdk_env):
+    stakes = [{'id': str(i)} for i in range(45)]
+
+    def handler(action, payload):
+        assert payload['validator'] == '0x1'
+        return ok(stakes[payload['skip']:payload['skip'] + payload['first']])
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                records = await sdk.fetch_all('get_stakes_by_validator', {'validator': '0x1'},
+                                              page_size=10, concurrency=3)
+                with pytest.raises(ValidationError):
+                    await sdk.fetch_all('get_validators')
+            finally:
+                await sdk.close()
+            return records
+
+    assert run(scenario()) == stakes
+
+
+def test_encryption_key_is_derived_once_and_can_be_supplied(sdk_env, monkeypatch, tmp_path):
+    pytest.importorskip('cryptography')
+    from decimal_sdk.encryption import Encryption, _derive_key_cached
+
+    _derive_key_cached.cache_clear()
+    first = DecimalSDK(socket_path='/tmp/unused.sock').encryption
+    second = DecimalSDK(socket_path='/tmp/unused.sock').encryption
+    # PBKDF2 выполняется один раз на пароль за время жизни процесса
+    assert _derive_key_cached.cache_info().misses == 1
+    token = first.encrypt('seed phrase')
+    assert second.decrypt(token) == 'seed phrase'
+
+    derived = Encryption.derive_fernet_key('test-key')
+    key_file = tmp_path / 'fernet.key'
+    key_file.write_text(derived + '\n')
+    monkeypatch.delenv('ENCRYPTION_KEY')
+    for name, value in (('ENCRYPTION_FERNET_KEY', derived), ('ENCRYPTION_KEY_FILE', str(key_file))):
+        with monkeypatch.context() as env:
+            env.setenv(name, value)
+            get_config.cache_clear()
+            _derive_key_cached.cache_clear()
+            assert DecimalSDK(socket_path='/tmp/unused.sock').encryption.decrypt(token) == 'seed phrase'
+            # Готовый ключ не требует PBKDF2
+            assert _derive_key_cached.cache_info().misses == 0
+    with pytest.raises(ValueError):
+        Encryption()
+
+
+def test_admission_limits_each_action_class(sdk_env):
+    active = {'get_balance': 0, 'get_validators': 0}
+    peak = dict(active)
+
+    async def handler(action, payload):
+        active[action] += 1
+        peak[action] = max(peak[action], active[action])
+        await asyncio.sleep(0.02)
+        active[action] -= 1
+        return ok(payload.get('address'))
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, concurrency={'rpc_read': 2, 'subgraph_read': None})
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                balances = asyncio.gather(*(sdk.get_balance(f'0x{i}') for i in range(8)))
+                await asyncio.sleep(0.005)
+                # Очередь RPC-чтений не задерживает чтения Subgraph
+                await sdk.get_validators()
+                waiting = not balances.done()
+                return waiting, await balances, sdk.admission.stats()['rpc_read']
+            finally:
+                await sdk.close()
+
+    waiting, balances, stats = run(scenario())
+    assert waiting
+    assert balances == [f'0x{i}' for i in range(8)]
+    assert peak['get_balance'] == 2
+    assert stats['admitted'] == 8 and stats['in_flight'] == 0 and stats['peak_queued'] == 6
+
+
+def test_full_queue_rejects_with_overload(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: slow(ok(payload.get('address')))) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, concurrency={'rpc_read': 1}, queue_size=1)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                results = await asyncio.gather(*(sdk.get_balance(f'0x{i}') for i in range(4)),
+                                               return_exceptions=True)
+                return results, sdk.admission.stats()['rpc_read']
+            finally:
+                await sdk.close()
+
+    results, stats = run(scenario())
+    assert results[:2] == ['0x0', '0x1']
+    assert [type(result) for result in results[2:]] == [OverloadError, OverloadError]
+    assert stats['rejected'] == 2
+
+
+def test_gate_hands_slot_past_cancelled_waiter():
+    async def scenario():
+        admission = AdmissionController({'write': 1})
+        order = []
+
+        async def write(name, hold=None):
+            async with admission.slot('write'):
+                order.append(name)
+                if hold is not None:
+                    await hold
+
+        release = asyncio.get_running_loop().create_future()
+        first = asyncio.ensure_future(write('first', release))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(write(name)) for name in ('second', 'third', 'fourth')]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        release.set_result(None)
+        # Место, переданное отменённому ожидающему, переходит следующему
+        waiters[1].cancel()
+        await asyncio.gather(first, *waiters, return_exceptions=True)
+        return order, admission.stats()['write']
+
+    order, stats = run(scenario())
+    assert order == ['first', 'fourth']
+    assert stats['in_flight'] == 0 and stats['queued'] == 0
+    with pytest.raises(ValueError):
+        AdmissionController({'write': 0})
+
+
+def test_reads_retry_and_writes_keep_idempotency_key(sdk_env, monkeypatch):
+    monkeypatch.setenv('IPC_RETRY_BASE_DELAY', '0.001')
+    failures = {'get_validators': 2, 'get_balance': 1, 'send_del': 1, 'burn_del': 1}
+
+    def handler(action, payload):
+        if failures.get(action):
+            failures[action] -= 1
+            if action == 'send_del':
+                return None
+            kind = 'validation' if action == 'get_balance' else 'upstream'
+            return {'success': False, 'error': 'node timeout', 'kind': kind}
+        return ok({'success': True, 'transactionHash': '0xhash'} if action.endswith('_del') else [])
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, retries=2)
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            try:
+                validators = await sdk.get_validators()
+                with pytest.raises(ValidationError):
+                    await sdk.get_balance('0x1')
+                sent = await sdk.send_del('0x1', 1)
+                # Ошибка узла не говорит, попала ли транзакция в сеть: транзакция не повторяется
+                with pytest.raises(IPCError):
+                    await sdk.burn_del(1)
+            finally:
+                await sdk.close()
+            return validators, sent, server.requests
+
+    validators, sent, requests = run(scenario())
+    actions = [request['action'] for request in requests]
+    assert validators == []
+    assert sent == (True, '0xhash')
+    assert (actions.count('get_validators'), actions.count('get_balance')) == (3, 1)
+    assert actions.count('burn_del') == 1
+    # Повтор после обрыва соединения идёт с тем же ключом идемпотентности
+    keys = {request['payload']['idempotency_key'] for request in requests if request['action'] == 'send_del'}
+    assert actions.count('send_del') == 2 and len(keys) == 1
+
+
+def test_breaker_opens_after_repeated_failures(sdk_env, monkeypatch):
+    monkeypatch.setenv('IPC_BREAKER_THRESHOLD', '2')
+    monkeypatch.setenv('IPC_BREAKER_RESET', '0.05')
+    failing = [True]
+
+    def handler(action, payload):
+        if failing[0]:
+            return {'success': False, 'error': 'subgraph unavailable', 'kind': 'upstream'}
+        return ok([])
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path, retries=0)
+            try:
+                for _ in range(2):
+                    with pytest.raises(IPCError):
+                        await sdk.get_validators()
+                with pytest.raises(CircuitOpenError):
+                    await sdk.get_validators()
+                sent_while_open = [request['action'] for request in server.requests].count('get_validators')
+                failing[0] = False
+                await asyncio.sleep(0.06)
+                # Пробный запрос после срока открытия закрывает автомат
+                result = await sdk.get_validators()
+                return sent_while_open, result, sdk.breakers['subgraph_read'].stats()
+            finally:
+                await sdk.close()
+
+    sent_while_open, result, stats = run(scenario())
+    assert sent_while_open == 2
+    assert result == []
+    assert stats['state'] == 'closed' and stats['rejected'] == 1
+
+
+def test_breaker_probe_and_backoff(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('decimal_sdk.retry.time.monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=1.0, max_reset_timeout=3.0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+    now[0] = 1.0
+    # Полуоткрытый автомат пропускает один пробный запрос
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.retry_after() == 2.0
+    now[0] = 3.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.retry_after() == 3.0
+    now[0] = 6.0
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.stats()['state'] == 'closed' and breaker.trips == 0
+
+    policy = RetryPolicy(retries=3, base_delay=0.1, max_delay=0.3)
+    assert all(0 <= policy.delay(attempt) <= min(0.3, 0.1 * 2 ** attempt) for attempt in range(6) for _ in range(20))
+    with pytest.raises(ValueError):
+        RetryPolicy(retries=-1)
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+# Зависимости, которые загружаются при первом обращении, а не при `import decimal_sdk`
+LAZY_MODULES = ('asyncio', 'cryptography', 'dotenv', 'numpy', 'orjson', 'msgspec', 'msgpack',
+                'decimal_sdk.client', 'decimal_sdk.encryption', 'decimal_sdk.config')
+
+
+def test_import_does_not_load_heavy_modules():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (ROOT, os.environ.get('PYTHONPATH')))))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import decimal_sdk'],
+                               cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    loaded = {line.rsplit('|', 1)[-1].strip() for line in completed.stderr.splitlines()
+              if line.startswith('import time:')}
+    assert 'decimal_sdk' in loaded
+    eager = [name for name in LAZY_MODULES if name in loaded or any(m.startswith(name + '.') for m in loaded)]
+    assert eager == []
@@ -0,0 +1,215 @@
+import base64
+
+import pytest
+
+from conftest import run_node
+from decimal_sdk.codec import get_codec
+
+
+def test_balance_handlers_return_balance():
+    result = run_node('''
+        const { ACTIONS } = require('./ipc-server.js');
+        const wei = 1500000000000000000n;
+        const decimalEVM = {
+            getBalance: async () => wei,
+            getBalanceETH: async () => wei,
+            getBalanceBNB: async () => wei,
+            formatEther: (value) => (Number(value) / 1e18).toString(),
+        };
+        (async () => {
+            const result = {};
+            for (const name of ['get_balance', 'get_balance_eth', 'get_balance_bnb']) {
+                result[name] = await ACTIONS.get(name).handler({ payload: { address: '0x1' }, decimalEVM });
+            }
+            console.log(JSON.stringify(result));
+        })();
+    ''')
+    assert result == {name: {'balance': '1.5'} for name in ('get_balance', 'get_balance_eth', 'get_balance_bnb')}
+
+
+def test_unencodable_result_becomes_error():
+    result = run_node('''
+        const { encodeResponse } = require('./ipc-server.js');
+        const circular = {};
+        circular.self = circular;
+        const responses = [{ value: 1n }, circular].map((result) =>
+            JSON.parse(encodeResponse({ id: 7, success: true, result }, 'json').toString()));
+        console.log(JSON.stringify(responses));
+    ''')
+    for response in result:
+        assert response['id'] == 7
+        assert response['success'] is False
+        assert response['error'].startswith('Не удалось закодировать ответ')
+
+
+def test_unregistered_wallet_has_own_kind():
+    result = run_node('''
+        const { executeRequest } = require('./ipc-server.js');
+        executeRequest({ id: 3, action: 'get_balance', payload: { wallet_id: 'missing', address: '0x1' } })
+            .then((response) => console.log(JSON.stringify(response)));
+    ''')
+    assert result['success'] is False
+    assert result['kind'] == 'unknown_wallet'
+
+
+# Ответ транзакции ethers: BigNumber, вложенные объекты и функции
+TRANSACTION_RESPONSE = '''
+    const bigNumber = (hex) => ({ _hex: hex, _isBigNumber: true, toString: () => BigInt(hex).toString(),
+                                  toJSON: () => ({ type: 'BigNumber', hex }) });
+    const transaction = {
+        hash: '0xabc',
+        nonce: 3,
+        value: bigNumber('0x0de0b6b3a7640000'),
+        gasLimit: bigNumber('0x5208'),
+        accessList: [],
+        chainId: 75,
+        data: undefined,
+        timestamp: new Date(0),
+        confirmations: 0,
+        wait: async (confirms) => null,
+    };
+'''
+
+
+def test_wire_value_matches_json():
+    result = run_node(TRANSACTION_RESPONSE + '''
+        const { toWireValue } = require('./ipc-server.js');
+        const wire = toWireValue({ id: 1, success: true, result: [transaction, () => null] });
+        console.log(JSON.stringify({
+            bigNumberKept: wire.result[0].value === transaction.value,
+            keys: Object.keys(wire.result[0]).sort(),
+            timestamp: wire.result[0].timestamp,
+            items: wire.result.length,
+            function: wire.result[1],
+        }));
+    ''')
+    assert result['bigNumberKept'] is True
+    assert 'wait' not in result['keys'] and 'data' not in result['keys']
+    assert result['timestamp'] == '1970-01-01T00:00:00.000Z'
+    assert result['items'] == 2 and result['function'] is None
+
+
+def test_msgpack_transaction_response():
+    pytest.importorskip('msgpack')
+    result = run_node(TRANSACTION_RESPONSE + '''
+        const { encodeResponse } = require('./ipc-server.js');
+        let msgpackInstalled = true;
+        try { require.resolve('@msgpack/msgpack'); } catch (err) { msgpackInstalled = false; }
+        const body = msgpackInstalled ? encodeResponse({ id: 1, success: true, result: transaction }, 'msgpack') : null;
+        console.log(JSON.stringify(body && body.toString('base64')));
+    ''')
+    if result is None:
+        pytest.skip('@msgpack/msgpack не установлен')
+    response = get_codec('msgpack').decode(base64.b64decode(result))
+    assert response['success'] is True
+    assert response['result']['value'] == 10 ** 18
+    assert response['result']['gasLimit'] == 21000
+    assert 'wait' not in response['result']
+
+
+# Подписант с управляемым getTransactionCount: ответы из очереди counts,
+# а когда она пуста — текущее значение pending
+NONCE_SIGNER = '''
+    const { NonceManager } = require('./ipc-server.js');
+    const deferred = () => {
+        let resolve, reject;
+        const promise = new Promise((ok, fail) => { resolve = ok; reject = fail; });
+        return { promise, resolve, reject };
+    };
+    const signer = {
+        pending: 0,
+        counts: [],
+        getTransactionCount() {
+            return this.counts.length ? this.counts.shift().promise : Promise.resolve(this.pending);
+        },
+    };
+    const manager = new NonceManager(signer);
+'''
+
+
+def test_nonce_concurrent_allocation_is_unique():
+    result = run_node(NONCE_SIGNER + '''
+        signer.pending = 5;
+        Promise.all(Array.from({ length: 10 }, () => manager.send(async (nonce) => ({ nonce }))))
+            .then((responses) => console.log(JSON.stringify(responses.map(({ nonce }) => nonce))));
+    ''')
+    assert sorted(result) == list(range(5, 15))
+
+
+def test_nonce_failed_send_becomes_gap():
+    result = run_node(NONCE_SIGNER + '''
+        (async () => {
+            const first = await manager.send(async (nonce) => ({ nonce }));
+            signer.pending = 1;
+            const failed = await manager.send(async () => { throw new Error('rejected'); }).catch((err) => err.message);
+            const gaps = manager.state().gaps;
+            const next = await manager.send(async (nonce) => ({ nonce }));
+            console.log(JSON.stringify({ first: first.nonce, failed, gaps, next: next.nonce }));
+        })();
+    ''')
+    assert result == {'first': 0, 'failed': 'rejected', 'gaps': [1], 'next': 1}
+
+
+def test_nonce_failure_after_sync_scan_is_not_lost():
+    result = run_node(NONCE_SIGNER + '''
+        (async () => {
+            const sends = [deferred(), deferred()];
+            const first = manager.send((nonce) => sends[0].promise);
+            const second = manager.send((nonce) => sends[1].promise).catch(() => null);
+            await new Promise((resolve) => setImmediate(resolve));
+            // Сверка просканирует пропуски раньше, чем ошибка второй отправки освободит nonce 1
+            const count = deferred();
+            signer.counts.push(count);
+            const sync = manager.sync();
+            count.resolve(0);
+            sends[1].reject(new Error('rejected'));
+            await Promise.all([sync, second]);
+            const third = await manager.send(async (nonce) => ({ nonce }));
+            sends[0].resolve({ nonce: 0 });
+            await first;
+            console.log(JSON.stringify({ third: third.nonce, state: manager.state() }));
+        })();
+    ''')
+    assert result['third'] == 1
+    assert result['state']['gaps'] == []
+
+
+def test_frame_decoder_reassembles_fragments():
+    result = run_node('''
+        const { FrameDecoder } = require('./ipc-server.js');
+        const frame = (text) => {
+            const body = Buffer.from(text);
+            const header = Buffer.alloc(4);
+            header.writeUInt32BE(body.length, 0);
+            return Buffer.concat([header, body]);
+        };
+        // Кадр больше начального буфера, разрезанный на фрагменты, и два кадра в одном фрагменте
+        const stream = Buffer.concat([frame('a'.repeat(200000)), frame('b'), frame('cc')]);
+        const decoder = new FrameDecoder(1 << 20);
+        const frames = [];
+        const onFrame = (buffer, start, end) => frames.push(buffer.toString('utf8', start, end));
+        for (let offset = 0; offset < stream.length; offset += 7000) {
+            decoder.push(stream.subarray(offset, offset + 7000), onFrame);
+        }
+        let oversized = null;
+        try {
+            new FrameDecoder(10).push(frame('x'.repeat(11)), onFrame);
+        } catch (err) {
+            oversized = err.message;
+        }
+        console.log(JSON.stringify({ lengths: frames.map((text) => text.length), tail: frames.slice(1), oversized }));
+    ''')
+    assert result['lengths'] == [200000, 1, 2]
+    assert result['tail'] == ['b', 'cc']
+    assert 'превышает лимит' in result['oversized']
+
+
+def test_oversized_response_becomes_error():
+    result = run_node('''
+        const { encodeResponse } = require('./ipc-server.js');
+        const body = encodeResponse({ id: 5, success: true, result: 'x'.repeat(1000) }, 'json');
+        console.log(body.toString());
+    ''', IPC_MAX_MESSAGE_SIZE='200')
+    assert result['id'] == 5
+    assert result['success'] is False
+    assert 'превышает лимит' in result['error']
@@ -0,0 +1,60 @@
+import pytest
+
+from conftest import FakeIPCServer, ok, run
+from decimal_sdk import DecimalSDK
+from decimal_sdk.exceptions import IPCConnectionError
+from decimal_sdk.payouts import PayoutEngine
+
+ROWS = [('0x1', None, '1.5'), ('0x2', None, '2')]
+
+
+async def payout(socket_path, journal):
+    """Один запуск выплат: результаты строк и исключение, которым завершился запуск."""
+    sdk = DecimalSDK(socket_path=socket_path)
+    sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+    results, error = [], None
+    try:
+        async for result in PayoutEngine(sdk, journal).run(ROWS):
+            results.append(result)
+    except IPCConnectionError as e:
+        error = e
+    finally:
+        await sdk.close()
+    return results, error
+
+
+@pytest.mark.parametrize('kind', ['upstream', 'unavailable', 'action'])
+def test_unknown_outcome_is_not_resent(sdk_env, tmp_path, kind):
+    journal = str(tmp_path / 'payouts.journal')
+
+    async def scenario():
+        failure = {'success': False, 'error': 'socket hang up', 'kind': kind}
+        async with FakeIPCServer(lambda action, payload: failure) as server:
+            first = await payout(server.socket_path, journal)
+            second = await payout(server.socket_path, journal)
+            return first, second, [request['action'] for request in server.requests].count('multi_send_token')
+
+    (first, first_error), (second, _), sends = run(scenario())
+    # Транзакция могла попасть в сеть до ошибки: пакет не отправляется повторно
+    assert sends == 1
+    assert [result['status'] for result in first] == ['unknown', 'unknown']
+    assert first_error is not None
+    assert [result['status'] for result in second] == ['unknown', 'unknown']
+
+
+def test_rejected_transaction_is_resent(sdk_env, tmp_path):
+    journal = str(tmp_path / 'payouts.journal')
+    responses = [{'success': False, 'error': 'insufficient funds', 'kind': 'transaction'},
+                 ok({'transactionHash': '0xhash'})]
+
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: responses.pop(0)) as server:
+            first = await payout(server.socket_path, journal)
+            second = await payout(server.socket_path, journal)
+            return first, second
+
+    (first, first_error), (second, _) = run(scenario())
+    assert [result['status'] for result in first] == ['failed', 'failed']
+    assert first_error is None
+    assert [result['status'] for result in second] == ['sent', 'sent']
+    assert second[0]['tx_hash'] == '0xhash'
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import socket
+import zlib
+
+import pytest
+
+from conftest import FakeIPCServer, ok, run
+from decimal_sdk.codec import get_codec
+from decimal_sdk.exceptions import CircuitOpenError, IPCConnectionError, RequestNotSentError
+from decimal_sdk.pool import BalancedPool, ConnectionPool
+
+
+def test_wallet_request_does_not_fail_over():
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: {'success': True, 'result': payload}) as server:
+            dead = os.path.join(os.path.dirname(server.socket_path), 'dead.sock')
+            pool = BalancedPool([server.socket_path, dead], codec=get_codec('json'))
+            # Кошелёк, закреплённый рендеву-хешированием за недоступным сервером
+            wallet_id = next(f'w{i}' for i in range(100)
+                             if zlib.crc32(f'w{i}\0{dead}'.encode()) > zlib.crc32(f'w{i}\0{server.socket_path}'.encode()))
+            write = {'action': 'send_del', 'payload': {'wallet_id': wallet_id, 'idempotency_key': 'k'}}
+            try:
+                with pytest.raises(IPCConnectionError) as connect_error:
+                    await pool.request(write)
+                with pytest.raises(CircuitOpenError):
+                    await pool.request(write)
+                stateless = await pool.request({'action': 'get_validators', 'payload': {}})
+            finally:
+                await pool.close()
+            return connect_error.value, stateless, [request['action'] for request in server.requests]
+
+    connect_error, stateless, actions = run(scenario())
+    assert not isinstance(connect_error, CircuitOpenError)
+    assert stateless['success'] is True
+    assert 'send_del' not in actions
+
+
+def silent_server(path):
+    """Сервер, который принимает соединения, но не отвечает на запросы."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+    return listener
+
+
+def test_idle_connection_is_closed_without_traffic():
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok(payload)) as server:
+            pool = ConnectionPool(server.socket_path, idle_timeout=0.05, codec=get_codec('json'))
+            try:
+                conn = await pool.acquire()
+                await conn.request({'action': 'get_validators', 'payload': {}})
+                # Новых запросов нет: соединение закрывает таймер пула
+                await asyncio.sleep(0.3)
+                return conn.is_healthy()
+            finally:
+                await pool.close()
+
+    assert run(scenario()) is False
+
+
+def test_idle_connection_to_silent_server_is_replaced(tmp_path):
+    listener = silent_server(str(tmp_path / 'ipc.sock'))
+
+    async def scenario():
+        pool = ConnectionPool(listener.getsockname(), health_check_interval=0.01, connect_timeout=0.1,
+                              codec=get_codec('json'))
+        try:
+            first = await pool.acquire()
+            await asyncio.sleep(0.05)
+            # Сервер не отвечает на ping: вместо простаивавшего соединения открывается новое
+            second = await pool.acquire()
+            return first, second
+        finally:
+            await pool.close()
+
+    try:
+        first, second = run(scenario())
+    finally:
+        listener.close()
+    assert second is not first
+    assert not first.is_healthy()
+
+
+def test_new_event_loop_closes_stale_connections(tmp_path):
+    listener = silent_server(str(tmp_path / 'ipc.sock'))
+    pool = ConnectionPool(listener.getsockname(), codec=get_codec('json'))
+    previous = asyncio.new_event_loop()
+    try:
+        stale = previous.run_until_complete(pool.acquire())
+        fresh = run(pool.acquire())
+        # Прежний цикл завершает отменённое чтение
+        previous.run_until_complete(asyncio.sleep(0))
+    finally:
+        previous.close()
+        listener.close()
+    assert fresh is not stale
+    # Сокет прежнего цикла закрыт сразу, а не оставлен сборщику мусора
+    assert stale.sock.fileno() == -1
+
+
+def test_large_response_arrives_whole():
+    page = [{'id': str(i), 'data': 'x' * 100} for i in range(30000)]
+
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok(page)) as server:
+            pool = ConnectionPool(server.socket_path, codec=get_codec('json'))
+            try:
+                return await pool.request({'action': 'get_stakes', 'payload': {}})
+            finally:
+                await pool.close()
+
+    # Ответ в несколько мегабайт приходит многими фрагментами и собирается в один кадр
+    assert run(scenario())['result'] == page
+
+
+def test_message_size_limit():
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok('x' * 4096)) as server:
+            pool = ConnectionPool(server.socket_path, max_message_size=1024, codec=get_codec('json'))
+            try:
+                with pytest.raises(RequestNotSentError):
+                    await pool.request({'action': 'get_validators', 'payload': {'data': 'x' * 2048}})
+                with pytest.raises(IPCConnectionError) as response_error:
+                    await pool.request({'action': 'get_validators', 'payload': {}})
+            finally:
+                await pool.close()
+            return response_error.value, len(server.requests)
+
+    response_error, requests = run(scenario())
+    assert 'IPC_MAX_MESSAGE_SIZE' in str(response_error)
+    # Слишком большой запрос не покидает клиент
+    assert requests == 1
@@ -0,0 +1,156 @@
+import pytest
+
+from conftest import FakeIPCServer, ok, run
+from decimal_sdk import DecimalSDK
+from decimal_sdk.exceptions import ValidationError
+from decimal_sdk.quotes import WEI, BondingCurve, quote_ladder, to_wei, units_to_wei
+
+TOKEN = '0x' + 'ab' * 20
+# Состояние токена в формате get_token_by_address: BigInt-поля Subgraph в wei
+STATE = {'address': TOKEN, 'reserve': str(1000 * WEI), 'supply': str(10 ** 6 * WEI), 'crr': '50'}
+
+# Ответы calculate_* сервера для STATE: (действие, сумма в DEL/токенах, результат в wei).
+# При CRR 50 кривая квадратичная, поэтому значения считаются точно в целых числах
+VECTORS = [
+    ('calculate_buy_output', 210, 100_000 * WEI),
+    ('calculate_buy_output', 1, 499875062460964823258),
+    ('calculate_buy_input', 100_000, 210 * WEI),
+    ('calculate_buy_input', 1, 2000001000000000),
+    ('calculate_sell_output', 190_000, 3439 * WEI // 10),
+    ('calculate_sell_output', 1, 1999999000000000),
+    ('calculate_sell_input', 190, 100_000 * WEI),
+    ('calculate_sell_input', 1, 500125062539089864274),
+]
+
+CURVE_METHODS = {
+    'calculate_buy_output': BondingCurve.buy_output,
+    'calculate_buy_input': BondingCurve.buy_input,
+    'calculate_sell_output': BondingCurve.sell_output,
+    'calculate_sell_input': BondingCurve.sell_input,
+}
+
+
+def quote_handler(action, payload):
+    if action == 'get_token_by_address':
+        return ok(STATE)
+    amount = payload.get('amount_del', payload.get('amount_tokens'))
+    for name, vector_amount, expected in VECTORS:
+        if name == action and vector_amount == amount:
+            return ok({'type': 'BigNumber', 'hex': hex(expected)})
+    return {'success': False, 'error': f'Нет вектора для {action}', 'kind': 'action'}
+
+
+@pytest.mark.parametrize('action,amount,expected', VECTORS)
+def test_curve_matches_server_vectors(action, amount, expected):
+    curve = BondingCurve.from_token(STATE)
+    assert CURVE_METHODS[action](curve, amount * WEI) == expected
+
+
+def test_quote_engine_matches_server_calculations(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(quote_handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            # calculate_* читают контракт через EVM и требуют кошелёк
+            sdk.wallet_id, sdk.wallet_address = 'w1', '0x4'
+            quotes = sdk.quote_engine()
+            pairs = []
+            for action, amount, _ in VECTORS:
+                remote = to_wei(await getattr(sdk, action)(TOKEN, amount), 'wei')
+                local = await getattr(quotes, action)(TOKEN, amount)
+                pairs.append((local, remote / WEI))
+            await sdk.close()
+            loads = [request['action'] for request in server.requests].count('get_token_by_address')
+            return pairs, loads
+
+    pairs, loads = run(scenario())
+    assert [local for local, _ in pairs] == [remote for _, remote in pairs]
+    # Состояние кривой загружается один раз на все котировки
+    assert loads == 1
+
+
+@pytest.mark.parametrize('value,unit,expected', [
+    ('1000', 'wei', 1000),
+    (1000, 'wei', 1000),
+    ({'type': 'BigNumber', 'hex': '0x3e8'}, 'wei', 1000),
+    ({'type': 'BigNumber', 'hex': '0x3e8'}, 'ether', 1000),
+    ('1000', 'ether', 1000 * WEI),
+    ('1.5', 'ether', 15 * WEI // 10),
+    (0.1, 'ether', WEI // 10),
+    ('0.000000000000000001', 'ether', 1),
+    ('0.0000000000000000019', 'ether', 1),
+    (str(2 ** 256 - 1), 'wei', 2 ** 256 - 1),
+])
+def test_to_wei(value, unit, expected):
+    assert to_wei(value, unit) == expected
+
+
+@pytest.mark.parametrize('value,unit', [
+    ('1.5', 'wei'),
+    ('1e18', 'wei'),
+    ('-1', 'wei'),
+    (1.0, 'wei'),
+    (True, 'wei'),
+    ('', 'ether'),
+    ('abc', 'ether'),
+    ('nan', 'ether'),
+    ('1000', 'gwei'),
+])
+def test_to_wei_rejects_ambiguous_values(value, unit):
+    with pytest.raises(ValidationError):
+        to_wei(value, unit)
+
+
+def test_token_state_with_fractional_reserve_is_rejected():
+    with pytest.raises(ValidationError):
+        BondingCurve.from_token({**STATE, 'reserve': '1000.5'})
+
+
+LADDER_METHODS = {
+    'buy_output': BondingCurve.buy_output,
+    'buy_input': BondingCurve.buy_input,
+    'sell_output': BondingCurve.sell_output,
+    'sell_input': BondingCurve.sell_input,
+}
+
+
+@pytest.mark.parametrize('side', sorted(LADDER_METHODS))
+def test_ladder_matches_exact_curve(side):
+    np = pytest.importorskip('numpy')
+    curves = [BondingCurve.from_token(STATE), BondingCurve(50_000 * WEI, 3 * 10 ** 7 * WEI, 15)]
+    amounts = [1e-6, 0.5, 1, 199.9, 999]
+    ladder = quote_ladder(curves, amounts, side)
+    assert ladder.shape == (2, len(amounts))
+    exact = np.array([[LADDER_METHODS[side](curve, units_to_wei(amount)) / WEI for amount in amounts]
+                      for curve in curves])
+    # Точный расчёт округляет до wei, поэтому малые суммы сравниваются с допуском в 1 wei
+    np.testing.assert_allclose(ladder, exact, rtol=1e-12, atol=1 / WEI)
+
+
+def test_ladder_marks_impossible_sells():
+    np = pytest.importorskip('numpy')
+    curve = BondingCurve.from_token(STATE)
+    assert np.isnan(quote_ladder([curve], [2_000_000], 'sell_output')[0, 0])
+    assert np.isnan(quote_ladder([curve], [2000], 'sell_input')[0, 0])
+    with pytest.raises(ValidationError):
+        quote_ladder([curve], [1], 'buy')
+
+
+def test_engine_ladder_shapes(sdk_env):
+    pytest.importorskip('numpy')
+
+    async def scenario():
+        async with FakeIPCServer(quote_handler) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            quotes = sdk.quote_engine()
+            try:
+                single = await quotes.ladder(TOKEN, [1, 2, 3])
+                several = await quotes.ladder([TOKEN, TOKEN.upper().replace('0X', '0x')], [1, 2, 3], 'sell_output')
+            finally:
+                await sdk.close()
+            return single, several, [request['action'] for request in server.requests]
+
+    single, several, actions = run(scenario())
+    assert single.shape == (3,)
+    assert several.shape == (2, 3)
+    # Адрес в другом регистре — тот же токен
+    assert actions.count('get_token_by_address') == 1
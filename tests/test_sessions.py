@@ -0,0 +1,73 @@
+import asyncio
+
+from conftest import FakeIPCServer, ok, run
+from decimal_sdk import DecimalSDK
+from decimal_sdk.sessions import WalletSessions
+
+
+def test_session_shares_sdk_state(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok({'balance': payload['address']})) as server:
+            sdk = DecimalSDK(socket_path=server.socket_path)
+            sessions = WalletSessions(sdk)
+            session = sessions.attach('w1', '0x1')
+            try:
+                # Реестр загружается и шифрование создаётся уже после создания сессии
+                balance = await session.get_balance('0x2')
+                async with session.batch() as batch:
+                    batched = batch.get_balance('0x3')
+                return session, sdk, balance, batched.result(), server.requests[-1]
+            finally:
+                await sessions.close()
+
+    session, sdk, balance, batched, request = run(scenario())
+    assert balance == {'balance': '0x2'}
+    assert batched == {'balance': '0x3'}
+    assert request['payload']['wallet_id'] == 'w1'
+    assert sdk.actions.loaded
+    assert session.actions is sdk.actions
+    assert session.encryption is sdk.encryption
+    assert (session.wallet_id, sdk.wallet_id) == ('w1', None)
+
+
+def test_register_goes_through_send_request(sdk_env):
+    async def scenario():
+        async with FakeIPCServer(lambda action, payload: ok({'address': '0xabc'})) as server:
+            sessions = WalletSessions(DecimalSDK(socket_path=server.socket_path))
+            try:
+                session = await sessions.register('hot-1', 'word ' * 12)
+                return session, sessions.sdk, server.requests[-1]
+            finally:
+                await sessions.close()
+
+    session, sdk, request = run(scenario())
+    assert (session.wallet_id, session.wallet_address) == ('hot-1', '0xabc')
+    assert request['action'] == 'create_wallet'
+    assert request['payload']['wallet_id'] == 'hot-1'
+    # Ключ идемпотентности и учёт в контроле нагрузки добавляет _send_request
+    assert 'idempotency_key' in request['payload']
+    assert sdk.admission.stats()['write']['admitted'] == 1
+
+
+def test_wallet_scoped_reads_are_kept_per_wallet(sdk_env):
+    def handler(action, payload):
+        return ok({'registered': payload['wallet_id'] == 'w1'})
+
+    async def scenario():
+        async with FakeIPCServer(handler) as server:
+            sessions = WalletSessions(DecimalSDK(socket_path=server.socket_path,
+                                                 cache_ttl={'is_wallet_registered': 60}))
+            first, second = sessions.attach('w1', '0x1'), sessions.attach('w2', '0x2')
+            try:
+                # Одновременные запросы разных кошельков не объединяются в один вызов
+                together = await asyncio.gather(first.is_wallet_registered(), second.is_wallet_registered())
+                cached = await first.is_wallet_registered(), await second.is_wallet_registered()
+                return together, cached, [request['payload']['wallet_id'] for request in server.requests
+                                          if request['action'] == 'is_wallet_registered']
+            finally:
+                await sessions.close()
+
+    together, cached, wallets = run(scenario())
+    assert [result['registered'] for result in together] == [True, False]
+    assert [result['registered'] for result in cached] == [True, False]
+    assert sorted(wallets) == ['w1', 'w2']
@@ -0,0 +1,107 @@
+from conftest import FakeIPCServer, ok, run
+from decimal_sdk import DecimalSDK
+from decimal_sdk.store import LocalStore
+
+
+class Subgraph:
+    """Данные Subgraph для тестового сервера и журнал полученных запросов."""
+
+    def __init__(self):
+        self.validators = [{'id': '0xAA'}]
+        self.stakes = [{'id': f's{i}', 'validator': {'id': '0xAA'}, 'delegator': '0xD', 'amount': '1'}
+                       for i in range(5)]
+        self.tokens = [{'id': '0xt1', 'symbol': 'tok', 'creator': {'id': '0xC'}, 'blockNumber': '7'}]
+        self.penalties = [{'id': 'p1', 'validator': {'id': '0xAA'}, 'blockNumber': '3'},
+                          {'id': 'p2', 'validator': {'id': '0xAA'}, 'blockNumber': '8'}]
+        self.calls = []
+
+    def handler(self, action, payload):
+        self.calls.append((action, payload))
+        if action == 'get_validators':
+            return ok(self.validators)
+        if action == 'get_validator_penalties_from_block':
+            records = [penalty for penalty in self.penalties
+                       if int(penalty['blockNumber']) >= payload['blockNumber']]
+        else:
+            records = {'get_stakes': self.stakes, 'get_tokens': self.tokens}.get(action, [])
+        return ok(records[payload['skip']:payload['skip'] + payload['first']])
+
+
+async def sync(socket_path, path, **kwargs):
+    # Без кошелька: индекс читает только Subgraph
+    sdk = DecimalSDK(socket_path=socket_path)
+    store = LocalStore(sdk, path, page_size=2)
+    try:
+        return await store.sync(**kwargs)
+    finally:
+        await store.close()
+        await sdk.close()
+
+
+def penalty_requests(calls):
+    """Блоки, с которых запрашивались штрафы (по первой странице каждой выгрузки)."""
+    return [payload['blockNumber'] for action, payload in calls
+            if action == 'get_validator_penalties_from_block' and payload['skip'] == 0]
+
+
+def test_sync_writes_only_changes(sdk_env, tmp_path):
+    subgraph = Subgraph()
+    path = str(tmp_path / 'index.sqlite3')
+
+    async def scenario():
+        async with FakeIPCServer(subgraph.handler) as server:
+            first = await sync(server.socket_path, path)
+            subgraph.stakes[1] = {**subgraph.stakes[1], 'amount': '2'}
+            del subgraph.stakes[3]
+            subgraph.penalties.append({'id': 'p3', 'validator': {'id': '0xAA'}, 'blockNumber': '12'})
+            subgraph.calls.clear()
+            second = await sync(server.socket_path, path)
+        store = LocalStore(None, path)
+        try:
+            stakes = await store.get_stakes_by_validator('0xaa')
+            return first, second, stakes, await store.last_synced('penalties'), await store.last_synced('tokens')
+        finally:
+            await store.close()
+
+    first, second, stakes, penalties_state, tokens_state = run(scenario())
+    assert first == {'validators': 1, 'stakes': 5, 'tokens': 1, 'transfer_stakes': 0,
+                     'withdraw_stakes': 0, 'penalties': 2}
+    assert second == {'validators': 0, 'stakes': 1, 'tokens': 0, 'transfer_stakes': 0,
+                      'withdraw_stakes': 0, 'penalties': 1}
+    # Штрафы догружаются с последнего сохранённого блока, высота сети не запрашивается
+    assert penalty_requests(subgraph.calls) == [8]
+    assert 'get_latest_block' not in {action for action, _ in subgraph.calls}
+    assert sorted(stake['id'] for stake in stakes) == ['s0', 's1', 's2', 's4']
+    assert {stake['id']: stake['amount'] for stake in stakes}['s1'] == '2'
+    assert penalties_state['block_number'] == 12
+    assert tokens_state['block_number'] == 7
+
+
+def test_reopened_store_keeps_index_and_sync_state(sdk_env, tmp_path):
+    subgraph = Subgraph()
+    path = str(tmp_path / 'index.sqlite3')
+
+    async def scenario():
+        async with FakeIPCServer(subgraph.handler) as server:
+            await sync(server.socket_path, path)
+            subgraph.calls.clear()
+            # Новый процесс: свежие таблицы пропускаются, штрафы продолжаются с сохранённого блока
+            fresh = await sync(server.socket_path, path, tables=['tokens'], max_age=600)
+            penalties = await sync(server.socket_path, path, tables=['penalties'])
+            calls = list(subgraph.calls)
+
+        reopened = LocalStore(None, path)
+        try:
+            token = await reopened.get_token_by_symbol('tok')
+            penalties_rows = await reopened.get_validator_penalties('0xAA', from_block=5)
+            return fresh, penalties, calls, token, penalties_rows
+        finally:
+            await reopened.close()
+
+    fresh, penalties, calls, token, penalties_rows = run(scenario())
+    assert fresh == {}
+    assert penalties == {'penalties': 0}
+    assert penalty_requests(calls) == [8]
+    assert 'get_tokens' not in {action for action, _ in calls}
+    assert token['id'] == '0xt1'
+    assert [penalty['id'] for penalty in penalties_rows] == ['p2']